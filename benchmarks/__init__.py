@@ -0,0 +1,5 @@
+"""
+Benchmarks for the JobTrendX pipeline.
+Run them from the repository root, e.g.:
+PYTHONPATH=src python -m benchmarks.bench_email_ingest
+"""
@@ -0,0 +1,79 @@
+"""
+Time of the statistics after a new batch of emails: counting the
+whole table again, updating the stored accumulators from the
+whole table (one hash pass to find the new rows, then counting
+only them), updating them with the new files of the ingest
+manifest (the counted rows are known by the paths of their files,
+only the other rows are hashed), or merging the accumulator of
+the new batch.
+PYTHONPATH=src python -m benchmarks.bench_accumulators [nr_rows] [nr_new]
+"""
+
+import sys
+import time
+import pickle
+import random
+import logging
+
+import pandas as pd
+
+from jobtrendx import accumulators
+from jobtrendx import clean_dataframe
+from jobtrendx.statistics import StatisticsManager
+
+from .synthetic import make_info
+
+
+def main(nr_rows: int = 1_000_000, nr_new: int = 10_000) -> None:
+    """Count a synthetic table, then the same table with new rows"""
+    df_info: pd.DataFrame = clean_dataframe.remove_duplicate(
+        make_info(nr_rows + nr_new, random.Random(0)))
+    df_old: pd.DataFrame = df_info.iloc[:-nr_new]
+    log = logging.getLogger('bench_accumulators')
+
+    acc = accumulators.StatisticsAccumulator()
+    start = time.perf_counter()
+    acc.update(df_old)
+    first_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    stats = StatisticsManager(df_info=df_info, log=log)
+    stats.statistics()
+    full_time = time.perf_counter() - start
+
+    merged = pickle.loads(pickle.dumps(acc))
+    delta = pickle.loads(pickle.dumps(acc))
+    start = time.perf_counter()
+    added: int = acc.update(df_info)
+    update_time = time.perf_counter() - start
+
+    new_files: list[str] = df_info['file_path'].iloc[-nr_new:].tolist()
+    start = time.perf_counter()
+    delta.update(df_info, new_files=new_files)
+    delta_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = accumulators.StatisticsAccumulator()
+    batch.update(df_info.iloc[-nr_new:])
+    merged.merge(batch)
+    merge_time = time.perf_counter() - start
+
+    assert acc.counters['skills'].top().to_dict() == \
+        stats.skills_count.to_dict()
+    assert merged.counters['skills'].top().to_dict() == \
+        stats.skills_count.to_dict()
+    assert delta.counters['skills'].top().to_dict() == \
+        stats.skills_count.to_dict()
+    print(f'rows: {len(df_info)}, new rows: {added}')
+    print(f'first accumulation : {first_time:8.3f} s')
+    print(f'full statistics    : {full_time:8.3f} s')
+    print(f'update new rows    : {update_time:8.3f} s '
+          f'({full_time / update_time:.1f}x)')
+    print(f'update new files   : {delta_time:8.3f} s '
+          f'({full_time / delta_time:.1f}x)')
+    print(f'merge new batch    : {merge_time:8.3f} s '
+          f'({full_time / merge_time:.1f}x)')
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
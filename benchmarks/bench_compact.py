@@ -0,0 +1,59 @@
+"""
+Memory of the table of the emails and time of the counting,
+with the Python strings and lists or with the categorical and
+coded columns.
+PYTHONPATH=src python -m benchmarks.bench_compact [nr_rows]
+"""
+
+import sys
+import time
+import random
+import itertools
+
+import pandas as pd
+
+from jobtrendx import compact
+
+from .synthetic import make_info
+
+
+def main(nr_rows: int = 1_000_000) -> None:
+    """Encode a synthetic table and count its columns"""
+    df_info: pd.DataFrame = make_info(nr_rows, random.Random(0))
+    list_cols: list[str] = ['skills', 'location', 'language']
+    before: float = df_info.memory_usage(deep=True).sum() / 2**20
+
+    start = time.perf_counter()
+    df_cat: pd.DataFrame = compact.categorize(df_info)
+    codes: dict[str, compact.ListCodes] = compact.encode_lists(df_cat)
+    encode_time = time.perf_counter() - start
+    after: float = (
+        df_cat.drop(columns=list_cols).memory_usage(deep=True).sum() +
+        sum(codes[col].nbytes for col in list_cols)) / 2**20
+
+    start = time.perf_counter()
+    old_counts = {
+        col: pd.Series(list(itertools.chain.from_iterable(
+            x for x in df_info[col] if isinstance(x, list)))).value_counts()
+        for col in list_cols}
+    old_counts['job_title'] = df_info['job_title'].value_counts()
+    old_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    new_counts = {col: codes[col].counts() for col in list_cols}
+    new_counts['job_title'] = df_cat['job_title'].value_counts()
+    new_time = time.perf_counter() - start
+
+    for col, counts in old_counts.items():
+        assert counts.to_dict() == new_counts[col].to_dict()
+    print(f'rows: {nr_rows}')
+    print(f'memory objects : {before:8.1f} MiB')
+    print(f'memory compact : {after:8.1f} MiB (without the vocabulary)')
+    print(f'encode         : {encode_time:8.3f} s')
+    print(f'count objects  : {old_time:8.3f} s')
+    print(f'count codes    : {new_time:8.3f} s '
+          f'({old_time / new_time:.1f}x)')
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,51 @@
+"""
+Time of the skill pairs: the products of the sparse incidence
+matrix, or counting the combinations of the skills of each ad
+in Python.
+PYTHONPATH=src python -m benchmarks.bench_cooccurrence [nr_rows]
+"""
+
+import sys
+import time
+import random
+import itertools
+from collections import Counter
+
+import pandas as pd
+
+from jobtrendx import compact
+from jobtrendx.cooccurrence import CoOccurrence
+
+from .synthetic import make_info
+
+
+def main(nr_rows: int = 1_000_000) -> None:
+    """Count the pairs of the skills of a synthetic table"""
+    df_info: pd.DataFrame = make_info(nr_rows, random.Random(0))
+    codes = compact.ListCodes.from_series(df_info['skills'])
+
+    start = time.perf_counter()
+    pairs = Counter()
+    for skills in df_info['skills']:
+        if isinstance(skills, list):
+            pairs.update(itertools.combinations(sorted(set(skills)), 2))
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    cooc = CoOccurrence.from_incidence(codes.incidence(), codes.vocab)
+    top = cooc.top_k(k=10, measure='lift')
+    matrix_time = time.perf_counter() - start
+
+    position = {skill: idx for idx, skill in enumerate(codes.vocab)}
+    assert len(pairs) * 2 == cooc.pairs.nnz
+    assert all(cooc.pairs[position[a], position[b]] == count
+               for (a, b), count in pairs.items())
+    print(f'rows: {nr_rows}, skills: {len(codes.vocab)}, '
+          f'pairs: {len(pairs)}, top rows: {len(top)}')
+    print(f'python combinations : {loop_time:8.3f} s')
+    print(f'sparse products     : {matrix_time:8.3f} s '
+          f'({loop_time / matrix_time:.1f}x)')
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
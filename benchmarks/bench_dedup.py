@@ -0,0 +1,54 @@
+"""
+Speed of the fingerprint deduplication against the former
+join / drop_duplicates / split round trip of the list columns.
+PYTHONPATH=src python -m benchmarks.bench_dedup [nr_rows]
+"""
+
+import sys
+import time
+import random
+
+import pandas as pd
+
+from jobtrendx.clean_dataframe import remove_duplicate
+
+from .synthetic import make_info
+
+
+def former_remove_duplicate(df: pd.DataFrame) -> pd.DataFrame:
+    """The former deduplication, lists joined with '-'"""
+    list_cols = [col for col in df.columns
+                 if df[col].apply(lambda x: isinstance(x, list)).any()]
+    for col in list_cols:
+        df.loc[:, col] = df[col].apply(
+            lambda x: '-'.join(x) if isinstance(x, list) else x)
+    df = df.drop_duplicates(subset=df.columns.difference(['file_path']),
+                            keep='first', ignore_index=True)
+    for col in list_cols:
+        df.loc[:, col] = df[col].apply(lambda x: x.split('-'))
+    return df.sort_values(by='file_path', ignore_index=True)
+
+
+def main(nr_rows: int = 1_000_000) -> None:
+    """Time both deduplications over the same rows"""
+    df_rows: pd.DataFrame = make_info(nr_rows, random.Random(0))
+
+    start = time.perf_counter()
+    former: pd.DataFrame = former_remove_duplicate(df_rows.copy())
+    former_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    found: pd.DataFrame = remove_duplicate(df_rows.copy())
+    hash_time = time.perf_counter() - start
+
+    corrupted: int = int((former['location'].str.len() > 1).sum())
+    print(f'rows: {nr_rows}, kept: former {len(former)}, '
+          f'fingerprint {len(found)}')
+    print(f'former round trip : {former_time:8.3f} s '
+          f'({corrupted} Baden-Baden split in two)')
+    print(f'fingerprint       : {hash_time:8.3f} s')
+    print(f'speedup           : {former_time / hash_time:8.1f} x')
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
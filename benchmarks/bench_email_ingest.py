@@ -0,0 +1,60 @@
+"""
+Throughput of reading the .eml files with 1 to N processes, and
+the bytes and the time of the pickle a worker sends back per email:
+the parsed EmailMessage (the former result of the workers) or its
+details.
+The rows go up to the cores this process may use, more processes
+than cores would only time their switching. No scaling from 1 to
+N workers is measured yet: the numbers of the commits come from a
+single-core machine, which prints only the 1-worker row.
+PYTHONPATH=src python -m benchmarks.bench_email_ingest [nr_emails]
+"""
+
+import os
+import sys
+import time
+import pickle
+import tempfile
+
+from jobtrendx import tools_processor as tools
+
+from .synthetic import write_eml_dir
+
+
+def main(nr_emails: int = 5000) -> None:
+    """Time the serial and the parallel reading"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        eml_paths = write_eml_dir(tmp_dir, nr_emails)
+        reference = tools.returns_email_contant(eml_paths)
+        details = [tools._read_eml_details(path) for path in eml_paths]
+        for name, results in (('EmailMessage', list(reference.values())),
+                              ('details', details)):
+            nr_bytes: int = sum(len(pickle.dumps(result))
+                                for result in results)
+            start = time.perf_counter()
+            for result in results:
+                pickle.loads(pickle.dumps(result))
+            elapsed = time.perf_counter() - start
+            print(f'pickle per email, {name}: {nr_bytes / nr_emails:.0f} B, '
+                  f'{elapsed / nr_emails * 1e6:.1f} us')
+
+        nr_cores: int = len(os.sched_getaffinity(0)) \
+            if hasattr(os, 'sched_getaffinity') else os.cpu_count() or 1
+        print(f'{"workers":>8} {"seconds":>9} {"emails/s":>10} {"speedup":>8}')
+        base: float = 0.0
+        for n_workers in range(1, nr_cores + 1):
+            start = time.perf_counter()
+            eml_dict = tools.returns_email_contant_parallel(
+                eml_paths, n_workers=n_workers, chunk_size=64)
+            elapsed = time.perf_counter() - start
+            assert list(eml_dict) == list(reference)
+            base = base or elapsed
+            print(f'{n_workers:>8} {elapsed:>9.3f} '
+                  f'{nr_emails / elapsed:>10.0f} {base / elapsed:>8.2f}')
+        if nr_cores == 1:
+            print('one usable core: no scaling measured, the rows of 2 to N '
+                  'workers need a multi-core machine')
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,43 @@
+"""
+Parse time per email: the EmailMessage of policy.default and the
+walk of its parts for the details, against the fast reading of
+the headers and the first text part from the bytes.
+PYTHONPATH=src python -m benchmarks.bench_fast_ingest [nr_emails]
+"""
+
+import sys
+import time
+import tempfile
+
+from jobtrendx import tools_analysis
+from jobtrendx import tools_processor as tools
+
+from .synthetic import write_eml_dir
+
+
+def main(nr_emails: int = 5000) -> None:
+    """Time both readings over the same .eml files"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        eml_paths = write_eml_dir(tmp_dir, nr_emails)
+
+        start = time.perf_counter()
+        expected = tools_analysis.extract_email_detail(
+            tools.returns_email_contant(eml_paths))
+        full_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        found = tools_analysis.extract_email_detail(
+            tools.returns_email_contant(eml_paths, fast=True))
+        fast_time = time.perf_counter() - start
+
+    assert found == expected, 'The details are not the same!'
+    print(f'emails: {nr_emails}')
+    print(f'EmailMessage : {full_time:8.3f} s '
+          f'({full_time / nr_emails * 1e6:6.0f} us/email)')
+    print(f'fast         : {fast_time:8.3f} s '
+          f'({fast_time / nr_emails * 1e6:6.0f} us/email)')
+    print(f'speedup      : {full_time / fast_time:8.1f} x')
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,58 @@
+"""
+Throughput of the memoized language detection against langdetect
+on every full body, and how often both give the same language.
+PYTHONPATH=src python -m benchmarks.bench_language [nr_payloads]
+"""
+
+import sys
+import time
+import random
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+from jobtrendx import tools_analysis
+from jobtrendx.language_detector import LanguageDetector
+
+from .synthetic import make_payload
+
+
+def main(nr_payloads: int = 300) -> None:
+    """Time both detections over the same synthetic payloads"""
+    rng = random.Random(0)
+    bodies = pd.Series([make_payload(rng) for _ in range(nr_payloads)])
+
+    start = time.perf_counter()
+    expected: pd.Series = tools_analysis.detect_language(bodies)
+    full_time = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache_file = Path(tmp_dir) / 'languages.json'
+        detector = LanguageDetector(cache_file=cache_file)
+        start = time.perf_counter()
+        found: pd.Series = detector.detect(bodies)
+        cold_time = time.perf_counter() - start
+        detector.save()
+        report: str = detector.report()
+
+        detector = LanguageDetector(cache_file=cache_file)
+        start = time.perf_counter()
+        warm: pd.Series = detector.detect(bodies)
+        warm_time = time.perf_counter() - start
+
+    assert warm.equals(found), 'The memo changed the languages!'
+    agreement: float = (found == expected).mean()
+    print(f'payloads: {nr_payloads}')
+    print(report)
+    print(f'langdetect per body: {full_time:8.3f} s '
+          f'({nr_payloads / full_time:10.0f} bodies/s)')
+    print(f'memoized, cold     : {cold_time:8.3f} s '
+          f'({nr_payloads / cold_time:10.0f} bodies/s)')
+    print(f'memoized, warm     : {warm_time:8.3f} s '
+          f'({nr_payloads / warm_time:10.0f} bodies/s)')
+    print(f'agreement          : {agreement:8.1%}')
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
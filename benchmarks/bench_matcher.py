@@ -0,0 +1,62 @@
+"""
+Speed of the Aho-Corasick matcher against one regex per term,
+for the cities, skills and languages of the taxonomy.
+PYTHONPATH=src python -m benchmarks.bench_matcher [nr_payloads]
+"""
+
+import re
+import sys
+import time
+import random
+
+from jobtrendx.matcher import KeywordMatcher
+from jobtrendx.sub_tools import fetch_from_yaml
+
+from .synthetic import TAXONOMY_PATH, make_payload
+
+
+def regex_find_all(lines: list[str], items: list[str]) -> set[str]:
+    """The former matching, one compiled regex per term"""
+    matched: set[str] = set()
+    for item in items:
+        pattern = re.compile(rf"\b{re.escape(item)}\b", re.IGNORECASE)
+        if any(pattern.search(line) for line in lines):
+            matched.add(item)
+    return matched
+
+
+def main(nr_payloads: int = 300) -> None:
+    """Time both matchers over the same synthetic payloads"""
+    rng = random.Random(0)
+    corpus: list[list[str]] = [
+        make_payload(rng).split('\n\n') for _ in range(nr_payloads)]
+    taxonomies: dict[str, list[str]] = {
+        name: [str(term) for terms in fetch_from_yaml(
+            TAXONOMY_PATH, f'{name}.yaml').values() for term in terms]
+        for name in ['locations', 'skills', 'language']
+    }
+
+    start = time.perf_counter()
+    expected = [[regex_find_all(lines, items)
+                 for items in taxonomies.values()] for lines in corpus]
+    regex_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matchers = [KeywordMatcher(items) for items in taxonomies.values()]
+    build_time = time.perf_counter() - start
+    start = time.perf_counter()
+    found = [[set(matcher.find_all(lines)) for matcher in matchers]
+             for lines in corpus]
+    match_time = time.perf_counter() - start
+
+    assert found == expected, 'The matches are not the same!'
+    print(f'payloads: {nr_payloads}, terms: '
+          f'{sum(len(items) for items in taxonomies.values())}')
+    print(f'regex per term : {regex_time:8.3f} s')
+    print(f'aho-corasick   : {match_time:8.3f} s '
+          f'(+{build_time:.3f} s to build)')
+    print(f'speedup        : {regex_time / match_time:8.1f} x')
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,100 @@
+"""
+Near-duplicate detection with MinHash/LSH against comparing the
+shingles of all the pairs of ads, on synthetic ads with mutated
+copies: reordered sections, an extra "Top Treffer" block and an
+extra sentence.
+PYTHONPATH=src python -m benchmarks.bench_near_duplicates [nr_ads]
+"""
+
+import sys
+import time
+import random
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from jobtrendx import near_duplicates
+from jobtrendx.payload_analysis import _payload_clean_up
+
+from .synthetic import make_payload
+
+THRESHOLD: float = 0.8
+SHINGLE_SIZE: int = 5
+
+
+def mutate(payload: str, rng: random.Random) -> str:
+    """A copy of the ad with small changes"""
+    paragraphs: list[str] = payload.split('\n\n')
+    if rng.random() < 0.5:
+        paragraphs[2], paragraphs[3] = paragraphs[3], paragraphs[2]
+    if rng.random() < 0.5:
+        paragraphs.insert(1, 'Top Treffer\nNeu für dich\n[URL]')
+    if rng.random() < 0.5:
+        paragraphs[-2] += '\nBewirb dich jetzt!'
+    return '\n\n'.join(paragraphs)
+
+
+def make_ads(nr_ads: int, rng: random.Random) -> tuple[list[str], list[int]]:
+    """The ads and the original of each, a fifth of them are copies"""
+    payloads: list[str] = []
+    origins: list[int] = []
+    for idx in range(nr_ads):
+        if payloads and rng.random() < 0.2:
+            origin: int = origins[rng.randrange(len(payloads))]
+            payloads.append(mutate(payloads[origin], rng))
+            origins.append(origin)
+        else:
+            payloads.append(make_payload(rng))
+            origins.append(idx)
+    return payloads, origins
+
+
+def pairwise_first(clean_payloads: list[list[str]]) -> np.ndarray:
+    """The exact Jaccard similarity of all the pairs, O(n^2)"""
+    shingles = [near_duplicates.shingle(lines, SHINGLE_SIZE)
+                for lines in clean_payloads]
+    parent: list[int] = list(range(len(shingles)))
+    for first, second in itertools.combinations(range(len(shingles)), 2):
+        union: int = len(shingles[first] | shingles[second])
+        if union and len(shingles[first] & shingles[second]) / union \
+           >= THRESHOLD:
+            parent[second] = min(parent[second], parent[first])
+    return np.array([parent[idx] == idx for idx in range(len(parent))])
+
+
+def main(nr_ads: int = 2000) -> None:
+    """Time both and compare them to the known copies"""
+    payloads, origins = make_ads(nr_ads, random.Random(0))
+    clean: pd.DataFrame = _payload_clean_up(
+        pd.DataFrame({'payload': payloads}))
+    originals: np.ndarray = np.array(origins) == np.arange(nr_ads)
+
+    start = time.perf_counter()
+    hasher = near_duplicates.MinHasher(shingle_size=SHINGLE_SIZE)
+    signatures: list[bytes] = hasher.signatures(clean['clean_payload'])
+    sign_time = time.perf_counter() - start
+    start = time.perf_counter()
+    keep: np.ndarray = near_duplicates.first_of_groups(
+        signatures, THRESHOLD)
+    lsh_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    exact: np.ndarray = pairwise_first(clean['clean_payload'].tolist())
+    pair_time = time.perf_counter() - start
+
+    copies: int = int((~originals).sum())
+    print(f'ads: {nr_ads}, mutated copies: {copies}, '
+          f'threshold: {THRESHOLD}')
+    print(f'copies found   : minhash/lsh {int((~keep & ~originals).sum())}, '
+          f'pairwise {int((~exact & ~originals).sum())}')
+    print(f'originals lost : minhash/lsh {int((~keep & originals).sum())}, '
+          f'pairwise {int((~exact & originals).sum())}')
+    print(f'same as exact  : {(keep == exact).mean():8.1%}')
+    print(f'pairwise       : {pair_time:8.3f} s')
+    print(f'minhash/lsh    : {sign_time + lsh_time:8.3f} s '
+          f'({sign_time:.3f} s signatures, {lsh_time:.3f} s lsh)')
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,67 @@
+"""
+Scaling of the payload analysis with the number of processes.
+The rows go up to the cores this process may use, more processes
+than cores would only time their switching. No scaling from 1 to
+N workers is measured yet: the numbers of the commits come from a
+single-core machine, which prints only the 1-worker row.
+PYTHONPATH=src python -m benchmarks.bench_payload_sharding [nr_payloads]
+"""
+
+import os
+import sys
+import time
+import random
+
+import pandas as pd
+from omegaconf import DictConfig
+
+from jobtrendx.payload_analysis import split_payload
+
+from .synthetic import TAXONOMY_PATH, LEXICON_PATH, make_payload
+
+
+CFG = DictConfig({
+    'taxonomy_path': TAXONOMY_PATH,
+    'taxonomy_files': {'locations': 'locations.yaml',
+                       'job_titles': 'job_titles.yaml',
+                       'title_tags': 'title_tags.yaml',
+                       'skills': 'skills.yaml',
+                       'languages': 'language.yaml',
+                       'salaries': 'salary.yaml'},
+    'lexicon_path': LEXICON_PATH,
+    'lexicon_files': {'job_titles': 'job_titles.yaml',
+                      'skills': 'skills.yaml',
+                      'languages': 'language.yaml'},
+})
+
+
+def main(nr_payloads: int = 5000, chunk_size: int = 250) -> None:
+    """Time split_payload with 1 to N processes"""
+    rng = random.Random(0)
+    payloads = pd.DataFrame({
+        'file_path': [f'email{i}.eml' for i in range(nr_payloads)],
+        'eml_lang': ['de'] * nr_payloads,
+        'payload': [make_payload(rng) for _ in range(nr_payloads)],
+    })
+    reference = split_payload(payloads, CFG, n_workers=1)
+
+    nr_cores: int = len(os.sched_getaffinity(0)) \
+        if hasattr(os, 'sched_getaffinity') else os.cpu_count() or 1
+    print(f'{"workers":>8} {"seconds":>9} {"payloads/s":>11} {"speedup":>8}')
+    base: float = 0.0
+    for n_workers in range(1, nr_cores + 1):
+        start = time.perf_counter()
+        df_info = split_payload(
+            payloads, CFG, n_workers=n_workers, chunk_size=chunk_size)
+        elapsed = time.perf_counter() - start
+        pd.testing.assert_frame_equal(df_info, reference)
+        base = base or elapsed
+        print(f'{n_workers:>8} {elapsed:>9.3f} '
+              f'{nr_payloads / elapsed:>11.0f} {base / elapsed:>8.2f}')
+    if nr_cores == 1:
+        print('one usable core: no scaling measured, the rows of 2 to N '
+              'workers need a multi-core machine')
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
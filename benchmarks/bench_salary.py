@@ -0,0 +1,80 @@
+"""
+Throughput of the salary extraction: the former loop over the
+keywords with a regex per keyword and a second regex per line,
+against the one pattern applied with `str.extract` over all the
+lines at once.
+PYTHONPATH=src python -m benchmarks.bench_salary [nr_payloads]
+"""
+
+import re
+import sys
+import time
+import random
+
+from jobtrendx import payload_analysis
+from jobtrendx.sub_tools import fetch_from_yaml
+
+from .synthetic import TAXONOMY_PATH, make_payload
+
+
+def former_extract_salary(lines: list[str],
+                          items: list[str]
+                          ) -> tuple[float | str, float | str, str]:
+    """The former extraction of the salary of one payload"""
+    for item in items:
+        pattern = re.compile(rf"\b{re.escape(item)}\b", re.IGNORECASE)
+        for line in lines:
+            if pattern.search(line):
+                return former_salary_amount(line)
+    return "Nan", "Nan", "Nan"
+
+
+def former_salary_amount(line: str) -> tuple[float | str, float | str, str]:
+    """The former amounts of a salary paragraph"""
+    min_salary: float = 0.0
+    max_salary: float = 0.0
+    for l_i in line.split('\n'):
+        if "€" in l_i:
+            match = re.search(
+                r"(\d{1,3}\.\d{3})\s*-\s*(\d{1,3}\.\d{3})\s*€/*", l_i)
+            if match:
+                min_salary = float(match.group(1).replace(".", ""))
+                max_salary = float(match.group(2).replace(".", ""))
+            if "€/Monat" in l_i:
+                min_salary *= 12
+                max_salary *= 12
+            return min_salary, max_salary, "€/Jahr"
+    return "Nan", "Nan", "Nan"
+
+
+def main(nr_payloads: int = 100_000) -> None:
+    """Time both extractions over the same synthetic payloads"""
+    rng = random.Random(0)
+    corpus: list[list[str]] = [
+        make_payload(rng).split('\n\n') for _ in range(nr_payloads)]
+    items: list[str] = [
+        str(term) for terms in fetch_from_yaml(
+            TAXONOMY_PATH, 'salary.yaml').values() for term in terms]
+    nr_lines: int = sum(
+        paragraph.count('\n') + 1 for lines in corpus for paragraph in lines)
+
+    start = time.perf_counter()
+    expected = [former_extract_salary(lines, items) for lines in corpus]
+    former_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    found = list(zip(*payload_analysis._extract_salary_column(
+        corpus, items)))
+    vector_time = time.perf_counter() - start
+
+    assert found == expected, 'The salaries are not the same!'
+    print(f'payloads: {nr_payloads}, lines: {nr_lines}')
+    print(f'former     : {former_time:8.3f} s '
+          f'({nr_lines / former_time / 1e6:.2f} M lines/s)')
+    print(f'vectorized : {vector_time:8.3f} s '
+          f'({nr_lines / vector_time / 1e6:.2f} M lines/s)')
+    print(f'speedup    : {former_time / vector_time:8.1f} x')
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,75 @@
+"""
+Time of the skills and the languages: the clean-up of the
+paragraphs and the matchers over the whole clean payloads,
+against the clean-up which labels the paragraphs by their
+sections and the matchers over the job description and the
+requirements only.
+PYTHONPATH=src python -m benchmarks.bench_sections [nr_payloads]
+"""
+
+import sys
+import time
+import random
+
+from omegaconf import OmegaConf
+
+from jobtrendx import payload_analysis
+from jobtrendx.sections import SectionSegmenter
+from jobtrendx.taxonomy_cache import load_compiled
+
+from .synthetic import PACKAGE_PATH, make_payload
+from .bench_payload_sharding import CFG
+
+
+def main(nr_payloads: int = 50_000) -> None:
+    """Time both searches over the same payloads"""
+    rng = random.Random(0)
+    compiled = load_compiled(CFG)
+    payloads: list[list[str]] = [
+        make_payload(rng).split('\n\n') for _ in range(nr_payloads)]
+    anlz_cfg = OmegaConf.load(
+        PACKAGE_PATH / 'conf' / 'defaults' / 'analysis.yaml')
+    segmenter = SectionSegmenter(
+        sections=OmegaConf.to_container(anlz_cfg.sections),
+        scope=anlz_cfg.skill_sections)
+    matchers = [compiled.matchers[name] for name in ('skills', 'languages')]
+
+    start = time.perf_counter()
+    clean_payloads: list[list[str]] = [
+        payload_analysis._filter_and_title(
+            item, compiled.title_pattern)[0] for item in payloads]
+    whole = [payload_analysis._extract_items_column(clean_payloads, matcher)
+             for matcher in matchers]
+    whole_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scoped: list[list[str]] = []
+    for item in payloads:
+        sections = segmenter.sections()
+        lines, _ = payload_analysis._filter_and_title(
+            item, compiled.title_pattern, sections=sections)
+        scoped.append(sections.result()[0] or lines)
+    found = [payload_analysis._extract_items_column(scoped, matcher)
+             for matcher in matchers]
+    scoped_time = time.perf_counter() - start
+
+    # The sections only drop the matches of the other sections
+    assert all(set(items) <= set(every)
+               for column, every_column in zip(found, whole)
+               for items, every in zip(column, every_column))
+    changed: list[int] = [
+        sum(items != every for items, every in zip(column, every_column))
+        for column, every_column in zip(found, whole)]
+    whole_chars: int = sum(len(p) for lines in clean_payloads for p in lines)
+    scoped_chars: int = sum(len(p) for lines in scoped for p in lines)
+    print(f'payloads: {nr_payloads}, skills changed: {changed[0]}, '
+          f'languages changed: {changed[1]}')
+    print(f'text scanned  : {scoped_chars / whole_chars:8.1%} '
+          'of the clean payloads')
+    print(f'whole payload : {whole_time:8.3f} s')
+    print(f'sections      : {scoped_time:8.3f} s')
+    print(f'speedup       : {whole_time / scoped_time:8.2f} x')
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,49 @@
+"""
+Time to write and read the table of the emails as Parquet, and
+to make the statistics again from the file.
+PYTHONPATH=src python -m benchmarks.bench_storage [nr_rows]
+"""
+
+import sys
+import time
+import random
+import logging
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+from jobtrendx import storage
+from jobtrendx.statistics import StatisticsManager
+
+from .synthetic import make_info
+
+
+def main(nr_rows: int = 1_000_000) -> None:
+    """Write, read and analyze a synthetic table"""
+    df_info: pd.DataFrame = make_info(nr_rows, random.Random(0))
+    log = logging.getLogger('bench_storage')
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir) / 'df_info.parquet'
+        start = time.perf_counter()
+        storage.write_info(df_info, path)
+        write_time = time.perf_counter() - start
+        size: float = path.stat().st_size / 2**20
+
+        start = time.perf_counter()
+        stats = StatisticsManager.from_file(path, log=log)
+        read_time = time.perf_counter() - start
+        start = time.perf_counter()
+        stats.statistics()
+        stats_time = time.perf_counter() - start
+
+    assert stats.df_info['skills'].tolist() == df_info['skills'].tolist()
+    print(f'rows: {nr_rows}, file: {size:.1f} MiB')
+    print(f'write parquet : {write_time:8.3f} s')
+    print(f'read parquet  : {read_time:8.3f} s')
+    print(f'statistics    : {stats_time:8.3f} s')
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,83 @@
+"""
+Memory of the streamed analysis of the emails: the peak of the
+Python allocations while the chunks are analyzed (one chunk of
+emails and its rows, the other rows are in the part files), and
+the size of the whole df_info read back at the end, against the
+analysis of all the emails at once.
+PYTHONPATH=src python -m benchmarks.bench_streaming [nr_emails] [stream_size]
+"""
+
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+from omegaconf import DictConfig, OmegaConf
+
+from jobtrendx import logger
+from jobtrendx.analysis import AnalysisEmails
+from jobtrendx.email_processor import EmailProcessor
+
+from .synthetic import PACKAGE_PATH, write_eml_dir
+
+
+def _cfg(store: Path) -> DictConfig:
+    """The config of the package, with its files in the store"""
+    cfg = OmegaConf.load(PACKAGE_PATH / 'conf' / 'config.yaml')
+    cfg.defaults = {
+        name: OmegaConf.load(PACKAGE_PATH / 'conf' / 'defaults' /
+                             f'{name}.yaml')
+        for name in ['email_processing', 'paths', 'analysis']}
+    cfg.taxonomy_path = str(PACKAGE_PATH / 'taxonomy')
+    cfg.lexicon_path = str(PACKAGE_PATH / 'lexicon')
+    for name in ['cache', 'lang_cache', 'title_cache', 'stream_spool']:
+        cfg.defaults.paths[name] = str(store / name)
+    return cfg
+
+
+def main(nr_emails: int = 5000, stream_size: int = 500) -> None:
+    """Trace the memory of the batch and of the streamed analysis"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        eml_dir = Path(tmp_dir) / 'emails'
+        write_eml_dir(eml_dir, nr_emails)
+        cfg = _cfg(Path(tmp_dir) / 'store')
+        log = logger.setup_logger(str(Path(tmp_dir) / 'bench.log'))
+
+        tracemalloc.start()
+        processor = EmailProcessor(eml_dir=str(eml_dir), log=log, fast=True)
+        processor.execute()
+        batch = AnalysisEmails(eml_dict=processor.eml_dict, cfg=cfg)
+        batch.analyzing(log=log)
+        _, batch_peak = tracemalloc.get_traced_memory()
+        del processor, batch
+        tracemalloc.stop()
+
+        tracemalloc.start()
+        processor = EmailProcessor(eml_dir=str(eml_dir), log=log, fast=True)
+        stream = AnalysisEmails(eml_dict={}, cfg=cfg)
+        chunk_peak: int = 0
+
+        def chunks():
+            """The chunks of emails, the peak traced before each one"""
+            nonlocal chunk_peak
+            for chunk in processor.iter_eml(stream_size=stream_size):
+                chunk_peak = max(chunk_peak,
+                                 tracemalloc.get_traced_memory()[1])
+                tracemalloc.reset_peak()
+                yield chunk
+                del chunk
+
+        stream.analyzing_stream(chunks(), log=log)
+        table, stream_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    mib: float = 2**20
+    print(f'emails: {nr_emails}, stream size: {stream_size}')
+    print(f'batch peak          : {batch_peak / mib:8.1f} MiB')
+    print(f'stream, the chunks  : {chunk_peak / mib:8.1f} MiB')
+    print(f'stream, with table  : {stream_peak / mib:8.1f} MiB')
+    print(f'df_info at the end  : {table / mib:8.1f} MiB')
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
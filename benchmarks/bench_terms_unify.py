@@ -0,0 +1,92 @@
+"""
+Throughput of the unification of the terms: the former two
+`Series.apply` passes per row (replace and deduplicate, then
+sort) against the codes of the exploded items mapped once
+through the code table of the vocabulary.
+PYTHONPATH=src python -m benchmarks.bench_terms_unify [nr_rows]
+"""
+
+import sys
+import time
+import random
+
+import pandas as pd
+
+from jobtrendx import terms_unify
+from jobtrendx.sub_tools import fetch_from_yaml
+
+from .synthetic import LEXICON_PATH, make_info
+
+LEXICON_FILES: dict[str, str] = {
+    'job_titles': 'job_titles.yaml',
+    'skills': 'skills.yaml',
+    'languages': 'language.yaml',
+}
+
+
+def former_replace_str(value_to_key: dict[str, str],
+                       df: pd.DataFrame,
+                       column: str
+                       ) -> pd.DataFrame:
+    """The former replacement of the strings, a lookup per row"""
+    df[column] = df[column].apply(
+        lambda item: value_to_key.get(item, item) if pd.notna(item) else item
+    )
+    return df
+
+
+def former_replace_list_str(value_to_key: dict[str, str],
+                            df: pd.DataFrame,
+                            column: str
+                            ) -> pd.DataFrame:
+    """The former replacement of the lists, two passes per row"""
+    def process_list(item_list):
+        if isinstance(item_list, list):
+            return list({value_to_key.get(item, item) for item in item_list})
+        return item_list
+
+    df[column] = df[column].apply(process_list)
+    df[column] = df[column].apply(lambda x: sorted(x) if
+                                  isinstance(x, list) else x)
+    return df
+
+
+def main(nr_rows: int = 1_000_000) -> None:
+    """Time both unifications over the same synthetic table"""
+    df_info: pd.DataFrame = make_info(nr_rows, random.Random(0))
+    lexicon: dict[str, dict[str, list[str]]] = {
+        name: fetch_from_yaml(LEXICON_PATH, file_name)
+        for name, file_name in LEXICON_FILES.items()}
+    inverse: dict[str, dict[str, str]] = {
+        name: terms_unify._invert_lexicon(terms)
+        for name, terms in lexicon.items()}
+    columns: list[tuple[str, str]] = [
+        ('skills', 'skills'), ('language', 'languages')]
+
+    former = df_info.copy()
+    start = time.perf_counter()
+    former_replace_str(inverse['job_titles'], former, 'job_title')
+    for column, name in columns:
+        former_replace_list_str(inverse[name], former, column)
+    former_time = time.perf_counter() - start
+
+    vector = df_info.copy()
+    start = time.perf_counter()
+    terms_unify._replace_str(lexicon['job_titles'], vector, 'job_title',
+                             inverse['job_titles'])
+    for column, name in columns:
+        terms_unify._replace_list_str(lexicon[name], vector, column,
+                                      inverse[name])
+    vector_time = time.perf_counter() - start
+
+    pd.testing.assert_frame_equal(vector, former)
+    print(f'rows: {nr_rows}')
+    print(f'apply per row : {former_time:8.3f} s '
+          f'({nr_rows / former_time / 1e6:.2f} M rows/s)')
+    print(f'code table    : {vector_time:8.3f} s '
+          f'({nr_rows / vector_time / 1e6:.2f} M rows/s)')
+    print(f'speedup       : {former_time / vector_time:8.1f} x')
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
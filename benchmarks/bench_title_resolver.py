@@ -0,0 +1,69 @@
+"""
+Time of the job titles: the matcher over every title line
+against the TitleResolver, with an empty memo and with the memo
+of the first run loaded from the disk.
+PYTHONPATH=src python -m benchmarks.bench_title_resolver [nr_titles]
+"""
+
+import sys
+import time
+import random
+import tempfile
+from pathlib import Path
+
+from jobtrendx.matcher import KeywordMatcher
+from jobtrendx.taxonomy_cache import load_compiled
+from jobtrendx.title_resolver import TitleResolver
+
+from .synthetic import TAGS, TITLES
+from .bench_payload_sharding import CFG
+
+PREFIXES: list[str] = ['', 'Senior ', 'Junior ', 'Lead ', '(Senior) ']
+SUFFIXES: list[str] = ['', ' Python', ' Cloud', ' im Homeoffice',
+                       ' - Berlin', ' | remote']
+
+
+def make_titles(nr_titles: int, rng: random.Random) -> list[str]:
+    """Title lines, the same few hundred with other tags and cases"""
+    lines: list[str] = []
+    for _ in range(nr_titles):
+        line: str = f'{rng.choice(PREFIXES)}{rng.choice(TITLES)}' \
+            f'{rng.choice(SUFFIXES)} {rng.choice(TAGS)}'
+        lines.append(line.upper() if rng.random() < 0.1 else line)
+    return lines
+
+
+def main(nr_titles: int = 1_000_000) -> None:
+    """Time the matcher and the resolver over the same title lines"""
+    titles: list[str] = make_titles(nr_titles, random.Random(0))
+    compiled = load_compiled(CFG)
+    matcher: KeywordMatcher = compiled.matchers['job_titles']
+
+    start = time.perf_counter()
+    expected: list[str] = [
+        matcher.first_match(title) or "nan" for title in titles]
+    former_time = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache_file: Path = Path(tmp_dir) / 'titles.json'
+        timings: list[float] = []
+        for _ in range(2):
+            resolver = TitleResolver(matcher, compiled.title_pattern,
+                                     key=compiled.key, cache_file=cache_file)
+            start = time.perf_counter()
+            found: list[str] = resolver.resolve(titles)
+            timings.append(time.perf_counter() - start)
+            resolver.save()
+            print(resolver.report())
+            assert found == expected, 'The job titles are not the same!'
+
+    print(f'titles: {nr_titles}, distinct: {len(set(titles))}')
+    print(f'matcher per title : {former_time:8.3f} s')
+    print(f'memo, empty       : {timings[0]:8.3f} s '
+          f'({former_time / timings[0]:.1f} x)')
+    print(f'memo, from disk   : {timings[1]:8.3f} s '
+          f'({former_time / timings[1]:.1f} x)')
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
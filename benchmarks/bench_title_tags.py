@@ -0,0 +1,95 @@
+"""
+Speed of the title detection: the former filter with one regex
+per hard-coded tag and paragraph, then a second search of the
+title line over the tags, against one regex of the tags of
+title_tags.yaml, with the filter and the title in a single pass.
+PYTHONPATH=src python -m benchmarks.bench_title_tags [nr_payloads]
+"""
+
+import re
+import sys
+import time
+import random
+
+from jobtrendx import payload_analysis
+from jobtrendx.matcher import compile_tags
+from jobtrendx.sub_tools import fetch_from_yaml
+
+from .synthetic import TAXONOMY_PATH, make_payload
+
+FORMER_TAGS: list[str] = [
+    'm/w/d', 'w/d/m', 'd/w/m', 'w/m/d', 'd/m/w', 'm/...', 'd/...', 'w/...',
+    'm/f/x', 'f/m/x', 'f/m/d', 'm/f/d', 'x/f/m', 'f/...', 'x/...',
+    'm/w', 'w/m', 'f/m', 'm/f', '(mwd)', '(dwm)', '(wmd)',
+    '(fmx)', '(fmx)', '(fmd)', '(xfm)', 'w|m|d', 'f|m|d', 'm|w|d', 'm|f|d',
+    'm|d|w', 'm|d|f', 'w|d|m', 'f|d|m', 'm/w/divers', 'all genders',
+    '(all genders)',
+]
+
+
+def former_filter(item: list[str],
+                  max_newlines: int = 2,
+                  min_dashes: int = 3
+                  ) -> list[str]:
+    """The former filter of the paragraphs, a regex per tag"""
+    filtered: list[str] = []
+    cut_index: int = next(
+        (i for i, x in enumerate(item) if "Diesen Job melden" in x),
+        len(item))
+    title_line: bool = False
+    for i in item[:cut_index]:
+        new_line_count: int = i.count('\n')
+        url_count: int = i.count('[URL]')
+        dash_count: int = i.count('-')
+        if any(re.search(rf"\b{re.escape(tag)}\b", i, re.IGNORECASE)
+               for tag in FORMER_TAGS) and not title_line:
+            filtered.append(i)
+            title_line = True
+            continue
+        if new_line_count > url_count and not (
+            new_line_count <= max_newlines and dash_count > min_dashes
+        ):
+            filtered.append(i)
+    return filtered
+
+
+def former_title(lines: list[str], tags: list[str]) -> str:
+    """The former title line, a substring search per tag"""
+    for item in lines:
+        if any(tag in item for tag in tags):
+            return next((line for line in item.split('\n')
+                         if any(tag in line for tag in tags)), "")
+    return 'Nan'
+
+
+def main(nr_payloads: int = 20_000) -> None:
+    """Time both over the same synthetic payloads"""
+    rng = random.Random(0)
+    corpus: list[list[str]] = [
+        make_payload(rng).split('\n\n') for _ in range(nr_payloads)]
+    tags: list[str] = [str(tag) for tag in fetch_from_yaml(
+        TAXONOMY_PATH, 'title_tags.yaml')['tags']]
+
+    start = time.perf_counter()
+    expected: list[tuple[list[str], str]] = []
+    for item in corpus:
+        filtered: list[str] = former_filter(item)
+        expected.append((filtered, former_title(filtered, tags)))
+    former_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    pattern: re.Pattern = compile_tags(tags)
+    found: list[tuple[list[str], str]] = [
+        payload_analysis._filter_and_title(item, pattern)
+        for item in corpus]
+    single_time = time.perf_counter() - start
+
+    assert found == expected, 'The titles are not the same!'
+    print(f'payloads: {nr_payloads}, tags: {len(tags)}')
+    print(f'regex per tag : {former_time:8.3f} s')
+    print(f'single pass   : {single_time:8.3f} s')
+    print(f'speedup       : {former_time / single_time:8.1f} x')
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,139 @@
+"""
+Synthetic StepStone-like job alerts for the benchmarks.
+The emails mimic the layout of the real alerts: a title line
+with a gender tag, the company and location, the sections of
+the ad, a salary line and the "Diesen Job melden" footer.
+"""
+
+import random
+from pathlib import Path
+from email.message import EmailMessage
+
+import pandas as pd
+
+__all__ = [
+    'TAXONOMY_PATH',
+    'LEXICON_PATH',
+    'make_payload',
+    'make_email',
+    'write_eml_dir',
+    'make_info',
+]
+
+
+PACKAGE_PATH: Path = Path(__file__).resolve().parents[1] / 'src' / 'jobtrendx'
+TAXONOMY_PATH: str = str(PACKAGE_PATH / 'taxonomy')
+LEXICON_PATH: str = str(PACKAGE_PATH / 'lexicon')
+
+TITLES: list[str] = [
+    'Data Scientist', 'Data Engineer', 'Data Analyst',
+    'Machine Learning Engineer', 'Business Analyst', 'Data Architect',
+    'Software Developer', 'Datenwissenschaftler', 'BI Developer',
+]
+TAGS: list[str] = ['(m/w/d)', '(w/m/d)', '(f/m/x)', '(all genders)']
+CITIES: list[str] = [
+    'Berlin', 'München', 'Hamburg', 'Köln', 'Frankfurt am Main',
+    'Stuttgart', 'Düsseldorf', 'Leipzig', 'Dresden', 'Baden-Baden',
+]
+SKILLS: list[str] = [
+    'Python', 'SQL', 'Docker', 'Kubernetes', 'Spark', 'Tableau',
+    'Power BI', 'AWS', 'Azure', 'TensorFlow', 'PyTorch', 'Git',
+    'Airflow', 'Linux', 'Scala', 'Java', 'Machine Learning', 'Statistik',
+]
+LANGUAGES: list[str] = [
+    'Sehr gute Deutschkenntnisse', 'English', 'Englischkenntnisse',
+    'Fließende Deutschkenntnisse',
+]
+DE_TEXT: str = (
+    'Wir sind ein innovatives Unternehmen und suchen dich für unser '
+    'Team. Du arbeitest mit den Daten und entwickelst die Lösungen '
+    'für unsere Kunden.'
+)
+EN_TEXT: str = (
+    'We are an innovative company and we are looking for you to join '
+    'our team. You will work with the data and build the solutions '
+    'for our customers.'
+)
+
+
+def make_payload(rng: random.Random) -> str:
+    """Return one synthetic alert body"""
+    german: bool = rng.random() < 0.7
+    title: str = f'{rng.choice(TITLES)} {rng.choice(TAGS)}'
+    city: str = rng.choice(CITIES)
+    skills: list[str] = rng.sample(SKILLS, k=rng.randint(3, 7))
+    low: int = rng.randrange(40, 80) * 1000
+    high: int = low + rng.randrange(5, 30) * 1000
+    salary: str = f'{low:,}'.replace(',', '.') + ' - ' + \
+        f'{high:,}'.replace(',', '.') + ' €/Jahr'
+    intro: str = DE_TEXT if german else EN_TEXT
+    header_task: str = 'Das wird dein Job' if german else 'Your tasks'
+    header_req: str = \
+        'Das bringst du mit' if german else 'Your knowledge/experience'
+    paragraphs: list[str] = [
+        'Neue Jobs für dich\nTop Treffer\n[URL]',
+        f'{title}\nMusterfirma GmbH\n{city}\n[URL]',
+        f'{header_task}\n{intro}\n{intro}',
+        f'{header_req}\n' + '\n'.join(f'- {s}' for s in skills) +
+        f'\n{rng.choice(LANGUAGES)}',
+        f'Gehalt\n{salary}\ngeschätzt für Vollzeit',
+        'Diesen Job melden\n[URL]',
+    ]
+    return '\n\n'.join(paragraphs)
+
+
+def make_email(idx: int, rng: random.Random) -> EmailMessage:
+    """Return an email message with a synthetic alert body"""
+    msg = EmailMessage()
+    msg['Subject'] = f'Neue Jobs für dich #{idx}'
+    msg['From'] = 'StepStone <jobagent@stepstone.de>'
+    msg['To'] = 'me@example.com'
+    msg['Date'] = f'Mon, {1 + idx % 28:02d} Jan 2024 08:00:00 +0100'
+    msg['Message-ID'] = f'<{idx}@stepstone.de>'
+    msg.set_content(make_payload(rng))
+    msg.add_alternative(f'<html><body>{idx}</body></html>', subtype='html')
+    return msg
+
+
+def write_eml_dir(directory: str | Path,
+                  nr_emails: int,
+                  seed: int = 42
+                  ) -> list[Path]:
+    """Write `nr_emails` synthetic .eml files into the directory"""
+    rng = random.Random(seed)
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    paths: list[Path] = []
+    for idx in range(nr_emails):
+        path = directory / f'alert_{idx:07d}.eml'
+        path.write_bytes(make_email(idx, rng).as_bytes())
+        paths.append(path)
+    return paths
+
+
+def make_info(nr_rows: int, rng: random.Random) -> pd.DataFrame:
+    """
+    A cleaned table of the emails (df_info) with `nr_rows` rows,
+    about a third of them are repeated ads
+    """
+    nr_unique: int = max(1, nr_rows * 2 // 3)
+    unique = [(rng.choice(TITLES),
+               rng.sample(SKILLS, rng.randint(1, 4)),
+               [rng.choice(CITIES)],
+               float(rng.randrange(40, 90) * 1000),
+               rng.choice(['German', 'English']))
+              for _ in range(nr_unique)]
+    rows = [unique[idx if idx < nr_unique else rng.randrange(nr_unique)]
+            for idx in range(nr_rows)]
+    return pd.DataFrame({
+        'file_path': [f'email_{idx:07d}.eml' for idx in range(nr_rows)],
+        'eml_lang': [{'German': 'de', 'English': 'en'}[row[4]]
+                     for row in rows],
+        'job_title': [row[0] for row in rows],
+        'location': [list(row[2]) for row in rows],
+        'skills': [list(row[1]) for row in rows],
+        'salary_min': [row[3] for row in rows],
+        'salary_max': [row[3] + 10000.0 for row in rows],
+        'salary_unit': ['€/Jahr'] * nr_rows,
+        'language': [[row[4]] for row in rows],
+    })
@@ -0,0 +1,572 @@
+"""
+Mergeable accumulators of the statistics.
+Instead of counting the whole table of the emails again on every
+run, the statistics are kept in accumulators which are updated
+with the new rows only:
+  - CountAccumulator: the counts of the job titles, skills and
+    languages, with the number of the rows and the missing ones,
+  - NumberAccumulator: count, mean, variance (Welford/Chan), min
+    and max of the salaries, and a QuantileSketch (KLL) for their
+    percentiles, p10 to p90 within a known rank error,
+  - GroupedNumbers: a NumberAccumulator for each job title or
+    region, all of them filled in one pass over the rows,
+  - StatisticsAccumulator: all of them, with the number of the
+    rows already counted of each fingerprint (the hash of the
+    counted columns), persisted between the runs. Given the new
+    files of the ingest manifest, only their rows are hashed.
+Two accumulators of different rows (e.g., two shards, or the
+stored one and a new batch of emails) are merged into the
+accumulator of all the rows. If rows which were counted are not
+in the table anymore, everything is counted again.
+
+16 Oct. 2026
+S. Amiri
+"""
+
+import os
+import pickle
+import typing
+from pathlib import Path
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from . import clean_dataframe
+from . import tools_statistics as tools
+from .compact import ListCodes
+
+
+__all__ = [
+    'CountAccumulator',
+    'GroupedNumbers',
+    'NumberAccumulator',
+    'QuantileSketch',
+    'StatisticsAccumulator',
+]
+
+
+class CountAccumulator:
+    """The counts of the values of a string or a list column"""
+
+    __slots__: list[str] = ['lists', 'total', 'missing', 'counts']
+
+    lists: bool
+    total: int
+    missing: int
+    counts: Counter
+
+    def __init__(self, lists: bool = False) -> None:
+        self.lists = lists
+        self.total = 0
+        self.missing = 0
+        self.counts = Counter()
+
+    def update(self, col: pd.Series | ListCodes) -> None:
+        """Count the values of a chunk of the column"""
+        summary: pd.DataFrame
+        counts: pd.Series
+        if self.lists:
+            summary, counts = tools.anlz_list_cols(col)
+        else:
+            summary, counts = tools.anlz_string_cols(col)
+        self.total += int(summary['Total'].iloc[0])
+        self.missing += int(summary['Missing'].iloc[0])
+        self.counts.update(dict(zip(counts.index, counts.tolist())))
+
+    def merge(self, other: "CountAccumulator") -> None:
+        """Add the counts of other rows"""
+        self.total += other.total
+        self.missing += other.missing
+        self.counts.update(other.counts)
+
+    def top(self) -> pd.Series:
+        """The counts, the highest first, as value_counts"""
+        return pd.Series(self.counts, name='count', dtype='int64') \
+            .sort_values(ascending=False, kind='stable')
+
+    def summary(self) -> pd.DataFrame:
+        """The rows, the valid and the missing ones, and the unique values"""
+        return pd.DataFrame({
+            'Total': [self.total],
+            'Valid': [self.total - self.missing],
+            'Missing': [self.missing],
+            'Unique Items' if self.lists else 'Unique col': [len(self.counts)]
+        })
+
+
+class QuantileSketch:
+    """
+    KLL sketch of the quantiles of a stream of numbers.
+    The numbers are kept in levels; when a level is full it is
+    sorted and every second number (from a random first one) goes
+    up a level with twice the weight, so the memory stays about
+    3k numbers, whatever the length of the stream. Until the
+    first level is full, the quantiles are exact.
+    """
+
+    __slots__: list[str] = ['k', 'count', 'levels', '_rng']
+
+    k: int
+    count: int
+    levels: list[np.ndarray]
+    _rng: np.random.Generator
+
+    def __init__(self, k: int = 200, seed: int = 1) -> None:
+        self.k = k
+        self.count = 0
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values: np.ndarray | pd.Series) -> None:
+        """Add the numbers, the NaN are left out"""
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        self.count += len(values)
+        self.levels[0] = np.concatenate((self.levels[0], values))
+        self._compress()
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """Add the numbers of another sketch"""
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate((self.levels[level], items))
+        self.count += other.count
+        self._compress()
+
+    def rank_error(self) -> float:
+        """
+        The normalized rank error of the quantiles: the rank of a
+        returned number is within this fraction of the count from
+        the asked one, with 99% confidence. It is the bound of the
+        KLL sketch (Apache DataSketches), 1.3% for k = 200 and
+        0.2% for k = 2000, whatever the number of the values; 0
+        while nothing is compacted.
+        """
+        if len(self.levels) == 1:
+            return 0.0
+        return 2.296 / self.k**0.9723
+
+    def quantiles(self, probs: list[float]) -> np.ndarray:
+        """
+        The numbers at the probabilities, NaN if the sketch is
+        empty. In both regimes a number of weight w stands for the
+        w ranks it replaces and sits at their middle; the rank
+        p * (count - 1) is interpolated linearly between the
+        numbers around it. With all the weights 1 (nothing is
+        compacted) this is np.quantile, as Series.quantile.
+        """
+        if self.count == 0:
+            return np.full(len(probs), np.nan)
+        items: np.ndarray = np.concatenate(self.levels)
+        weights: np.ndarray = np.concatenate([
+            np.full(len(level), 2**height, dtype=np.int64)
+            for height, level in enumerate(self.levels)])
+        order: np.ndarray = np.argsort(items, kind='stable')
+        weights = weights[order]
+        cum_weights: np.ndarray = np.cumsum(weights)
+        positions: np.ndarray = cum_weights - (weights + 1) / 2
+        ranks: np.ndarray = np.asarray(probs) * (cum_weights[-1] - 1)
+        return np.interp(ranks, positions, items[order])
+
+    def _capacity(self, level: int) -> int:
+        """The size of a full level, smaller for the lower levels"""
+        depth: int = len(self.levels) - level - 1
+        return max(2, int(np.ceil(self.k * (2 / 3)**depth)))
+
+    def _compress(self) -> None:
+        """Compact the lowest full level until none is full"""
+        while True:
+            full: list[int] = [
+                level for level, items in enumerate(self.levels)
+                if len(items) >= self._capacity(level)]
+            if not full:
+                return
+            level: int = full[0]
+            if level + 1 == len(self.levels):
+                self.levels.append(np.empty(0))
+            items: np.ndarray = np.sort(self.levels[level])
+            # An odd number stays in the level
+            even: int = len(items) - len(items) % 2
+            offset: int = int(self._rng.integers(2))
+            self.levels[level + 1] = np.concatenate(
+                (self.levels[level + 1], items[offset:even:2]))
+            self.levels[level] = items[even:]
+
+
+class NumberAccumulator:
+    """Count, mean, variance, min, max and quartiles of a column"""
+
+    __slots__: list[str] = [
+        'total', 'missing', 'count', 'mean', 'm2', 'min', 'max', 'sketch']
+
+    total: int
+    missing: int
+    count: int
+    mean: float
+    m2: float
+    min: float
+    max: float
+    sketch: QuantileSketch
+
+    def __init__(self, k: int = 200) -> None:
+        self.total = 0
+        self.missing = 0
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self.sketch = QuantileSketch(k=k)
+
+    def update(self, col: pd.Series) -> None:
+        """Add a chunk of the column, the zeros are not counted"""
+        self.add(tools.clean_numbers(col).to_numpy(), total=len(col),
+                 missing=int(col.replace(tools.PLACEHOLDERS, pd.NA)
+                             .isna().sum()))
+
+    def add(self, values: np.ndarray, total: int, missing: int) -> None:
+        """
+        Add the numbers of `total` rows, of which `missing` are
+        missing; the values are without the missing and the zeros.
+        """
+        self.total += total
+        self.missing += missing
+        if len(values) == 0:
+            return
+        chunk = NumberAccumulator(k=self.sketch.k)
+        chunk.count = len(values)
+        chunk.mean = float(values.mean())
+        chunk.m2 = float(((values - chunk.mean)**2).sum())
+        chunk.min = float(values.min())
+        chunk.max = float(values.max())
+        self._merge_moments(chunk)
+        self.sketch.update(values)
+
+    def merge(self, other: "NumberAccumulator") -> None:
+        """Add the numbers of other rows"""
+        self.total += other.total
+        self.missing += other.missing
+        self._merge_moments(other)
+        self.sketch.merge(other.sketch)
+
+    def describe(self) -> pd.Series:
+        """
+        The same entries as anlz_numerical_cols, the percentiles
+        from the sketch (see QuantileSketch.rank_error).
+        """
+        quantiles: np.ndarray = self.sketch.quantiles(tools.PERCENTILES)
+        empty: bool = self.count == 0
+        return pd.Series({
+            'count': float(self.count),
+            'mean': np.nan if empty else self.mean,
+            'std': np.sqrt(self.m2 / (self.count - 1))
+            if self.count > 1 else np.nan,
+            'min': np.nan if empty else self.min,
+            **{f'{prob:.0%}': value
+               for prob, value in zip(tools.PERCENTILES, quantiles)},
+            'max': np.nan if empty else self.max,
+        })
+
+    def summary(self) -> pd.DataFrame:
+        """The summary of anlz_numerical_cols"""
+        stats: pd.Series = self.describe()
+        return pd.DataFrame({
+            'Total': [self.total],
+            'Valid': [self.total - self.missing],
+            'Missing': [self.missing],
+            'Mean': [stats['mean']],
+            'Std Dev': [stats['std']],
+            'Min': [stats['min']],
+            'Max': [stats['max']]
+        })
+
+    def _merge_moments(self, other: "NumberAccumulator") -> None:
+        """Chan's parallel update of the count, mean and m2"""
+        if other.count == 0:
+            return
+        count: int = self.count + other.count
+        delta: float = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta**2 * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+
+class GroupedNumbers:
+    """
+    The NumberAccumulator of numerical columns for each group of
+    the rows, e.g., the salaries of each job title or region; a
+    row of a list column (location) is in the group of each of
+    its items.
+    """
+
+    __slots__: list[str] = ['by', 'cols', 'k', 'groups']
+
+    by: str
+    cols: tuple[str, ...]
+    k: int
+    groups: dict[str, dict[str, NumberAccumulator]]
+
+    def __init__(self,
+                 by: str,
+                 cols: tuple[str, ...] = ('salary_min', 'salary_max'),
+                 k: int = 200
+                 ) -> None:
+        self.by = by
+        self.cols = cols
+        self.k = k
+        self.groups = {col: {} for col in cols}
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        """Add the rows of a chunk, in one pass over its groups"""
+        if self.by not in chunk.columns:
+            return
+        rows, codes, names = _group_rows(chunk[self.by])
+        order: np.ndarray = rows[np.argsort(codes, kind='stable')]
+        bounds: np.ndarray = np.searchsorted(
+            np.sort(codes), np.arange(len(names) + 1))
+        for col in self.cols:
+            if col not in chunk.columns:
+                continue
+            values: pd.Series = chunk[col].reset_index(drop=True)
+            missing: np.ndarray = values.replace(
+                tools.PLACEHOLDERS, pd.NA).isna().to_numpy()
+            # NaN for the missing numbers and the zeros
+            numbers: np.ndarray = tools.clean_numbers(values).reindex(
+                values.index).to_numpy(dtype=float)
+            groups: dict[str, NumberAccumulator] = self.groups[col]
+            for code, name in enumerate(names):
+                if bounds[code] == bounds[code + 1]:
+                    continue
+                group: np.ndarray = order[bounds[code]:bounds[code + 1]]
+                group_numbers: np.ndarray = numbers[group]
+                groups.setdefault(name, NumberAccumulator(k=self.k)).add(
+                    group_numbers[~np.isnan(group_numbers)],
+                    total=len(group), missing=int(missing[group].sum()))
+
+    def merge(self, other: "GroupedNumbers") -> None:
+        """Add the groups of other rows"""
+        for col, groups in other.groups.items():
+            for name, numbers in groups.items():
+                self.groups[col].setdefault(
+                    name, NumberAccumulator(k=self.k)).merge(numbers)
+
+    def table(self) -> pd.DataFrame:
+        """
+        The describe entries of each group (the rows) for each
+        column (the top level of the columns), the groups with the
+        most numbers of the first column first.
+        """
+        table = pd.concat({
+            col: pd.DataFrame({name: numbers.describe()
+                               for name, numbers in groups.items()
+                               if numbers.count > 0}).T
+            for col, groups in self.groups.items()}, axis=1)
+        if table.empty:
+            return table
+        return table.rename_axis(self.by).sort_values(
+            (table.columns[0][0], 'count'), ascending=False, kind='stable')
+
+
+class StatisticsAccumulator:
+    """The accumulators of the table of the emails"""
+
+    __slots__: list[str] = [
+        'key', 'sketch_k', 'counters', 'numbers', 'groups', 'seen',
+        'files']
+
+    key: str
+    sketch_k: int
+    counters: dict[str, CountAccumulator]
+    numbers: dict[str, NumberAccumulator]
+    groups: dict[str, GroupedNumbers]
+    seen: pd.Series
+    files: pd.Index
+
+    STRING_COLS: tuple[str, ...] = ('job_title',)
+    LIST_COLS: tuple[str, ...] = ('skills', 'language')
+    NUMBER_COLS: tuple[str, ...] = ('salary_min', 'salary_max')
+    # The numbers are also by job title and by region
+    GROUP_COLS: tuple[str, ...] = ('job_title', 'location')
+
+    def __init__(self, key: str = '', sketch_k: int = 200) -> None:
+        self.key = key
+        self.sketch_k = sketch_k
+        self._reset()
+
+    @classmethod
+    def load(cls,
+             path: str | Path,
+             key: str = '',
+             sketch_k: int = 200
+             ) -> "StatisticsAccumulator":
+        """The stored accumulators, empty ones if missing or of another key"""
+        path = Path(path)
+        if path.exists():
+            with path.open('rb') as f_r:
+                stored: StatisticsAccumulator = pickle.load(f_r)
+            if isinstance(stored, cls) and stored.key == key and \
+               stored.sketch_k == sketch_k and hasattr(stored, 'files'):
+                return stored
+        return cls(key=key, sketch_k=sketch_k)
+
+    def save(self, path: str | Path) -> None:
+        """Write the accumulators"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file: Path = path.with_suffix('.tmp')
+        with tmp_file.open('wb') as f_w:
+            pickle.dump(self, f_w, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, path)
+
+    def update(self,
+               df_info: pd.DataFrame,
+               chunk_size: int = 100_000,
+               new_files: typing.Collection[str] | None = None
+               ) -> int:
+        """
+        Count the rows of the table which are not counted yet.
+        With `new_files` (the files of the ingest manifest which
+        are analyzed in this run), the rows are told apart by the
+        paths of the counted files: if every counted file is still
+        in the table, once, and none of them is new or changed,
+        only the rows of the other files (the new ones, and the
+        ones which come back, e.g., an older near duplicate of a
+        removed ad) are hashed and counted. Otherwise, and without
+        `new_files`, the new rows are found by the fingerprints of
+        all the rows, and everything is counted again if some
+        counted rows are gone.
+
+        Args:
+            df_info (pd.DataFrame): The cleaned table of the emails,
+            the old and the new rows.
+            chunk_size (int): The number of rows counted at once.
+            new_files (Collection[str] | None): The paths of the
+            emails which are new since the last update.
+
+        Returns:
+            int: The number of the new rows.
+        """
+        if new_files is not None and 'file_path' in df_info.columns and \
+           len(self.files) == int(self.seen.sum()):
+            paths: pd.Series = df_info['file_path']
+            counted: np.ndarray = paths.isin(self.files).to_numpy()
+            if int(counted.sum()) == len(self.files) and \
+               self.files.isin(paths).all() and \
+               not self.files.isin(list(new_files)).any():
+                delta: pd.DataFrame = df_info[~counted]
+                self._update_rows(delta, chunk_size)
+                self.seen = self.seen.add(
+                    pd.Series(self._fingerprints(delta)).value_counts(),
+                    fill_value=0).astype(np.int64)
+                self.files = self.files.append(pd.Index(delta['file_path']))
+                return len(delta)
+            # Some counted files are removed, dropped or changed
+            self._reset()
+        fingerprints: np.ndarray = self._fingerprints(df_info)
+        counts: pd.Series = pd.Series(fingerprints).value_counts()
+        if (counts.reindex(self.seen.index, fill_value=0) < self.seen).any():
+            # Some counted rows are removed, count all again
+            self._reset()
+        # The k-th row of a fingerprint is new if fewer than k rows
+        # of it are counted
+        rank: np.ndarray = pd.Series(fingerprints).groupby(
+            fingerprints).cumcount().to_numpy()
+        stored: np.ndarray = self.seen.reindex(
+            fingerprints, fill_value=0).to_numpy()
+        new: np.ndarray = np.flatnonzero(rank >= stored)
+        self._update_rows(df_info.iloc[new], chunk_size)
+        self.seen = counts
+        self.files = pd.Index(df_info['file_path'], dtype=object) \
+            if 'file_path' in df_info.columns else pd.Index([], dtype=object)
+        return len(new)
+
+    def merge(self, other: "StatisticsAccumulator") -> None:
+        """Add the accumulators of other rows, e.g., of another shard"""
+        for col, counter in other.counters.items():
+            self.counters[col].merge(counter)
+        for col, numbers in other.numbers.items():
+            self.numbers[col].merge(numbers)
+        for by, grouped in other.groups.items():
+            self.groups[by].merge(grouped)
+        self.seen = self.seen.add(other.seen, fill_value=0).astype(np.int64)
+        self.files = self.files.append(other.files)
+
+    def _fingerprints(self, df_info: pd.DataFrame) -> np.ndarray:
+        """
+        The hash of the counted columns of every row; the other
+        columns do not change the statistics, so two ads with the
+        same counted values are the same fingerprint seen twice.
+        """
+        cols: list[str] = [
+            col for col in dict.fromkeys((
+                *self.STRING_COLS, *self.LIST_COLS, *self.NUMBER_COLS,
+                *self.GROUP_COLS))
+            if col in df_info.columns]
+        return clean_dataframe.row_fingerprints(df_info[cols]).to_numpy()
+
+    def _reset(self) -> None:
+        """Empty accumulators"""
+        self.counters = {
+            **{col: CountAccumulator() for col in self.STRING_COLS},
+            **{col: CountAccumulator(lists=True) for col in self.LIST_COLS}}
+        self.numbers = {col: NumberAccumulator(k=self.sketch_k)
+                        for col in self.NUMBER_COLS}
+        self.groups = {
+            by: GroupedNumbers(by, cols=self.NUMBER_COLS, k=self.sketch_k)
+            for by in self.GROUP_COLS}
+        self.seen = pd.Series(dtype=np.int64,
+                              index=pd.Index([], dtype=np.uint64))
+        # The paths of the files of the counted rows
+        self.files = pd.Index([], dtype=object)
+
+    def _update_rows(self, rows: pd.DataFrame, chunk_size: int) -> None:
+        """Add the rows to every accumulator, in chunks"""
+        for start in range(0, len(rows), max(1, chunk_size)):
+            self._update_chunk(rows.iloc[start:start + chunk_size])
+
+    def _update_chunk(self, chunk: pd.DataFrame) -> None:
+        """Add the rows of a chunk to every accumulator"""
+        for col in self.STRING_COLS:
+            if col in chunk.columns:
+                self.counters[col].update(chunk[col])
+        for col in self.LIST_COLS:
+            if col in chunk.columns:
+                self.counters[col].update(ListCodes.from_series(chunk[col]))
+        for col in self.NUMBER_COLS:
+            if col in chunk.columns:
+                self.numbers[col].update(chunk[col])
+        for grouped in self.groups.values():
+            grouped.update(chunk)
+
+
+def _group_rows(col: pd.Series
+                ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    The positions of the rows, the code of their group and the
+    groups: the values of a string column or the items of a list
+    column (once per row); the missing ones are left out.
+    """
+    if col.dtype == object and \
+       any(isinstance(x, list) for x in col.to_numpy()):
+        lists: ListCodes = ListCodes.from_series(col)
+        valid: np.ndarray = lists.codes >= 0
+        # An item repeated in a row is counted once
+        pairs: np.ndarray = pd.unique(
+            lists.row_ids()[valid] * len(lists.vocab) + lists.codes[valid])
+        rows: np.ndarray = pairs // max(1, len(lists.vocab))
+        codes: np.ndarray = pairs % max(1, len(lists.vocab))
+        names: np.ndarray = lists.vocab
+    else:
+        rows = np.arange(len(col))
+        codes, names = pd.factorize(col)
+        names = np.asarray(names, dtype=object)
+    # The placeholders are missing groups
+    real: np.ndarray = ~pd.Series(names, dtype=object).replace(
+        tools.PLACEHOLDERS, pd.NA).isna().to_numpy()
+    keep: np.ndarray = codes >= 0
+    keep[keep] = real[codes[keep]]
+    return rows[keep], codes[keep], names
@@ -22,6 +22,7 @@ Samiri
 """
 
 import typing
+import tempfile
 from pathlib import Path
 import email
 
@@ -31,18 +32,25 @@ from omegaconf import DictConfig
 
 from . import logger
 from . import tools_analysis as tools
+from . import language_detector
 from . import payload_analysis
+from . import near_duplicates
 from . import terms_unify
+from . import title_resolver
+from . import taxonomy_cache as taxo
 
 
 class AnalysisEmails:
     """Analysing the emails"""
 
-    __slots__: list[str] = ['cfg', 'eml_dict', 'df_info']
+    __slots__: list[str] = [
+        'cfg', 'eml_dict', 'df_info', 'detector', 'resolver']
 
     eml_dict: dict[Path, "email.message.EmailMesagge"]
     cfg: DictConfig
     df_info: pd.DataFrame
+    detector: language_detector.LanguageDetector | None
+    resolver: title_resolver.TitleResolver | None
 
     def __init__(self,
                  eml_dict: dict[Path, "email.message.EmailMesagge"],
@@ -50,20 +58,73 @@ class AnalysisEmails:
                  ) -> None:
         self.cfg = cfg
         self.eml_dict = eml_dict
+        self.detector = self._make_detector()
+        self.resolver = self._make_resolver()
 
     def analyzing(self,
                   log: logger.logging.Logger
                   ) -> None:
         """Initiate analyzing"""
+        if not self.eml_dict:
+            self.df_info = self._empty_info()
+            return
         eml_df: pd.DataFrame = self.extract_email_data()
         self.df_info = self.analyze_email_payload(eml_df, log)
+        self._save_languages(log)
+        self._save_titles(log)
+
+    def analyzing_stream(self,
+                         eml_chunks: typing.Iterable[
+                             dict[Path, "email.message.EmailMesagge"]],
+                         log: logger.logging.Logger
+                         ) -> None:
+        """
+        Analyze the emails chunk by chunk.
+        Each chunk of parsed emails is extracted, analyzed and
+        reduced to its rows of `df_info`, which are written to a
+        part file in a temporary folder of paths.stream_spool
+        before the next chunk is read. While the emails are
+        analyzed, the memory is one chunk of emails and its rows,
+        plus what grows with the number of the emails anyway: the
+        list of their paths and the memo of their languages
+        (about 0.2 kB per email). The rows are the same as the
+        ones from `analyzing`.
+        At the end `df_info` is read back from the part files,
+        which are then removed: the next stages work on the whole
+        table, so its rows (about 2 kB each with the near
+        duplicates on, a quarter of it the MinHash signature) are
+        all in memory then, without the emails and their payloads.
+        """
+        spool_dir = Path(self.cfg.defaults.paths.stream_spool)
+        spool_dir.mkdir(parents=True, exist_ok=True)
+        with tempfile.TemporaryDirectory(dir=spool_dir) as tmp_dir:
+            parts: list[Path] = []
+            for eml_chunk in eml_chunks:
+                self.eml_dict = eml_chunk
+                eml_df: pd.DataFrame = self.extract_email_data()
+                # The emails are not kept while the next chunk is read
+                self.eml_dict = {}
+                del eml_chunk
+                parts.append(Path(tmp_dir) / f'part_{len(parts):05d}.pkl')
+                self._split_payload(eml_df).to_pickle(parts[-1])
+                del eml_df
+            self.df_info = pd.concat(
+                [pd.read_pickle(part) for part in parts],
+                ignore_index=True) if parts else self._empty_info()
+        log.info(f'\nThe DataFrame from {len(parts)} chunks of emails '
+                 'extrcted, with column:\n'
+                 f'\t{self.df_info.columns.to_list()}\n')
+        self._save_languages(log)
+        self._save_titles(log)
 
     def extract_email_data(self) -> pd.DataFrame:
         """initiate the analysis"""
         attchments: dict[Path, dict[str, typing.Any]] = \
             tools.extract_email_detail(self.eml_dict)
         eml_df: pd.DataFrame = tools.eml_to_dataframe(attchments)
-        eml_df.loc[:, 'eml_lang'] = tools.detect_language(eml_df['payload'])
+        eml_df.loc[:, 'eml_lang'] = \
+            tools.detect_language(eml_df['payload'], self.detector)
+        eml_df['date'] = tools.parse_dates(eml_df['date'])
 
         return eml_df
 
@@ -72,14 +133,72 @@ class AnalysisEmails:
                               log: logger.logging.Logger
                               ) -> pd.DataFrame:
         """call the sub-class to analysis the payload"""
-        bodies = eml_df[['file_path', 'payload', 'eml_lang']]
-        df_info: pd.DataFrame = \
-            payload_analysis.split_payload(bodies, self.cfg)
+        df_info: pd.DataFrame = self._split_payload(eml_df)
         log.info('\nThe DataFrame from the emails extrcted, with column:\n'
                  f'\t{df_info.columns.to_list()}\n')
 
         return df_info
 
+    def _make_detector(self) -> language_detector.LanguageDetector | None:
+        """The memoized language detector, if it is enabled"""
+        lang_cfg: DictConfig = self.cfg.defaults.analysis.lang_detection
+        if not lang_cfg.memo:
+            return None
+        return language_detector.LanguageDetector(
+            cache_file=self.cfg.defaults.paths.lang_cache,
+            prefix_chars=lang_cfg.prefix_chars)
+
+    def _save_languages(self, log: logger.logging.Logger) -> None:
+        """Keep the detected languages for the next runs"""
+        if self.detector is None:
+            return
+        self.detector.save()
+        log.info(self.detector.report())
+
+    def _make_resolver(self) -> title_resolver.TitleResolver | None:
+        """The memoized job titles, if it is enabled"""
+        title_cfg: DictConfig = self.cfg.defaults.analysis.title_memo
+        if not title_cfg.memo:
+            return None
+        compiled: taxo.CompiledTaxonomy = taxo.load_compiled(self.cfg)
+        return title_resolver.TitleResolver(
+            matcher=compiled.matchers['job_titles'],
+            tag_pattern=compiled.title_pattern,
+            key=compiled.key,
+            cache_file=self.cfg.defaults.paths.title_cache,
+            max_size=title_cfg.max_size)
+
+    def _save_titles(self, log: logger.logging.Logger) -> None:
+        """Keep the memo of the job titles for the next runs"""
+        if self.resolver is None:
+            return
+        self.resolver.save()
+        log.info(self.resolver.report())
+
+    def _empty_info(self) -> pd.DataFrame:
+        """The DataFrame when there is no email to analyze"""
+        columns: list[str] = list(self.cfg.defaults.analysis.df_columns)
+        return pd.DataFrame(columns=columns)
+
+    def _split_payload(self,
+                       eml_df: pd.DataFrame
+                       ) -> pd.DataFrame:
+        """Get the info of the jobs from the payloads"""
+        bodies = eml_df[['file_path', 'date', 'payload', 'eml_lang']]
+        anlz_cfg: DictConfig = self.cfg.defaults.analysis
+        near_cfg: DictConfig = anlz_cfg.near_duplicates
+        hasher: near_duplicates.MinHasher | None = \
+            near_duplicates.MinHasher(num_perm=near_cfg.num_perm,
+                                      shingle_size=near_cfg.shingle_size) \
+            if near_cfg.enabled else None
+        return payload_analysis.split_payload(
+            bodies,
+            self.cfg,
+            n_workers=anlz_cfg.n_workers,
+            chunk_size=anlz_cfg.chunk_size,
+            hasher=hasher,
+            resolver=self.resolver)
+
     def unify_terms(self,
                     log: logger.logging.Logger
                     ) -> pd.DataFrame:
@@ -5,101 +5,155 @@ Remove duplicate rows from possible multiple similar email
 S. Amiri
 """
 
+import typing
+import itertools
+
+import numpy as np
 import pandas as pd
 
+from . import near_duplicates
+from . import sections
+
 
 __all__ = [
     'remove_duplicate',
+    'remove_near_duplicate',
+    'row_fingerprints',
     'set_languages'
 ]
 
+# Mixed in the hash of the cells of a list column which are not
+# lists, so "Python" and ["Python"] are not the same
+SCALAR_MARK: np.uint64 = np.uint64(0x9E3779B97F4A7C15)
+
 
 def remove_duplicate(df_info: pd.DataFrame,
                      ) -> pd.DataFrame:
     """
     Remove duplicated rows (emails) from the DataFrame.
-    Handles columns with list-type elements by converting
-    them to strings for comparison and then back to lists.
+    Every row is reduced to a 64-bit fingerprint, ignoring the
+    'file_path' and 'date' columns (the same ad sent again) and
+    the spans of the sections (the same ad in another layout), and
+    the rows with a repeated fingerprint are dropped. The
+    list-type elements are compared whatever the order of their
+    items, and are kept as they are.
     """
-    list_cols: list[str] = _get_list_columns(df_info)
-    df_info = _convert_list_to_string(df_info, list_cols)
-    df_info = _drop_duplicates(df_info)
-    df_info = _convert_strings_to_lists(df_info, list_cols)
+    fingerprints: pd.Series = row_fingerprints(
+        df_info, exclude=['file_path', 'date',
+                          *sections.span_columns(df_info.columns)])
+    df_info = df_info[~fingerprints.duplicated(keep='first')]
+    df_info = df_info.reset_index(drop=True)
     df_info = _order_dataframe(df_info, 'file_path')
     return df_info
 
 
-def _get_list_columns(df: pd.DataFrame) -> list[str]:
+def remove_near_duplicate(df_info: pd.DataFrame,
+                          threshold: float = 0.8
+                          ) -> pd.DataFrame:
     """
-    Identify columns in the DataFrame that contain list-type
-    elements.
+    Keep only the first of the ads which are near duplicates,
+    by the MinHash signatures in the 'minhash' column, and drop
+    this column.
 
     Args:
-        df (pd.DataFrame): The input DataFrame.
+        df_info (pd.DataFrame): The rows of the emails.
+        threshold (float): The least estimated Jaccard similarity
+        of the clean payloads of two duplicates.
 
     Returns:
-        list[str]: List of column names containing list-type
-        elements.
+        pd.DataFrame: The DataFrame without the near duplicates.
     """
-    return [col for col in df.columns if
-            df[col].apply(lambda x: isinstance(x, list)).any()]
+    if 'minhash' not in df_info.columns:
+        return df_info
+    keep: np.ndarray = near_duplicates.first_of_groups(
+        df_info['minhash'].tolist(), threshold)
+    return df_info[keep].drop(columns='minhash').reset_index(drop=True)
 
 
-def _convert_list_to_string(df: pd.DataFrame,
-                            cols: list[str]
-                            ) -> pd.DataFrame:
+def row_fingerprints(df: pd.DataFrame,
+                     exclude: list[str] | None = None,
+                     ordered: bool = False
+                     ) -> pd.Series:
     """
-    Convert list-type elements in specified columns to strings
-    for comparison.
+    Return a stable uint64 hash of every row of the DataFrame.
 
     Args:
         df (pd.DataFrame): The input DataFrame.
-        cols (list[str]): List of column names to process.
+        exclude (list[str] | None): Columns left out of the hash.
+        ordered (bool): Whether the order of the items of the
+        lists changes the hash; by default a list is hashed as
+        the multiset of its items, for the duplicates.
 
     Returns:
-        pd.DataFrame: DataFrame with lists converted to strings.
+        pd.Series: The fingerprint of each row, with the index
+        of the DataFrame.
     """
-    for col in cols:
-        df.loc[:, col] = df[col].apply(lambda x: '-'.join(x)
-                                       if isinstance(x, list) else x)
-    return df
+    cols: list[str] = [col for col in df.columns
+                       if col not in (exclude or [])]
+    frame: pd.DataFrame = df[cols].copy()
+    for col in _get_list_columns(frame):
+        frame[col] = _hash_lists(frame[col], ordered=ordered)
+    return pd.util.hash_pandas_object(frame, index=False)
 
 
-def _drop_duplicates(df: pd.DataFrame) -> pd.DataFrame:
+def _get_list_columns(df: pd.DataFrame) -> list[str]:
     """
-    Drop duplicate rows from the DataFrame, ignoring the
-    'file_path' column.
+    Identify columns in the DataFrame that contain list-type
+    elements.
 
     Args:
         df (pd.DataFrame): The input DataFrame.
 
     Returns:
-        pd.DataFrame: DataFrame with duplicates removed.
+        list[str]: List of column names containing list-type
+        elements.
     """
-    df = df.drop_duplicates(subset=df.columns.difference(['file_path']),
-                            keep='first',
-                            ignore_index=True)
-    return df
+    return [col for col in df.columns if df[col].dtype == object and
+            any(isinstance(x, list) for x in df[col].values)]
 
 
-def _convert_strings_to_lists(df: pd.DataFrame,
-                              cols: list[str]
-                              ) -> pd.DataFrame:
+def _hash_lists(col: pd.Series, ordered: bool = False) -> np.ndarray:
     """
-    Convert string-type elements in specified columns back
-    to lists.
+    Hash the lists of a column independently of the order of
+    their items: every item is hashed and the hashes of a list
+    are summed (mod 2**64). The other cells of the column are
+    hashed as one-item lists, marked so they are not equal to
+    them.
+    If `ordered`, the hash of an item is mixed with its position
+    in the list before the sum, so a reordered list is another
+    hash.
 
     Args:
-        df (pd.DataFrame): The input DataFrame.
-        cols (list[str]): List of column names to process.
+        col (pd.Series): A column with list-type elements.
+        ordered (bool): Whether the order of the items counts.
 
     Returns:
-        pd.DataFrame: DataFrame with strings converted back
-        to lists.
+        np.ndarray: The uint64 hash of each cell.
     """
-    for col in cols:
-        df.loc[:, col] = df[col].apply(lambda x: x.split('-'))
-    return df
+    cells: list[list[typing.Any]] = [
+        x if isinstance(x, list) else [x] for x in col.values]
+    lengths: np.ndarray = np.fromiter(
+        map(len, cells), dtype=np.int64, count=len(cells))
+    items: np.ndarray = np.fromiter(
+        itertools.chain.from_iterable(cells), dtype=object,
+        count=int(lengths.sum()))
+    item_hashes: np.ndarray = pd.util.hash_array(items)
+    offsets: np.ndarray = np.cumsum(lengths) - lengths
+    if ordered:
+        positions: np.ndarray = np.arange(len(items), dtype=np.uint64) - \
+            np.repeat(offsets, lengths).astype(np.uint64)
+        item_hashes = pd.util.hash_array(
+            item_hashes ^ (positions * SCALAR_MARK))
+
+    hashes: np.ndarray = np.zeros(len(cells), dtype=np.uint64)
+    filled: np.ndarray = lengths > 0
+    if filled.any():
+        hashes[filled] = np.add.reduceat(item_hashes, offsets[filled])
+    is_list: np.ndarray = np.fromiter(
+        (isinstance(x, list) for x in col.values), dtype=bool,
+        count=len(cells))
+    hashes[~is_list] ^= SCALAR_MARK
+    return hashes
 
 
 def _order_dataframe(df: pd.DataFrame,
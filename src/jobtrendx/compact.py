@@ -0,0 +1,191 @@
+"""
+Compact representation of the table of the emails.
+In df_info every row keeps its own Python strings and lists,
+"Python" or "Berlin" are stored again in each row. For the
+statistics the columns are encoded once:
+  - the string columns with repeated values (job_title,
+    eml_lang, salary_unit, ...) become categorical,
+  - the list columns (skills, location, language) become a
+    ListCodes: one vocabulary of the distinct items and two
+    integer arrays,
+
+      vocab   = ['Python', 'SQL', 'Docker']
+      codes   = [0, 1, 2, 0]          # the items of all the rows
+      offsets = [0, 2, 3, 4]          # row i is codes[offsets[i]:
+                                      #              offsets[i+1]]
+
+and the same arrays are the CSR incidence matrix of the rows and
+the vocabulary (`ListCodes.incidence`), from which the counts of
+the items, of their categories and of the items of a group of
+rows are sums and products of sparse matrices.
+
+16 Oct. 2026
+S. Amiri
+"""
+
+import itertools
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from scipy import sparse
+
+
+__all__ = [
+    'ListCodes',
+    'categorize',
+    'column_sums',
+    'encode_lists',
+]
+
+
+class ListCodes:
+    """A column of lists as integer codes into a vocabulary"""
+
+    __slots__: list[str] = [
+        'offsets', 'codes', 'vocab', 'missing', '_matrix']
+
+    offsets: np.ndarray
+    codes: np.ndarray
+    vocab: np.ndarray
+    missing: np.ndarray
+    _matrix: sparse.csr_matrix | None
+
+    def __init__(self,
+                 offsets: np.ndarray,
+                 codes: np.ndarray,
+                 vocab: np.ndarray,
+                 missing: np.ndarray
+                 ) -> None:
+        self.offsets = offsets
+        self.codes = codes
+        self.vocab = vocab
+        self.missing = missing
+        self._matrix = None
+
+    @classmethod
+    def from_series(cls, col: pd.Series) -> "ListCodes":
+        """
+        Encode a column of lists, the cells which are not lists
+        are empty rows, and the NaN cells are also missing.
+        """
+        values: np.ndarray = col.to_numpy()
+        cells: list[list[str]] = [
+            x if isinstance(x, list) else [] for x in values]
+        offsets: np.ndarray = np.zeros(len(cells) + 1, dtype=np.int64)
+        np.cumsum(np.fromiter(map(len, cells), dtype=np.int64,
+                              count=len(cells)), out=offsets[1:])
+        items: np.ndarray = np.fromiter(
+            itertools.chain.from_iterable(cells), dtype=object,
+            count=int(offsets[-1]))
+        codes, vocab = pd.factorize(items)
+        return cls(offsets=offsets,
+                   codes=codes.astype(np.int32),
+                   vocab=np.asarray(vocab, dtype=object),
+                   missing=np.asarray(pd.isna(values), dtype=bool))
+
+    @classmethod
+    def from_arrow(cls, array: pa.ChunkedArray | pa.Array) -> "ListCodes":
+        """Encode an Arrow list<string> column, without Python lists"""
+        if isinstance(array, pa.ChunkedArray):
+            array = array.combine_chunks()
+        offsets: np.ndarray = array.offsets.to_numpy().astype(np.int64)
+        items: pa.Array = array.values.slice(
+            offsets[0], offsets[-1] - offsets[0])
+        encoded = items.dictionary_encode()
+        codes: np.ndarray = encoded.indices.fill_null(-1).to_numpy()
+        return cls(offsets=offsets - offsets[0],
+                   codes=codes.astype(np.int32),
+                   vocab=np.asarray(encoded.dictionary.to_pylist(),
+                                    dtype=object),
+                   missing=array.is_null().to_numpy(zero_copy_only=False))
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def lengths(self) -> np.ndarray:
+        """The number of items of each row"""
+        return np.diff(self.offsets)
+
+    @property
+    def nbytes(self) -> int:
+        """The memory of the arrays, without the vocabulary strings"""
+        return self.offsets.nbytes + self.codes.nbytes + \
+            self.vocab.nbytes + self.missing.nbytes
+
+    def row_ids(self) -> np.ndarray:
+        """The row of each item of `codes`"""
+        return np.repeat(np.arange(len(self), dtype=np.int64),
+                         self.lengths)
+
+    def incidence(self) -> sparse.csr_matrix:
+        """
+        The rows x vocabulary matrix of the number of times each
+        item is in a row, built once over the codes.
+        """
+        if self._matrix is None:
+            valid: np.ndarray = self.codes >= 0
+            offsets: np.ndarray = self.offsets
+            if not valid.all():
+                # Drop the NaN items and shift the offsets
+                offsets = np.concatenate(
+                    ([0], np.cumsum(valid, dtype=np.int64)))[offsets]
+            self._matrix = sparse.csr_matrix(
+                (np.ones(int(valid.sum()), dtype=np.int64),
+                 self.codes[valid], offsets),
+                shape=(len(self), len(self.vocab)))
+        return self._matrix
+
+    def counts(self) -> pd.Series:
+        """
+        Count the items, the same as pd.Series.value_counts of the
+        flattened items: the vocabulary is in the order the items
+        are first seen, which is sorted by the count.
+        """
+        counts = pd.Series(column_sums(self.incidence()),
+                           index=pd.Index(self.vocab), name='count')
+        counts = counts[counts > 0]
+        return counts.sort_values(ascending=False)
+
+    def to_series(self, index: pd.Index | None = None) -> pd.Series:
+        """Decode to a column of lists, NaN for the missing rows"""
+        # The code -1 (a NaN item) takes the NaN at the end
+        items: list[str] = np.append(self.vocab, np.nan)[self.codes].tolist()
+        bounds: list[int] = self.offsets.tolist()
+        cells: list[list[str] | float] = [
+            np.nan if missing else items[start:end]
+            for start, end, missing in zip(
+                bounds[:-1], bounds[1:], self.missing.tolist())]
+        return pd.Series(cells, index=index, dtype=object)
+
+
+def column_sums(matrix: sparse.spmatrix) -> np.ndarray:
+    """The sum of each column of a sparse matrix, as a 1-D array"""
+    return np.asarray(matrix.sum(axis=0)).ravel()
+
+
+def categorize(df: pd.DataFrame, max_share: float = 0.5) -> pd.DataFrame:
+    """
+    Return the DataFrame with its string columns as categorical,
+    if their distinct values are at most `max_share` of the rows.
+    The other columns are not copied.
+    """
+    df = df.copy(deep=False)
+    for col in df.columns:
+        if df[col].dtype != object or \
+           pd.api.types.infer_dtype(df[col], skipna=True) != 'string':
+            continue
+        if df[col].nunique() <= max_share * len(df):
+            df[col] = df[col].astype('category')
+    return df
+
+
+def encode_lists(df: pd.DataFrame) -> dict[str, ListCodes]:
+    """The ListCodes of every column of lists of the DataFrame"""
+    return {
+        col: ListCodes.from_series(df[col]) for col in df.columns
+        if df[col].dtype == object and
+        any(isinstance(x, list) for x in df[col].to_numpy())
+    }
+
@@ -0,0 +1,167 @@
+"""
+Skills which are asked together in the same ads.
+From the ads x skills incidence matrix B (1 if the ad asks for
+the skill), the skills x skills matrix
+
+    pairs = B.T @ B
+
+has the number of ads with both skills, and its diagonal the
+number of ads of each skill. It is summed over blocks of ads,
+so the memory is bounded by the vocabulary and not by the
+number of ads. The association of two skills i and j over the
+N ads:
+  - lift = pairs[i, j] * N / (ads[i] * ads[j]), above 1 if they
+    are asked together more often than by chance,
+  - PMI = log2(lift).
+The pairs of fewer than `min_count` ads are dropped, their lift
+is mostly noise.
+
+16 Oct. 2026
+S. Amiri
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+
+__all__ = [
+    'CoOccurrence',
+]
+
+MEASURES: tuple[str, ...] = ('count', 'lift', 'pmi')
+
+
+class CoOccurrence:
+    """The pair counts of the skills and their association"""
+
+    __slots__: list[str] = ['vocab', 'ads', 'pairs', 'nr_ads']
+
+    vocab: np.ndarray
+    ads: np.ndarray
+    pairs: sparse.csr_matrix
+    nr_ads: int
+
+    def __init__(self,
+                 vocab: np.ndarray,
+                 ads: np.ndarray,
+                 pairs: sparse.csr_matrix,
+                 nr_ads: int
+                 ) -> None:
+        self.vocab = vocab
+        self.ads = ads
+        self.pairs = pairs
+        self.nr_ads = nr_ads
+
+    @classmethod
+    def from_incidence(cls,
+                       matrix: sparse.csr_matrix,
+                       vocab: np.ndarray,
+                       min_count: int = 1,
+                       block_size: int = 100_000
+                       ) -> "CoOccurrence":
+        """
+        Count the pairs of the skills of the ads.
+
+        Args:
+            matrix (sparse.csr_matrix): The ads x skills incidence,
+            the number of times a skill is in an ad.
+            vocab (np.ndarray): The skill of each column.
+            min_count (int): The least number of ads of a pair.
+            block_size (int): The number of ads multiplied at once.
+
+        Returns:
+            CoOccurrence: The pairs, without the diagonal.
+        """
+        # An ad counts once, even if it repeats the skill
+        binary: sparse.csr_matrix = (matrix > 0).astype(np.int64).tocsr()
+        size: int = binary.shape[1]
+        pairs = sparse.csr_matrix((size, size), dtype=np.int64)
+        for start in range(0, binary.shape[0], block_size):
+            block: sparse.csr_matrix = binary[start:start + block_size]
+            pairs = pairs + (block.T @ block).tocsr()
+
+        ads: np.ndarray = pairs.diagonal()
+        pairs = (pairs - sparse.diags(
+            ads, format='csr', dtype=np.int64)).tocsr()
+        pairs.data[pairs.data < min_count] = 0
+        pairs.eliminate_zeros()
+        return cls(vocab=vocab, ads=ads, pairs=pairs,
+                   nr_ads=binary.shape[0])
+
+    def lift(self) -> sparse.csr_matrix:
+        """The lift of each counted pair"""
+        lift: sparse.csr_matrix = self.pairs.astype(float)
+        rows: np.ndarray = np.repeat(np.arange(lift.shape[0]),
+                                     np.diff(lift.indptr))
+        lift.data *= self.nr_ads / (self.ads[rows] * self.ads[lift.indices])
+        return lift
+
+    def pmi(self) -> sparse.csr_matrix:
+        """The pointwise mutual information (bits) of each pair"""
+        pmi: sparse.csr_matrix = self.lift()
+        pmi.data = np.log2(pmi.data)
+        return pmi
+
+    def top_k(self, k: int = 10, measure: str = 'lift') -> pd.DataFrame:
+        """
+        The k pairs of each skill with the highest measure.
+
+        Args:
+            k (int): The number of pairs of each skill.
+            measure (str): 'count', 'lift' or 'pmi'.
+
+        Returns:
+            pd.DataFrame: The skill, the other skill, the number of
+            ads of both, their lift and PMI; by the skill (the most
+            asked first) and then by the measure.
+        """
+        if measure not in MEASURES:
+            raise ValueError(f'`{measure}` is not one of {MEASURES}')
+        lift: sparse.csr_matrix = self.lift()
+        values: dict[str, np.ndarray] = {
+            'count': self.pairs.data,
+            'lift': lift.data,
+            'pmi': np.log2(lift.data),
+        }
+        rows: np.ndarray = np.repeat(np.arange(lift.shape[0]),
+                                     np.diff(lift.indptr))
+        # The most asked skill first, then the highest measure
+        order: np.ndarray = np.lexsort(
+            (-values['lift'], -values['count'], -values[measure], rows,
+             -self.ads[rows]))
+        keep: np.ndarray = order[_rank_in_groups(rows[order]) < k]
+        return pd.DataFrame({
+            'skill': self.vocab[rows[keep]],
+            'other': self.vocab[self.pairs.indices[keep]],
+            'count': values['count'][keep],
+            'lift': values['lift'][keep],
+            'pmi': values['pmi'][keep],
+        })
+
+    def frame(self, skills: list[str], measure: str = 'lift') -> pd.DataFrame:
+        """
+        The dense skills x skills table of the measure for a few
+        skills (e.g., the most asked ones), 0 for the pairs which
+        are not counted.
+        """
+        if measure not in MEASURES:
+            raise ValueError(f'`{measure}` is not one of {MEASURES}')
+        matrix: sparse.csr_matrix = {
+            'count': self.pairs, 'lift': self.lift(), 'pmi': self.pmi()
+        }[measure]
+        positions: np.ndarray = pd.Index(self.vocab).get_indexer(skills)
+        positions = positions[positions >= 0]
+        names: list[str] = self.vocab[positions].tolist()
+        return pd.DataFrame(matrix[positions][:, positions].toarray(),
+                            index=names, columns=names)
+
+
+def _rank_in_groups(groups: np.ndarray) -> np.ndarray:
+    """The position of each item in its run of equal groups"""
+    if groups.size == 0:
+        return groups
+    starts: np.ndarray = np.flatnonzero(
+        np.concatenate(([True], groups[1:] != groups[:-1])))
+    return np.arange(groups.size) - np.repeat(
+        starts, np.diff(np.append(starts, groups.size)))
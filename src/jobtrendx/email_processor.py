@@ -3,30 +3,50 @@ Reading emails frpm .eml files and extracting the body of the email
 """
 
 import sys
+import typing
 from pathlib import Path
 
-import email
-
 from . import tools_processor as tools
 from . import logger
+from . import manifest as mfst
 
 
 class EmailProcessor:
     """
     Class to process emails
     """
-    __slots__ = ['eml_dir', 'eml_dict', 'log']
+    __slots__ = ['eml_dir', 'eml_dict', 'log', 'n_workers', 'chunk_size',
+                 'nr_processed', 'manifest', 'eml_paths', 'fast']
 
-    eml_dict: dict[Path, "email.message.EmailMessage"]
+    eml_dict: dict[Path, "tools.EmailContent"]
     log: logger.logging.Logger
+    n_workers: int
+    chunk_size: int
+    fast: bool
+    nr_processed: int
+    manifest: mfst.IngestManifest | None
+    eml_paths: list[Path]
 
     def __init__(self,
                  eml_dir: str,
-                 log: logger.logging.Logger
+                 log: logger.logging.Logger,
+                 n_workers: int = 1,
+                 chunk_size: int = 64,
+                 manifest: mfst.IngestManifest | None = None,
+                 fast: bool = False
                  ) -> None:
+        # pylint: disable=too-many-arguments
+        # pylint: disable=too-many-positional-arguments
         self.eml_dir = eml_dir
         self.eml_dict = {}  # Initialize empty dictionary
         self.log = log
+        self.n_workers = n_workers
+        self.chunk_size = chunk_size
+        self.nr_processed = 0
+        self.manifest = manifest
+        self.eml_paths = []
+        # Read only the headers and the first text part of the emails
+        self.fast = fast
 
     def execute(self) -> None:
         """Execute the class"""
@@ -37,6 +57,30 @@ class EmailProcessor:
         """
         Read the email file and extract the body of the email
         """
+        eml_paths: list[Path] = self._new_eml_paths()
+        self.eml_dict = self._read_paths(eml_paths)
+        self.nr_processed = len(self.eml_dict)
+
+    def iter_eml(self,
+                 stream_size: int
+                 ) -> typing.Iterator[dict[Path, "tools.EmailContent"]]:
+        """
+        Read the emails in chunks of `stream_size` files and
+        yield each chunk, so only one chunk of parsed emails
+        is kept in memory at a time.
+        The info is logged after the last chunk.
+        """
+        eml_paths: list[Path] = self._new_eml_paths()
+        self.nr_processed = 0
+        for paths in tools.iter_chunks(eml_paths, stream_size):
+            eml_chunk = self._read_paths(paths)
+            self.nr_processed += len(eml_chunk)
+            yield eml_chunk
+            del eml_chunk
+        self.log_info()
+
+    def get_eml_paths(self) -> list[Path]:
+        """Validate the directory and return the paths of .eml files"""
         # Validate directory
         tools.check_directory(self.eml_dir)
         tools.check_dir_not_empty(self.eml_dir)
@@ -44,15 +88,43 @@ class EmailProcessor:
         # Get list of all .eml files
         all_files: list[str] = tools.returns_all_files_in_dir(self.eml_dir)
         eml_files: list[str] = tools.returns_eml_files(all_files, 'eml')
-        eml_paths: list[Path] = tools.returns_eml_path(self.eml_dir, eml_files)
+        return tools.returns_eml_path(self.eml_dir, eml_files)
+
+    def _new_eml_paths(self) -> list[Path]:
+        """
+        Return the paths to read, with a manifest only the files
+        which are not processed before
+        """
+        self.eml_paths = self.get_eml_paths()
+        if self.manifest is None:
+            return self.eml_paths
+        return self.manifest.filter_new(self.eml_paths)
 
-        # Get email content
-        self.eml_dict = tools.returns_email_contant(eml_paths=eml_paths)
+    def _read_paths(self,
+                    eml_paths: list[Path]
+                    ) -> dict[Path, "tools.EmailContent"]:
+        """Get email content, in parallel if more than one worker is set"""
+        if self.n_workers == 1:
+            return tools.returns_email_contant(eml_paths=eml_paths,
+                                               fast=self.fast)
+        return tools.returns_email_contant_parallel(
+            eml_paths=eml_paths,
+            n_workers=self.n_workers,
+            chunk_size=self.chunk_size,
+            fast=self.fast)
 
     def log_info(self) -> None:
         """log the info into log file"""
-        self.log.info(f'EmailProcessor: Processed {len(self.eml_dict)} '
-                      'emails successfully.')
+        self.log.info(f'EmailProcessor: Processed {self.nr_processed} '
+                      'emails successfully with '
+                      f'{tools.resolve_workers(self.n_workers)} worker(s).')
+        if self.manifest is not None:
+            self.log.info(
+                f'EmailProcessor: {len(self.manifest.known)} known emails '
+                f'skipped ({len(self.manifest.rehashed)} of them hashed '
+                'again and unchanged), '
+                f'{len(self.manifest.pending)} new or changed, '
+                f'{len(self.manifest.removed)} removed since the last run.')
 
 
 if __name__ == "__main__":
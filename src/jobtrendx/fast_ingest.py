@@ -0,0 +1,151 @@
+"""
+Fast reading of the .eml files.
+Parsing an email with policy.default builds the whole tree of
+EmailMessage objects, with the modern header objects for every
+header of every part, and extract_email_detail walks the tree
+again for the payload and the attachments. Only a few headers
+and the first text part are used, so read_eml goes straight to
+them on the raw bytes:
+  - the header block is parsed alone with the compat32 header
+    parser, and only the used headers are decoded,
+  - the body is split at the MIME boundaries by hand, only the
+    headers of the parts are parsed, for their type and the
+    names of the attachments,
+  - only the first text/plain part is decoded (the first part
+    with a body if there is none).
+The result is the dict of the details of extract_email_detail.
+
+16 Oct. 2026
+S. Amiri
+"""
+
+import re
+import typing
+import quopri
+import binascii
+from pathlib import Path
+from email import policy
+from email.header import decode_header, make_header
+from email.message import Message
+from email.parser import BytesHeaderParser
+
+
+__all__ = [
+    'read_eml',
+]
+
+# The headers of the details and their names in the emails
+HEADERS: dict[str, str] = {
+    'subject': 'subject',
+    'from': 'from',
+    'to': 'to',
+    'date': 'date',
+    'message_id': 'message-id',
+}
+
+_HEADER_PARSER: BytesHeaderParser = BytesHeaderParser(
+    policy=policy.compat32)
+# The blank line after the headers
+_HEADER_END: re.Pattern[bytes] = re.compile(rb'\n\n|\A\n')
+
+
+def read_eml(file_path: Path) -> dict[str, typing.Any]:
+    """
+    Read the details of a .eml file, the same as the ones of
+    tools_analysis.extract_email_detail, without an EmailMessage.
+
+    Args:
+        file_path (Path): The .eml file.
+
+    Returns:
+        dict[str, Any]: The headers, the plain text payload and
+        the file names of the attachments.
+    """
+    raw: bytes = Path(file_path).read_bytes().replace(b'\r\n', b'\n')
+    headers, body = _split_headers(raw)
+    details: dict[str, typing.Any] = {
+        key: _header_value(headers, name) for key, name in HEADERS.items()}
+    text_parts: list[tuple[Message, bytes]] = []
+    attachments: list[str | None] = []
+    _walk(headers, body, text_parts, attachments)
+    details['payload'] = _decode_part(*text_parts[0]) if text_parts else ''
+    details['attachments'] = attachments
+    return details
+
+
+def _split_headers(raw: bytes) -> tuple[Message, bytes]:
+    """The parsed headers and the raw body of a message or a part"""
+    match: re.Match[bytes] | None = _HEADER_END.search(raw)
+    if match is None:
+        return _HEADER_PARSER.parsebytes(raw), b''
+    return _HEADER_PARSER.parsebytes(raw[:match.start()]), \
+        raw[match.end():]
+
+
+def _header_value(headers: Message, name: str) -> str | None:
+    """A header with its encoded words decoded, None without it"""
+    value: str | None = headers.get(name)
+    if value is None:
+        return None
+    if '=?' not in value:
+        return ''.join(value.splitlines())
+    return str(make_header(decode_header(value)))
+
+
+def _walk(headers: Message,
+          body: bytes,
+          text_parts: list[tuple[Message, bytes]],
+          attachments: list[str | None]
+          ) -> None:
+    """
+    Collect the first text/plain part, or the first part with
+    a body, and the names of the attachments, in the order of
+    the parts
+    """
+    if headers.get_content_maintype() == 'multipart':
+        boundary: str | None = headers.get_boundary()
+        if boundary is not None:
+            for part in _split_parts(body, boundary.encode('ascii',
+                                                           'replace')):
+                _walk(*_split_headers(part), text_parts, attachments)
+            return
+    if headers.get_content_disposition() == 'attachment':
+        attachments.append(headers.get_filename())
+    if not text_parts:
+        text_parts.append((headers, body))
+    elif headers.get_content_type() == 'text/plain' and \
+            text_parts[0][0].get_content_type() != 'text/plain':
+        text_parts[0] = (headers, body)
+
+
+def _split_parts(body: bytes, boundary: bytes) -> list[bytes]:
+    """The parts of a multipart body, between its boundaries"""
+    delimiter: bytes = b'--' + boundary
+    chunks: list[bytes] = body.split(b'\n' + delimiter)
+    # The preamble, or the first part if there is no preamble
+    if chunks[0].startswith(delimiter):
+        chunks[0] = chunks[0][len(delimiter):]
+    else:
+        chunks = chunks[1:]
+    parts: list[bytes] = []
+    for chunk in chunks:
+        if chunk.startswith(b'--'):
+            break
+        # The rest of the boundary line
+        parts.append(chunk.partition(b'\n')[2])
+    return parts
+
+
+def _decode_part(headers: Message, body: bytes) -> str:
+    """The text of a part, by its transfer encoding and charset"""
+    encoding: str = str(headers.get('content-transfer-encoding', '')
+                        ).strip().lower()
+    if encoding == 'base64':
+        try:
+            body = binascii.a2b_base64(body)
+        except binascii.Error:
+            pass
+    elif encoding == 'quoted-printable':
+        body = quopri.decodestring(body)
+    return body.decode(headers.get_content_charset() or 'utf-8',
+                       errors='ignore')
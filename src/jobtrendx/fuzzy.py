@@ -0,0 +1,161 @@
+"""
+Fuzzy unification of the terms which are not in the lexicon.
+The lexicon maps only the exact variants, "Datenwissenschaftlerin",
+"data scientist" or a typo as "Data Scinetist" stay as they are
+and are counted as other titles. FuzzyIndex finds the closest
+variant of such a term:
+  - the terms and the variants are compared normalized: lower
+    case, and every run of punctuation or spaces is one space,
+  - the variants are indexed by their character trigrams; the
+    candidates of a term are the variants sharing enough of its
+    trigrams, an edit changes at most 3 of them,
+  - the candidates are scored with the edit distance, bounded by
+    `max_distance` and by `max_ratio` of the length of the term,
+    the term takes the key of the closest variant, and of none
+    if the closest variants are of different keys.
+Every distinct term is resolved once, the results are memoized.
+
+16 Oct. 2026
+S. Amiri
+"""
+
+import re
+import typing
+import collections
+
+
+__all__ = [
+    'FuzzyIndex',
+    'edit_distance',
+    'normalize',
+]
+
+NGRAM: int = 3
+SEPARATORS: re.Pattern[str] = re.compile(r'[\W_]+')
+
+
+class FuzzyIndex:
+    """Trigram index over the variants of the lexicon"""
+
+    __slots__: list[str] = [
+        'max_distance', 'max_ratio', 'variants', 'keys', '_exact',
+        '_postings', '_memo']
+
+    max_distance: int
+    max_ratio: float
+    variants: list[str]
+    keys: list[str | None]
+    _exact: dict[str, int]
+    _postings: dict[str, list[int]]
+    _memo: dict[str, str | None]
+
+    def __init__(self,
+                 value_to_key: dict[str, str],
+                 max_distance: int = 2,
+                 max_ratio: float = 0.15
+                 ) -> None:
+        self.max_distance = max_distance
+        self.max_ratio = max_ratio
+        # The keys are variants of themselves; a normalized variant
+        # of two keys is ambiguous and resolves to none
+        targets: dict[str, set[str]] = {}
+        for value, key in [*value_to_key.items(),
+                           *((key, key) for key in value_to_key.values())]:
+            targets.setdefault(normalize(str(value)), set()).add(key)
+        targets.pop('', None)
+        self.variants = list(targets)
+        self.keys = [next(iter(keys)) if len(keys) == 1 else None
+                     for keys in targets.values()]
+        self._exact = {variant: idx for idx, variant in
+                       enumerate(self.variants)}
+        self._postings = collections.defaultdict(list)
+        for idx, variant in enumerate(self.variants):
+            for gram in set(trigrams(variant)):
+                self._postings[gram].append(idx)
+        self._memo = {}
+
+    def resolve(self, term: str) -> str | None:
+        """The key of the closest variant of the term, or None"""
+        try:
+            return self._memo[term]
+        except KeyError:
+            key: str | None = self._search(normalize(term))
+            self._memo[term] = key
+            return key
+
+    def resolve_all(self, terms: typing.Iterable[str]) -> dict[str, str]:
+        """The keys of the terms which are resolved"""
+        found: dict[str, str] = {}
+        for term in terms:
+            if not isinstance(term, str):
+                continue
+            key: str | None = self.resolve(term)
+            if key is not None:
+                found[term] = key
+        return found
+
+    def _search(self, text: str) -> str | None:
+        """The key of the closest variant of a normalized term"""
+        idx: int | None = self._exact.get(text)
+        if idx is not None:
+            return self.keys[idx]
+        bound: int = min(self.max_distance,
+                         int(len(text) * self.max_ratio))
+        if bound == 0:
+            return None
+        # A variant within `bound` edits keeps all but NGRAM * bound
+        # of the distinct trigrams of the term
+        grams: set[str] = set(trigrams(text))
+        shared: collections.Counter = collections.Counter(
+            idx for gram in grams for idx in self._postings.get(gram, ()))
+        needed: int = max(1, len(grams) - NGRAM * bound)
+        best: int = bound + 1
+        found: set[str | None] = set()
+        for idx, count in shared.items():
+            if count < needed:
+                continue
+            distance: int = edit_distance(text, self.variants[idx], bound)
+            if distance < best:
+                best = distance
+                found = {self.keys[idx]}
+            elif distance == best:
+                found.add(self.keys[idx])
+        if best > bound or len(found) != 1:
+            return None
+        return found.pop()
+
+    def __len__(self) -> int:
+        return len(self.variants)
+
+
+def normalize(term: str) -> str:
+    """Lower case, with the punctuation and spaces as one space"""
+    return SEPARATORS.sub(' ', term.casefold()).strip()
+
+
+def trigrams(text: str) -> list[str]:
+    """The character trigrams of the text, padded at both ends"""
+    padded: str = f'  {text}  '
+    return [padded[i:i + NGRAM] for i in range(len(padded) - NGRAM + 1)]
+
+
+def edit_distance(first: str, second: str, bound: int) -> int:
+    """
+    The Levenshtein distance of the two strings, or bound + 1 as
+    soon as it is known to be more than bound
+    """
+    if abs(len(first) - len(second)) > bound:
+        return bound + 1
+    if len(first) > len(second):
+        first, second = second, first
+    previous: list[int] = list(range(len(first) + 1))
+    for row, char in enumerate(second, start=1):
+        current: list[int] = [row]
+        for col, other in enumerate(first, start=1):
+            current.append(min(previous[col] + 1,
+                               current[col - 1] + 1,
+                               previous[col - 1] + (char != other)))
+        if min(current) > bound:
+            return bound + 1
+        previous = current
+    return min(previous[-1], bound + 1)
@@ -0,0 +1,179 @@
+"""
+Detect the language of the email payloads, English or German.
+Calling langdetect for every email is slow, random without a
+seed, and the same alert bodies come again and again. So the
+detection is done in three steps:
+  - only a prefix of `prefix_chars` characters of each body is
+    used, and it is hashed; a memo of hash -> language, kept
+    on the disk between the runs, answers the known bodies and
+    the repeated bodies of a batch are detected once,
+  - a cheap detector counts the English and German stopwords
+    of the prefix and decides if one of them clearly wins,
+  - only the ambiguous prefixes go to langdetect, with a fixed
+    seed so the result is the same in every run.
+
+16 Oct. 2026
+S. Amiri
+"""
+
+import os
+import re
+import json
+import hashlib
+from pathlib import Path
+
+import pandas as pd
+from langdetect import DetectorFactory, detect
+from langdetect.lang_detect_exception import LangDetectException
+
+
+__all__ = [
+    'LanguageDetector',
+    'stopword_language',
+]
+
+# Make langdetect deterministic
+DetectorFactory.seed = 0
+
+# Frequent function words which are not words in the other language
+STOPWORDS: dict[str, frozenset[str]] = {
+    'en': frozenset({
+        'the', 'and', 'of', 'to', 'is', 'you', 'we', 'our', 'for',
+        'with', 'are', 'will', 'be', 'on', 'as', 'your', 'this', 'that',
+        'have', 'at', 'or', 'from', 'by', 'it', 'can', 'us', 'who',
+        'what', 'about', 'all', 'more', 'their', 'they', 'has', 'new',
+    }),
+    'de': frozenset({
+        'der', 'die', 'das', 'und', 'ist', 'du', 'wir', 'sie', 'mit',
+        'für', 'von', 'zu', 'den', 'dem', 'ein', 'eine', 'einen', 'auf',
+        'im', 'nicht', 'auch', 'als', 'bei', 'oder', 'sich', 'werden',
+        'wird', 'dein', 'deine', 'dich', 'dir', 'unser', 'unsere', 'uns',
+        'bist', 'hast', 'sind', 'haben', 'es', 'zum', 'zur', 'über',
+        'nach', 'aus', 'wie', 'neue',
+    }),
+}
+
+WORD_PATTERN: re.Pattern[str] = re.compile(r'[a-zäöüß]+')
+
+ALLOWED_LANGUAGES: frozenset[str] = frozenset({'en', 'de'})
+
+
+class LanguageDetector:
+    """Memoized language detection of the email bodies"""
+
+    __slots__: list[str] = [
+        'cache_file',
+        'prefix_chars',
+        'min_hits',
+        'min_share',
+        'memo',
+        'stats',
+    ]
+
+    cache_file: Path | None
+    prefix_chars: int
+    min_hits: int
+    min_share: float
+    memo: dict[str, str]
+    stats: dict[str, int]
+
+    def __init__(self,
+                 cache_file: str | Path | None = None,
+                 prefix_chars: int = 1000,
+                 min_hits: int = 4,
+                 min_share: float = 0.75
+                 ) -> None:
+        # pylint: disable=too-many-arguments
+        # pylint: disable=too-many-positional-arguments
+        self.cache_file = Path(cache_file) if cache_file else None
+        self.prefix_chars = prefix_chars
+        self.min_hits = min_hits
+        self.min_share = min_share
+        self.memo = {}
+        self.stats = {'bodies': 0, 'cached': 0, 'stopwords': 0, 'full': 0}
+        self._load()
+
+    def detect(self, bodies: pd.Series) -> pd.Series:
+        """Return the language, "en", "de" or "unknown", of each body"""
+        prefixes: pd.Series = bodies.fillna('').astype(str).str.slice(
+            0, self.prefix_chars)
+        keys: pd.Series = prefixes.map(_prefix_hash)
+        self.stats['bodies'] += len(keys)
+
+        new_keys: pd.Series = keys[~keys.map(self.memo.__contains__)]
+        unique_new: pd.Series = new_keys.drop_duplicates()
+        self.stats['cached'] += len(keys) - len(unique_new)
+        for idx, key in unique_new.items():
+            self.memo[key] = self._detect_prefix(prefixes[idx])
+
+        return keys.map(self.memo).astype(object).rename(bodies.name)
+
+    def save(self) -> None:
+        """Write the memo to the disk"""
+        if self.cache_file is None:
+            return
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file: Path = self.cache_file.with_suffix('.tmp')
+        with tmp_file.open('w', encoding='utf-8') as f_w:
+            json.dump(self.memo, f_w)
+        os.replace(tmp_file, self.cache_file)
+
+    def report(self) -> str:
+        """Summary of how the languages were found"""
+        return (f'Language detection: {self.stats["bodies"]} bodies, '
+                f'{self.stats["cached"]} from the memo or repeated, '
+                f'{self.stats["stopwords"]} by the stopwords, '
+                f'{self.stats["full"]} by langdetect.')
+
+    def _detect_prefix(self, prefix: str) -> str:
+        """The stopword detector, or langdetect if it is ambiguous"""
+        lang: str | None = stopword_language(
+            prefix, self.min_hits, self.min_share)
+        if lang is not None:
+            self.stats['stopwords'] += 1
+            return lang
+        self.stats['full'] += 1
+        return _full_language(prefix)
+
+    def _load(self) -> None:
+        """Read the memo from the disk"""
+        if self.cache_file is None or not self.cache_file.exists():
+            return
+        with self.cache_file.open('r', encoding='utf-8') as f_r:
+            self.memo = json.load(f_r)
+
+
+def stopword_language(text: str,
+                      min_hits: int = 4,
+                      min_share: float = 0.75
+                      ) -> str | None:
+    """
+    Return "en" or "de" if the stopwords of one of them are at
+    least `min_hits` and `min_share` of all the stopwords in the
+    text, otherwise None
+    """
+    hits: dict[str, int] = {lang: 0 for lang in STOPWORDS}
+    for word in WORD_PATTERN.findall(text.lower()):
+        for lang, words in STOPWORDS.items():
+            if word in words:
+                hits[lang] += 1
+    total: int = sum(hits.values())
+    if total < min_hits:
+        return None
+    lang, count = max(hits.items(), key=lambda item: item[1])
+    return lang if count / total >= min_share else None
+
+
+def _full_language(text: str) -> str:
+    """langdetect, "unknown" if it fails or is not English or German"""
+    try:
+        lang: str = detect(text)
+    except LangDetectException:
+        return 'unknown'
+    return lang if lang in ALLOWED_LANGUAGES else 'unknown'
+
+
+def _prefix_hash(prefix: str) -> str:
+    """A short hash of the prefix for the memo"""
+    return hashlib.blake2b(prefix.encode('utf-8'),
+                           digest_size=16).hexdigest()
@@ -4,24 +4,36 @@ To run:
 python -m jobtrendx.main
 or set a new dir containing emails:
 PYTHONPATH=src python -m jobtrendx.main defaults.paths.emails="<NEW_DIR>"
+or redo the statistics and plots from the saved table of the emails
+(read by StatisticsManager.from_file):
+PYTHONPATH=src python -m jobtrendx.main defaults.storage.from_table=true
+
+The chain of stages is run by pipeline.Pipeline; the result of
+each stage is cached, and a stage runs again only if its inputs
+(the emails, the config, the taxonomy or lexicon files, or the
+result of the stage before it) changed.
 """
 # pylint: disable=no-value-for-parameter
 
 import typing
+from pathlib import Path
 
 import hydra
 import pandas as pd
-from omegaconf import DictConfig
+from omegaconf import DictConfig, OmegaConf
 
 from . import logger
 from . import email_processor
+from . import manifest
 from . import analysis
+from . import terms_unify
 from . import clean_dataframe
+from . import pipeline
 from . import statistics
+from . import storage
 from . import visualization
 
 if typing.TYPE_CHECKING:
-    from pathlib import Path
     import email
 
 
@@ -32,27 +44,176 @@ LOG: logger.logging.Logger = logger.setup_logger('jobtrendx.log')
 def main(cfg: DictConfig) -> None:
     # pylint: disable=missing-function-docstring
     # pylint: disable=unused-argument
+    store_cfg: DictConfig = cfg.defaults.storage
+    info_table: str = cfg.defaults.paths.info_table
+    # The emails new in the ingest manifest, if the analysis runs
+    ingest: dict[str, list[str]] = {}
+
+    if store_cfg.from_table:
+        stages: list[pipeline.Stage] = [
+            pipeline.Stage('statistics',
+                           lambda _: make_statistics(
+                               statistics.StatisticsManager.from_file(
+                                   info_table, log=LOG), cfg),
+                           key_parts=lambda: [
+                               pipeline.files_digest([info_table]),
+                               *_statistics_key(cfg)])]
+    else:
+        stages = [
+            pipeline.Stage('analysis',
+                           lambda _: analyze_emails(cfg, ingest),
+                           key_parts=lambda: _analysis_key(cfg)),
+            pipeline.Stage('terms_unify',
+                           lambda df: unify_terms(df, cfg),
+                           key_parts=lambda: [
+                               pipeline.files_digest(
+                                   _yaml_files(cfg, 'lexicon')),
+                               OmegaConf.to_yaml(
+                                   cfg.defaults.analysis.fuzzy_unification)]),
+            pipeline.Stage('clean',
+                           lambda df: clean(df, cfg),
+                           key_parts=lambda: [str(
+                               cfg.defaults.analysis.near_duplicates)]),
+            pipeline.Stage('statistics',
+                           lambda df: make_statistics(
+                               statistics.StatisticsManager(
+                                   df_info=df, log=LOG),
+                               cfg, ingest.get('new_files')),
+                           key_parts=lambda: _statistics_key(cfg)),
+        ]
+    stages += [
+        pipeline.Stage('visualization',
+                       lambda stats: make_plots(stats, cfg),
+                       cached=False),
+    ]
+    pipe = pipeline.Pipeline(
+        stages=stages,
+        log=LOG,
+        cache_dir=cfg.defaults.paths.pipeline_cache
+        if store_cfg.cache_stages else None)
+    if store_cfg.save_table and not Path(info_table).exists():
+        pipe.forget('clean')
+    pipe.run()
+
+
+def analyze_emails(cfg: DictConfig,
+                   ingest: dict[str, list[str]] | None = None
+                   ) -> pd.DataFrame:
+    """
+    Read and analyze the emails, return their table; with the
+    incremental ingest, the new emails are set in `ingest`
+    """
     src: str = cfg.defaults.paths.emails
+    eml_cfg: DictConfig = cfg.defaults.email_processing
+
+    ingest_mfst: manifest.IngestManifest | None = None
+    if eml_cfg.incremental:
+        ingest_mfst = manifest.IngestManifest(
+            manifest_file=cfg.defaults.paths.manifest,
+            store_file=cfg.defaults.paths.row_store,
+            key=manifest.analysis_key(cfg))
+
+    email_prc = email_processor.EmailProcessor(
+        eml_dir=src,
+        log=LOG,
+        n_workers=eml_cfg.n_workers,
+        chunk_size=eml_cfg.chunk_size,
+        manifest=ingest_mfst,
+        fast=eml_cfg.fast_ingest)
+
+    if eml_cfg.streaming:
+        anlaz = analysis.AnalysisEmails(eml_dict={}, cfg=cfg)
+        anlaz.analyzing_stream(
+            email_prc.iter_eml(stream_size=eml_cfg.stream_size), log=LOG)
+    else:
+        email_prc.execute()
+        eml_dict: dict[Path, "email.message.EmailMessage"] = \
+            email_prc.eml_dict
+        anlaz = analysis.AnalysisEmails(eml_dict=eml_dict, cfg=cfg)
+        anlaz.analyzing(log=LOG)
+    if ingest_mfst is not None:
+        anlaz.df_info = ingest_mfst.merge_rows(anlaz.df_info,
+                                               email_prc.eml_paths)
+        if ingest is not None:
+            ingest['new_files'] = ingest_mfst.added
+    return anlaz.df_info
+
+
+def unify_terms(df_info: pd.DataFrame, cfg: DictConfig) -> pd.DataFrame:
+    """Unify the terms of the titles, skills and languages"""
+    LOG.info('\nThe DataFrame columns terms are unified\n')
+    return terms_unify.term_unifier(df_info, cfg)
 
-    email_prc = email_processor.EmailProcessor(eml_dir=src, log=LOG)
-    email_prc.execute()
-    eml_dict: dict[Path, "email.message.EmailMessage"] = email_prc.eml_dict
 
-    anlaz = analysis.AnalysisEmails(eml_dict=eml_dict, cfg=cfg)
-    anlaz.analyzing(log=LOG)
-    anlaz.unify_terms(log=LOG)
-    df_i: pd.DataFrame = anlaz.df_info
+def clean(df_info: pd.DataFrame, cfg: DictConfig) -> pd.DataFrame:
+    """Drop the duplicates, set the languages and save the table"""
+    df_i: pd.DataFrame = clean_dataframe.remove_near_duplicate(
+        df_info=df_info,
+        threshold=cfg.defaults.analysis.near_duplicates.threshold)
 
     df_cleaned: pd.DataFrame = clean_dataframe.remove_duplicate(df_info=df_i)
     df_cleaned: pd.DataFrame = clean_dataframe.set_languages(df=df_cleaned)
 
-    stats = statistics.StatisticsManager(df_info=df_cleaned, log=LOG)
-    stats.statistics()
+    if cfg.defaults.storage.save_table:
+        info_table: str = cfg.defaults.paths.info_table
+        storage.write_info(df_cleaned, info_table)
+        LOG.info(f'\nThe table of the emails is saved in `{info_table}`\n')
+    return df_cleaned
+
+
+def make_statistics(stats: statistics.StatisticsManager,
+                    cfg: DictConfig,
+                    new_files: list[str] | None = None
+                    ) -> statistics.StatisticsManager:
+    """
+    Do the statistics of the table; only the rows of the
+    `new_files` are counted, if they are known
+    """
+    # The stored statistics are not valid if the terms change
+    key: str = pipeline.files_digest(
+        _yaml_files(cfg, 'taxonomy') + _yaml_files(cfg, 'lexicon'))
+    if cfg.defaults.statistics.accumulators.enabled:
+        stats.statistics_incremental(cfg=cfg, key=key, new_files=new_files)
+    else:
+        stats.statistics()
     stats.statistics_by_category(cfg=cfg)
+    stats.statistics_over_time(cfg=cfg, key=key)
+    return stats
+
 
-    visuales = visualization.Visualizer(stats=stats)
+def make_plots(stats: statistics.StatisticsManager,
+               cfg: DictConfig
+               ) -> None:
+    """Plot the statistics"""
+    visuales = visualization.Visualizer(
+        stats=stats,
+        heatmap_size=cfg.defaults.statistics.cooccurrence.heatmap_size,
+        trend_size=cfg.defaults.statistics.trends.plot_size)
     visuales.primary_plots(log=LOG)
 
 
+def _analysis_key(cfg: DictConfig) -> list[str]:
+    """The inputs of the analysis of the emails"""
+    eml_paths: list[Path] = email_processor.EmailProcessor(
+        eml_dir=cfg.defaults.paths.emails, log=LOG).get_eml_paths()
+    return [
+        pipeline.files_digest(eml_paths, content=False),
+        manifest.analysis_key(cfg),
+    ]
+
+
+def _statistics_key(cfg: DictConfig) -> list[str]:
+    """The inputs of the statistics, besides the table"""
+    return [pipeline.files_digest(_yaml_files(cfg, 'taxonomy')),
+            OmegaConf.to_yaml(cfg.defaults.statistics)]
+
+
+def _yaml_files(cfg: DictConfig, kind: str) -> list[Path]:
+    """The taxonomy or lexicon files of the cfg"""
+    path: str = cfg[f'{kind}_path']
+    return [Path(path) / file_name
+            for file_name in cfg[f'{kind}_files'].values()]
+
+
 if __name__ == "__main__":
     main()
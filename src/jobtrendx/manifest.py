@@ -0,0 +1,199 @@
+"""
+Incremental ingest of the emails.
+The manifest keeps a record of every .eml file which is already
+analyzed, keyed by its path, size, mtime and content hash, and
+the rows extracted from these files are kept in a local store.
+On the next run only the new or changed files are parsed and
+analyzed, and the rows of the other files are merged back from
+the store:
+
+manifest.json:
+  analysis_key: <hash of the taxonomy files and the analysis cfg>
+  files:
+    emails/a.eml: {size: 1024, mtime_ns: 17..., sha256: 3f...}
+
+If the taxonomy, the columns or a setting of the analysis which
+changes the rows (e.g., the language detection or the fast reading
+of the emails) change, the stored rows are not valid anymore and
+everything is analyzed again.
+
+16 Oct. 2026
+S. Amiri
+"""
+
+import os
+import json
+import typing
+import hashlib
+from pathlib import Path
+
+import pandas as pd
+
+from omegaconf import DictConfig, OmegaConf
+
+
+__all__ = [
+    'IngestManifest',
+    'analysis_key',
+]
+
+
+class IngestManifest:
+    """Keep track of the analyzed emails and their rows"""
+
+    __slots__: list[str] = [
+        'manifest_file', 'store_file', 'key', 'files', 'known', 'pending',
+        'added', 'rehashed', 'removed'
+    ]
+
+    manifest_file: Path
+    store_file: Path
+    key: str
+    files: dict[str, dict[str, typing.Any]]
+    known: list[str]
+    pending: dict[str, dict[str, typing.Any]]
+    added: list[str]
+    rehashed: list[str]
+    removed: list[str]
+
+    def __init__(self,
+                 manifest_file: str | Path,
+                 store_file: str | Path,
+                 key: str = ''
+                 ) -> None:
+        self.manifest_file = Path(manifest_file)
+        self.store_file = Path(store_file)
+        self.key = key
+        self.files = {}
+        self.known = []
+        self.pending = {}
+        # The files whose rows are merged by the last merge_rows
+        self.added = []
+        # Of the last filter_new: the known files which were hashed
+        # again (their size or mtime changed), and the ones removed
+        self.rehashed = []
+        self.removed = []
+        self.load()
+
+    def load(self) -> None:
+        """Read the manifest, an unknown analysis key resets it"""
+        if not (self.manifest_file.exists() and self.store_file.exists()):
+            return
+        with self.manifest_file.open('r', encoding='utf-8') as f_r:
+            data: dict[str, typing.Any] = json.load(f_r)
+        if data.get('analysis_key') == self.key:
+            self.files = data.get('files', {})
+
+    def filter_new(self, eml_paths: list[Path]) -> list[Path]:
+        """
+        Return the paths which are not analyzed yet.
+        A file is known if its size and mtime are unchanged, or,
+        if they changed, its content hash is unchanged. Only the
+        changed files are hashed.
+        """
+        self.known = []
+        self.pending = {}
+        self.rehashed = []
+        new_paths: list[Path] = []
+        for path in eml_paths:
+            name: str = str(path)
+            stat = path.stat()
+            record: dict[str, typing.Any] = {
+                'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+            entry = self.files.get(name)
+            if entry is not None and entry['size'] == record['size'] and \
+               entry['mtime_ns'] == record['mtime_ns']:
+                self.known.append(name)
+                continue
+            record['sha256'] = _file_hash(path)
+            if entry is not None and entry['sha256'] == record['sha256']:
+                self.files[name] = record
+                self.known.append(name)
+                self.rehashed.append(name)
+                continue
+            self.pending[name] = record
+            new_paths.append(path)
+        names: set[str] = {str(path) for path in eml_paths}
+        self.removed = [name for name in self.files if name not in names]
+        return new_paths
+
+    def merge_rows(self,
+                   df_new: pd.DataFrame,
+                   eml_paths: list[Path] | None = None
+                   ) -> pd.DataFrame:
+        """
+        Merge the rows of the new files with the stored rows of
+        the known files, save them and the manifest.
+        The rows of the files which are removed from the
+        directory are dropped. If `eml_paths` is given, the rows
+        are in the same order as the paths, like a full run.
+        """
+        df_stored: pd.DataFrame = self._read_store()
+        if not df_stored.empty:
+            df_stored = df_stored[df_stored['file_path'].isin(self.known)]
+        frames = [df for df in (df_stored, df_new) if not df.empty]
+        df_info: pd.DataFrame = pd.concat(frames, ignore_index=True) \
+            if frames else df_new
+        if eml_paths is not None and not df_info.empty:
+            order = {str(path): i for i, path in enumerate(eml_paths)}
+            df_info = df_info.iloc[
+                df_info['file_path'].map(order).argsort(kind='stable')
+            ].reset_index(drop=True)
+
+        self.files = {name: self.files[name] for name in self.known}
+        self.files.update(self.pending)
+        self.added = list(self.pending)
+        self.pending = {}
+        self._write_store(df_info)
+        self.save()
+        return df_info
+
+    def save(self) -> None:
+        """Write the manifest"""
+        data: dict[str, typing.Any] = {
+            'analysis_key': self.key, 'files': self.files}
+        self.manifest_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file: Path = self.manifest_file.with_suffix('.tmp')
+        with tmp_file.open('w', encoding='utf-8') as f_w:
+            json.dump(data, f_w)
+        os.replace(tmp_file, self.manifest_file)
+
+    def _read_store(self) -> pd.DataFrame:
+        """Read the rows of the known files"""
+        if not self.files or not self.store_file.exists():
+            return pd.DataFrame()
+        return pd.read_pickle(self.store_file)
+
+    def _write_store(self, df_info: pd.DataFrame) -> None:
+        """Write the rows of all the files"""
+        self.store_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file: Path = self.store_file.with_suffix('.tmp')
+        df_info.to_pickle(tmp_file)
+        os.replace(tmp_file, self.store_file)
+
+
+def analysis_key(cfg: DictConfig) -> str:
+    """
+    Hash of everything which changes the extracted rows: the
+    taxonomy files, the columns of the DataFrame, the sections of
+    the payloads, the MinHash signatures of the near duplicates,
+    the language detection and the reading of the emails.
+    """
+    digest = hashlib.sha256()
+    for name in sorted(cfg.taxonomy_files):
+        digest.update(name.encode())
+        digest.update(
+            (Path(cfg.taxonomy_path) / cfg.taxonomy_files[name]).read_bytes())
+    digest.update(str(list(cfg.defaults.analysis.df_columns)).encode())
+    for name in ('analysis.sections', 'analysis.skill_sections',
+                 'analysis.near_duplicates', 'analysis.lang_detection',
+                 'email_processing.fast_ingest'):
+        digest.update(str(OmegaConf.select(
+            cfg, f'defaults.{name}')).encode())
+    return digest.hexdigest()
+
+
+def _file_hash(path: Path) -> str:
+    """Return the sha256 of the content of a file"""
+    with path.open('rb') as f_r:
+        return hashlib.file_digest(f_r, 'sha256').hexdigest()
@@ -0,0 +1,154 @@
+"""
+Multi-pattern keyword matching for the taxonomy terms.
+Searching every term of a taxonomy with its own regex,
+rf"\\b{re.escape(term)}\\b" with re.IGNORECASE, costs one scan
+of the text per term. KeywordMatcher builds an Aho-Corasick
+automaton of all the terms once, and finds every occurrence of
+every term in a single pass over the text.
+The matches are the same as the regex ones:
+  - case-insensitive: the terms and the text are lower-cased
+    character by character,
+  - whole words: a match only counts if there is a word
+    boundary (`\\b`) before and after it, checked on the
+    original text.
+
+16 Oct. 2026
+S. Amiri
+"""
+
+import re
+import typing
+
+
+__all__ = [
+    'KeywordMatcher',
+    'compile_tags',
+]
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over a list of terms"""
+
+    __slots__: list[str] = ['terms', 'lengths', '_goto', '_fail', '_out']
+
+    terms: list[str]
+    lengths: list[int]
+    _goto: list[dict[str, int]]
+    _fail: list[int]
+    _out: list[tuple[int, ...]]
+
+    def __init__(self, terms: typing.Iterable[str]) -> None:
+        # Keep the first of the repeated terms, in the given order
+        self.terms = [term for term in dict.fromkeys(terms) if term]
+        folded: list[str] = [_fold(term) for term in self.terms]
+        self.lengths = [len(term) for term in folded]
+        self._build(folded)
+
+    def find_all(self, lines: typing.Iterable[str]) -> list[str]:
+        """
+        Return the terms which are found as whole words in any
+        of the lines, in the order of the terms.
+        """
+        found: set[int] = set()
+        for line in lines:
+            found.update(self._search(line))
+        return [self.terms[idx] for idx in sorted(found)]
+
+    def first_match(self, text: str) -> str | None:
+        """
+        Return the first term, in the order of the terms, which
+        is found in the text as a whole word, or None
+        """
+        found: set[int] = set(self._search(text))
+        return self.terms[min(found)] if found else None
+
+    def _search(self, text: str) -> typing.Iterator[int]:
+        """Yield the index of the term for every match in the text"""
+        goto: list[dict[str, int]] = self._goto
+        fail: list[int] = self._fail
+        out: list[tuple[int, ...]] = self._out
+        lengths: list[int] = self.lengths
+        size: int = len(text)
+        state: int = 0
+        for end, char in enumerate(_fold(text), start=1):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if not out[state]:
+                continue
+            for idx in out[state]:
+                start: int = end - lengths[idx]
+                if _is_boundary(text, start, size) and \
+                   _is_boundary(text, end, size):
+                    yield idx
+
+    def _build(self, folded: list[str]) -> None:
+        """Build the trie, the failure links and the outputs"""
+        goto: list[dict[str, int]] = [{}]
+        outputs: list[list[int]] = [[]]
+        for idx, term in enumerate(folded):
+            state: int = 0
+            for char in term:
+                if char not in goto[state]:
+                    goto.append({})
+                    outputs.append([])
+                    goto[state][char] = len(goto) - 1
+                state = goto[state][char]
+            outputs[state].append(idx)
+
+        # Breadth-first over the trie to set the failure links
+        fail: list[int] = [0] * len(goto)
+        queue: list[int] = list(goto[0].values())
+        for state in queue:
+            for char, child in goto[state].items():
+                queue.append(child)
+                link: int = fail[state]
+                while link and char not in goto[link]:
+                    link = fail[link]
+                fail[child] = goto[link].get(char, 0)
+                outputs[child].extend(outputs[fail[child]])
+
+        self._goto = goto
+        self._fail = fail
+        self._out = [tuple(out) for out in outputs]
+
+
+def compile_tags(tags: typing.Iterable[str]) -> re.Pattern:
+    """
+    One case-insensitive regex of all the tags (e.g., "m/w/d" or
+    "(all genders)"), the longest first. A tag is not a part of a
+    word: it is not next to a word character, which, unlike `\\b`,
+    also works for the tags which start or end with "(" or ".".
+    """
+    ordered: list[str] = sorted(
+        dict.fromkeys(str(tag) for tag in tags if tag), key=len, reverse=True)
+    if not ordered:
+        # Never matches
+        return re.compile(r'(?!)')
+    return re.compile(
+        r'(?<!\w)(?:' + '|'.join(map(re.escape, ordered)) + r')(?!\w)',
+        re.IGNORECASE)
+
+
+def _fold(text: str) -> str:
+    """
+    Lower-case the text, keeping its length so the positions
+    of the matches are the positions in the original text
+    """
+    folded: str = text.lower()
+    if len(folded) == len(text):
+        return folded
+    return ''.join(
+        low if len(low := char.lower()) == 1 else char for char in text)
+
+
+def _is_word(char: str) -> bool:
+    """Same as the `\\w` of the re module"""
+    return char.isalnum() or char == '_'
+
+
+def _is_boundary(text: str, pos: int, size: int) -> bool:
+    """Same as the `\\b` of the re module at the position"""
+    before: bool = pos > 0 and _is_word(text[pos - 1])
+    after: bool = pos < size and _is_word(text[pos])
+    return before != after
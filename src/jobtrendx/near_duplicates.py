@@ -0,0 +1,192 @@
+"""
+Near-duplicate job ads.
+The same posting is sent several times with small changes:
+other tracking URLs, reordered sections, an extra "Top Treffer"
+block... The exact deduplication misses them, so they are found
+by the similarity of their texts:
+  - every paragraph of the clean payload is cut into shingles
+    of `shingle_size` words, and the Jaccard similarity of two
+    ads is the share of the shingles they have in common,
+  - each ad gets a MinHash signature of `num_perm` values; the
+    share of equal values of two signatures estimates their
+    Jaccard similarity,
+  - the signatures are split into bands which are hashed into
+    buckets (LSH); only the ads sharing a bucket are compared,
+    so the cost grows about linearly with the number of ads
+    instead of comparing all the pairs.
+The ads above the threshold are grouped, and only the first ad
+of each group is kept.
+
+16 Oct. 2026
+S. Amiri
+"""
+
+import re
+import typing
+import functools
+
+import numpy as np
+import pandas as pd
+
+
+__all__ = [
+    'MinHasher',
+    'first_of_groups',
+    'lsh_params',
+]
+
+WORD_PATTERN: re.Pattern[str] = re.compile(r'\w+')
+
+
+class MinHasher:
+    """MinHash signatures of the clean payloads"""
+
+    __slots__: list[str] = ['num_perm', 'shingle_size', '_mul', '_add']
+
+    num_perm: int
+    shingle_size: int
+    _mul: np.ndarray
+    _add: np.ndarray
+
+    def __init__(self,
+                 num_perm: int = 128,
+                 shingle_size: int = 5,
+                 seed: int = 1
+                 ) -> None:
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        # Multiply-shift hash functions, a fixed seed keeps the
+        # signatures comparable between the runs
+        rng = np.random.default_rng(seed)
+        self._mul = rng.integers(
+            0, 2**64, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._add = rng.integers(0, 2**64, size=num_perm, dtype=np.uint64)
+
+    def signatures(self,
+                   clean_payloads: typing.Iterable[list[str]]
+                   ) -> list[bytes]:
+        """
+        Return the signature of each payload, as the bytes of
+        `num_perm` uint32 values, or b'' if it has no words
+        """
+        return [self.signature(lines) for lines in clean_payloads]
+
+    def signature(self, paragraphs: list[str]) -> bytes:
+        """The signature of the paragraphs of one payload"""
+        shingles: set[str] = shingle(paragraphs, self.shingle_size)
+        if not shingles:
+            return b''
+        hashes: np.ndarray = pd.util.hash_array(
+            np.array(list(shingles), dtype=object))
+        values: np.ndarray = \
+            np.multiply.outer(self._mul, hashes) + self._add[:, None]
+        values >>= np.uint64(32)
+        return values.min(axis=1).astype(np.uint32).tobytes()
+
+
+def shingle(paragraphs: list[str], size: int) -> set[str]:
+    """
+    The set of the shingles of `size` words of each paragraph,
+    so moving a whole section does not change it. The URLs are
+    left out and a paragraph shorter than `size` is one shingle.
+    """
+    shingles: set[str] = set()
+    for paragraph in paragraphs:
+        words: list[str] = WORD_PATTERN.findall(
+            paragraph.replace('[URL]', ' ').lower())
+        if len(words) <= size:
+            if words:
+                shingles.add(' '.join(words))
+            continue
+        shingles.update(' '.join(words[i:i + size])
+                        for i in range(len(words) - size + 1))
+    return shingles
+
+
+@functools.lru_cache(maxsize=None)
+def lsh_params(threshold: float, num_perm: int) -> tuple[int, int]:
+    """
+    Return the number of bands and of rows in a band which give
+    the least false positives and false negatives around the
+    threshold. Two signatures share a bucket with the chance
+    1 - (1 - s**rows)**bands for a similarity s.
+    """
+    grid: np.ndarray = np.linspace(0.0, 1.0, 201)
+    below: np.ndarray = grid <= threshold
+    best: tuple[int, int] = (1, num_perm)
+    best_error: float = np.inf
+    for bands in range(1, num_perm + 1):
+        for rows in range(1, num_perm // bands + 1):
+            chance: np.ndarray = 1.0 - (1.0 - grid**rows)**bands
+            error: float = float(
+                chance[below].sum() + (1.0 - chance[~below]).sum())
+            if error < best_error:
+                best, best_error = (bands, rows), error
+    return best
+
+
+def first_of_groups(signatures: typing.Sequence[bytes],
+                    threshold: float = 0.8
+                    ) -> np.ndarray:
+    """
+    Group the ads whose estimated Jaccard similarity is at
+    least the threshold.
+
+    Args:
+        signatures (Sequence[bytes]): The MinHash signature of each
+        ad, the ads without one are never grouped.
+        threshold (float): The least similarity of the duplicates.
+
+    Returns:
+        np.ndarray: True for the first ad of each group, and for
+        the ads without a near duplicate.
+    """
+    sizes: list[int] = [len(sig) for sig in signatures if sig]
+    keep: np.ndarray = np.ones(len(signatures), dtype=bool)
+    if len(sizes) < 2:
+        return keep
+    num_perm: int = max(set(sizes), key=sizes.count) // 4
+    positions: list[int] = [
+        idx for idx, sig in enumerate(signatures)
+        if sig and len(sig) == num_perm * 4]
+    matrix: np.ndarray = np.vstack([
+        np.frombuffer(signatures[idx], dtype=np.uint32)
+        for idx in positions])
+
+    parent: list[int] = list(range(len(positions)))
+    bands, rows = lsh_params(threshold, num_perm)
+    checked: set[tuple[int, int]] = set()
+    for band in range(bands):
+        block: np.ndarray = np.ascontiguousarray(
+            matrix[:, band * rows:(band + 1) * rows])
+        buckets: dict[bytes, list[int]] = {}
+        for doc, key in enumerate(map(bytes, block)):
+            members: list[int] = buckets.setdefault(key, [])
+            for other in members:
+                if (other, doc) in checked:
+                    continue
+                checked.add((other, doc))
+                if (matrix[other] == matrix[doc]).mean() >= threshold:
+                    _union(parent, other, doc)
+                    break
+            members.append(doc)
+
+    for doc, idx in enumerate(positions):
+        keep[idx] = _find(parent, doc) == doc
+    return keep
+
+
+def _find(parent: list[int], doc: int) -> int:
+    """The first ad of the group of the doc"""
+    while parent[doc] != doc:
+        parent[doc] = parent[parent[doc]]
+        doc = parent[doc]
+    return doc
+
+
+def _union(parent: list[int], first: int, second: int) -> None:
+    """Merge the groups of both ads, the first ad stays the root"""
+    root_a: int = _find(parent, first)
+    root_b: int = _find(parent, second)
+    if root_a != root_b:
+        parent[max(root_a, root_b)] = min(root_a, root_b)
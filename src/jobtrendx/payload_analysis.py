@@ -21,47 +21,174 @@ Samiri
 
 import re
 import typing
+import functools
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
 
-from omegaconf import DictConfig
+from omegaconf import DictConfig, OmegaConf
 
 from . import sub_tools as sub
+from .matcher import KeywordMatcher, compile_tags
+from . import taxonomy_cache as taxo
+from .near_duplicates import MinHasher
+from .sections import SectionSegmenter, PayloadSections, span_columns
+from .title_resolver import TitleResolver
 
 __all__ = [
     'split_payload',
 ]
 
 
+# The compiled taxonomy, the MinHasher and the section segmenter
+# of a worker process, sent once at its start, and if the worker
+# matches the titles
+_WORKER_TAXONOMY: taxo.CompiledTaxonomy | None = None
+_WORKER_HASHER: MinHasher | None = None
+_WORKER_SEGMENTER: SectionSegmenter | None = None
+_WORKER_MATCH_TITLES: bool = True
+
+# An amount: with thousand separators (66.000 or 66,000) and
+# maybe cents, or plain digits with maybe a decimal part
+_AMOUNT: str = r"\d{1,3}(?:[.,]\d{3})+(?:[.,]\d{1,2})?(?!\d)" \
+    r"|\d+(?:[.,]\d{1,2})?(?!\d)"
+_CURRENCY: str = r"(?-i:€|EUR\b|Euro\b|euro\b)"
+# A text without one of them has no salary
+_CURRENCY_HINT: str = "€|EUR|Euro|euro"
+# A salary: an amount or a range, each with an optional "k", the
+# currency before or after them (after both amounts of a range as
+# in "50.000 € - 60.000 €"), and an optional period
+SALARY_PATTERN: re.Pattern = re.compile(
+    rf"(?P<pre>{_CURRENCY})?\s*"
+    rf"(?P<low>{_AMOUNT})\s*(?P<low_k>k\b)?"
+    rf"(?:(?:\s*{_CURRENCY})?\s*(?:-|–|—|bis\b|to\b)\s*{_CURRENCY}?\s*"
+    rf"(?P<high>{_AMOUNT})\s*(?P<high_k>k\b)?)?"
+    rf"\s*(?(pre){_CURRENCY}?|{_CURRENCY})"
+    r"(?:\s*(?:brutto|netto|gross)\b)?"
+    r"(?:\s*(?:/|pro\b|per\b|je\b|im\b|a\b)?\s*"
+    r"(?P<period>jahr|jährlich|year|yearly|annual|annually|p\.\s?a"
+    r"|monat|monatlich|month|monthly|stunde|std|hour|hourly|hr|h)\b\.?)?",
+    re.IGNORECASE)
+# The salaries are per year, the hourly rates of a full-time job
+HOURS_PER_YEAR: int = 40 * 52
+# A smaller yearly amount is a benefit ("300 € Zuschuss"), not a
+# salary; the next line with a salary is taken
+MIN_YEARLY_SALARY: float = 5000.0
+# The factor of a period, by its first three letters
+PERIOD_FACTORS: dict[str, int] = {
+    **dict.fromkeys(['jah', 'jäh', 'yea', 'ann', 'p.a', 'p. '], 1),
+    **dict.fromkeys(['mon'], 12),
+    **dict.fromkeys(['stu', 'std', 'hou', 'hr', 'h'], HOURS_PER_YEAR),
+}
+
+
 def split_payload(payloads: pd.DataFrame,
-                  cfg: DictConfig
+                  cfg: DictConfig,
+                  n_workers: int = 1,
+                  chunk_size: int = 500,
+                  hasher: MinHasher | None = None,
+                  resolver: TitleResolver | None = None
                   ) -> pd.DataFrame:
 
     """splitting the payload of the emails and extract the
-    data from it and return a pd DataFrame"""
+    data from it and return a pd DataFrame
+
+    With more than one worker, the payloads are split into
+    chunks of `chunk_size` rows which are cleaned and analyzed
+    in a pool of processes; the compiled taxonomy is sent to
+    each process once. The chunks are put back together in the
+    order of the payloads, so the result is the same as with a
+    single process.
+    With a `hasher`, the MinHash signature of each clean payload
+    is added in the 'minhash' column, for the near duplicates.
+    With a `resolver`, the job titles of the title lines are
+    found in this process through its memo, after the workers.
+    If the sections are set in the cfg, the skills and the
+    languages are searched in their sections only, and the span
+    of each section is added in the '<section>_span' columns.
+    """
 
-    skills: dict[str, list[str]] = sub.fetch_from_yaml(
-        cfg.taxonomy_path, cfg.taxonomy_files['skills'])
-    tags: dict[str, list[str]] = sub.fetch_from_yaml(
-        cfg.taxonomy_path, cfg.taxonomy_files['title_tags'])
-    salaries: dict[str, list[str]] = sub.fetch_from_yaml(
-        cfg.taxonomy_path, cfg.taxonomy_files['salaries'])
-    locations: dict[str, list[str]] = sub.fetch_from_yaml(
-        cfg.taxonomy_path, cfg.taxonomy_files['locations'])
-    languages: dict[str, list[str]] = sub.fetch_from_yaml(
-        cfg.taxonomy_path, cfg.taxonomy_files['languages'])
-    job_titles: dict[str, list[str]] = sub.fetch_from_yaml(
-        cfg.taxonomy_path, cfg.taxonomy_files['job_titles'])
-
-    payloads_uplift = _payload_clean_up(payloads)
-    data_set: dict[str, typing.Any] = _get_info(payloads_uplift,
-                                                locations,
-                                                job_titles,
-                                                tags,
-                                                skills,
-                                                languages,
-                                                salaries,
-                                                )
+    compiled: taxo.CompiledTaxonomy = taxo.load_compiled(cfg)
+    segmenter: SectionSegmenter | None = _make_segmenter(cfg)
+    n_workers = sub.resolve_workers(n_workers)
+    chunk_size = max(1, chunk_size)
+    match_titles: bool = resolver is None
+
+    if n_workers == 1 or len(payloads) <= chunk_size:
+        df_info: pd.DataFrame = _split_chunk(
+            payloads, compiled, hasher, match_titles, segmenter)
+    else:
+        chunks: list[pd.DataFrame] = [
+            payloads.iloc[start:start + chunk_size]
+            for start in range(0, len(payloads), chunk_size)
+        ]
+        with ProcessPoolExecutor(
+                max_workers=n_workers,
+                initializer=_init_worker,
+                initargs=(compiled, hasher, match_titles,
+                          segmenter)) as executor:
+            df_chunks: list[pd.DataFrame] = list(
+                executor.map(_split_chunk_in_worker, chunks))
+        df_info = pd.concat(df_chunks)
+    if resolver is not None:
+        df_info['job_title'] = resolver.resolve(
+            df_info['job_title'].tolist())
+    return df_info
+
+
+def _make_segmenter(cfg: DictConfig) -> SectionSegmenter | None:
+    """The segmenter of the sections of the cfg, if they are set"""
+    sections: DictConfig | None = OmegaConf.select(
+        cfg, 'defaults.analysis.sections', default=None)
+    if not sections:
+        return None
+    return SectionSegmenter(
+        sections=OmegaConf.to_container(sections),
+        scope=OmegaConf.select(cfg, 'defaults.analysis.skill_sections',
+                               default=['job_description', 'requirements']))
+
+
+def _init_worker(compiled: taxo.CompiledTaxonomy,
+                 hasher: MinHasher | None,
+                 match_titles: bool = True,
+                 segmenter: SectionSegmenter | None = None
+                 ) -> None:
+    """Keep the compiled taxonomy and the hasher in the worker process"""
+    # pylint: disable=global-statement
+    global _WORKER_TAXONOMY, _WORKER_HASHER, _WORKER_MATCH_TITLES, \
+        _WORKER_SEGMENTER
+    _WORKER_TAXONOMY = compiled
+    _WORKER_HASHER = hasher
+    _WORKER_MATCH_TITLES = match_titles
+    _WORKER_SEGMENTER = segmenter
+
+
+def _split_chunk_in_worker(payloads: pd.DataFrame) -> pd.DataFrame:
+    """Analyze a chunk of payloads inside a worker process"""
+    compiled = typing.cast(taxo.CompiledTaxonomy, _WORKER_TAXONOMY)
+    return _split_chunk(payloads, compiled, _WORKER_HASHER,
+                        _WORKER_MATCH_TITLES, _WORKER_SEGMENTER)
+
+
+def _split_chunk(payloads: pd.DataFrame,
+                 compiled: taxo.CompiledTaxonomy,
+                 hasher: MinHasher | None = None,
+                 match_titles: bool = True,
+                 segmenter: SectionSegmenter | None = None
+                 ) -> pd.DataFrame:
+    """
+    Clean the payloads and extract the info of the jobs, without
+    `match_titles` the 'job_title' column has the title lines
+    """
+    # pylint: disable=too-many-arguments
+    # pylint: disable=too-many-positional-arguments
+    payloads_uplift = _payload_clean_up(
+        payloads, compiled.title_pattern, segmenter)
+    data_set: dict[str, typing.Any] = _get_info(
+        payloads_uplift, compiled, match_titles)
     file_path = payloads['file_path']
     eml_lang = payloads['eml_lang']
     # Combine the extracted data into a DataFrame
@@ -70,21 +197,63 @@ def split_payload(payloads: pd.DataFrame,
         'eml_lang': eml_lang,
         **data_set
     })
+    if 'date' in payloads.columns:
+        df_info.insert(1, 'date', payloads['date'])
+    if hasher is not None:
+        df_info['minhash'] = hasher.signatures(
+            payloads_uplift['clean_payload'])
     return df_info
 
-def _payload_clean_up(payloads: pd.DataFrame) -> pd.DataFrame:
-    """To split the payload more accurately"""
+
+def _payload_clean_up(payloads: pd.DataFrame,
+                      title_pattern: re.Pattern | None = None,
+                      segmenter: SectionSegmenter | None = None
+                      ) -> pd.DataFrame:
+    """
+    To split the payload more accurately, and take the title line
+    of each payload in the same pass (the 'title' column).
+    With a `segmenter`, the paragraphs are labelled by their
+    sections in this pass too: the texts of its scope are in the
+    'scoped_payload' column (all the paragraphs of a payload
+    without them), and the spans in the '<section>_span' columns.
+    """
     payloads_up = payloads.copy()
 
     # Split on double newlines
     payloads_up["clean_payload"] = _split_double_newline(payloads_up)
 
-    payloads_up["clean_payload"] = \
-        payloads_up["clean_payload"].apply(_filter_item)
-
+    pattern: re.Pattern = title_pattern or _default_title_pattern()
+    sections: list[PayloadSections | None] = [
+        None if segmenter is None else segmenter.sections()
+        for _ in range(len(payloads_up))]
+    cleaned: list[tuple[list[str], str]] = [
+        _filter_and_title(item, pattern, sections=found)
+        for item, found in zip(payloads_up["clean_payload"].tolist(),
+                               sections)]
+    payloads_up["clean_payload"] = [lines for lines, _ in cleaned]
+    payloads_up["title"] = [title for _, title in cleaned]
+
+    if segmenter is not None:
+        results = [typing.cast(PayloadSections, found).result()
+                   for found in sections]
+        payloads_up["scoped_payload"] = [
+            scoped or lines
+            for (scoped, _), (lines, _) in zip(results, cleaned)]
+        for col, spans in segmenter.span_columns(
+                [spans for _, spans in results]).items():
+            payloads_up[col] = spans
     return payloads_up
 
 
+@functools.lru_cache(maxsize=1)
+def _default_title_pattern() -> re.Pattern:
+    """The tags of the title_tags.yaml of the package, compiled once"""
+    tags: dict[str, list[str]] = sub.fetch_from_yaml(
+        str(Path(__file__).resolve().parent / 'taxonomy'),
+        'title_tags.yaml')
+    return compile_tags(tags.get('tags', []))
+
+
 def _split_double_newline(payloads: pd.DataFrame) -> pd.Series:
     """Split the text by breaking on \n\n and remove empty items."""
     return payloads["payload"].apply(
@@ -92,212 +261,264 @@ def _split_double_newline(payloads: pd.DataFrame) -> pd.Series:
     )
 
 
-def _filter_item(item: list[str],
-                 max_newlines: int = 2,
-                 min_dashes: int = 3
-                 ) -> list[str]:
+def _filter_and_title(item: list[str],
+                      title_pattern: re.Pattern,
+                      max_newlines: int = 2,
+                      min_dashes: int = 3,
+                      sections: PayloadSections | None = None
+                      ) -> tuple[list[str], str]:
     """
-    Cleans the payloads by applying specific filtering criteria:
+    Cleans the paragraphs of a payload and takes its title line,
+    in one pass:
 
-    - Remove the extra job ads in the email
+    - Removes the extra job ads in the email, from
+      "Diesen Job melden" on.
+    - Keeps the first paragraph with a title tag; its line with
+      the tag is the title ('Nan' without one).
     - Removes items where the number of newlines is less than
       or equal to the number of '[URL]' occurrences.
     - Excludes items with `max_newlines` or fewer newlines
       and more than `min_dashes` dashes.
     - Retains all other items for further processing.
 
-    Args:
-        payloads (pd.DataFrame): DataFrame containing payload
-        data.
-        max_newlines (int): Maximum number of newlines allowed
-        for exclusion.
-        min_dashes (int): Minimum number of dashes required
-        for exclusion.
-
-    Returns:
-        Cleaned payloads.
+    With `sections`, every kept item is added to them, which
+    labels it by its section.
     """
     filtered: list[str] = []
-
-    tags = ['m/w/d', 'w/d/m', 'd/w/m', 'w/m/d', 'd/m/w',
-            'm/...', 'd/...', 'w/...',
-            'm/f/x', 'f/m/x', 'f/m/d', 'm/f/d', 'x/f/m',
-            'f/...', 'x/...',
-            'm/w', 'w/m', 'f/m', 'm/f',
-            '(mwd)', '(dwm)', '(wmd)',
-            '(fmx)', '(fmx)', '(fmd)', '(xfm)',
-            'w|m|d', 'f|m|d', 'm|w|d', 'm|f|d', 'm|d|w',
-            'm|d|f', 'w|d|m', 'f|d|m',
-            'm/w/divers', 'all genders', '(all genders)'
-            ]
+    title: str = 'Nan'
     # Find the first index where "Diesen Job melden" appears
     cut_index: int = next(
         (i for i, x in enumerate(item) if "Diesen Job melden" in x), len(item))
     item = item[:cut_index]
     title_line: bool = False
     for i in item:
-        new_line_count: int = i.count('\n')
-        url_count: int = i.count('[URL]')
-        dash_count: int = i.count('-')
-        if any(re.search(rf"\b{re.escape(tag)}\b", i, re.IGNORECASE)
-               for tag in tags) and not title_line:
+        if not title_line and (match := title_pattern.search(i)):
             filtered.append(i)
+            title = _line_at(i, match.start())
             title_line = True
+            if sections is not None:
+                sections.add(i)
             continue
+        new_line_count: int = i.count('\n')
+        url_count: int = i.count('[URL]')
+        dash_count: int = i.count('-')
         if new_line_count > url_count and not (
             new_line_count <= max_newlines and dash_count > min_dashes
         ):
             filtered.append(i)
-    return filtered
+            if sections is not None:
+                sections.add(i)
+    return filtered, title
+
+
+def _line_at(text: str, pos: int) -> str:
+    """The line of the text at the position"""
+    start: int = text.rfind('\n', 0, pos) + 1
+    end: int = text.find('\n', pos)
+    return text[start:] if end < 0 else text[start:end]
 
 
 def _get_info(payload: pd.DataFrame,
-              locations: dict[str, list[str]],
-              job_title: dict[str, list[str]],
-              tag_dict: dict[str, list[str]],
-              skill_dict: dict[str, list[str]],
-              languages_dict: dict[str, list[str]],
-              salaries_dict: dict[str, list[str]],
+              compiled: taxo.CompiledTaxonomy,
+              match_titles: bool = True
               ) -> dict[str, typing.Any]:
-    """Extract information from the payloads."""
-    # pylint: disable="too-many-arguments"
-    # pylint: disable="too-many-positional-arguments"
-    # pylint: disable="too-many-locals"
-
-    # Flatten dictionaries into lists
-    cities = [city for cities in locations.values() for city in cities]
-    job_names = [name for names in job_title.values() for name in names]
-    tags = tag_dict.get('tags', [])
-    all_skills = [
-        skill for skills in skill_dict.values() for skill in skills]
-    all_languages = [
-        lang for langs in languages_dict.values() for lang in langs]
-    salaries = [
-        salary for salary_list in salaries_dict.values()
-        for salary in salary_list]
-
-    # Initialize result lists
-    results: dict[str, typing.Any] = {
-        'job_title': [],
-        'location': [],
-        'skills': [],
-        'salary_min': [],
-        'salary_max': [],
-        'salary_unit': [],
-        'language': []
+    """
+    Extract information from the payloads.
+    The cleaned payloads are taken out of the DataFrame once as
+    a plain list, and every column is extracted over the whole
+    list, without building a pd.Series for each row.
+    Without `match_titles`, the job titles are the title lines,
+    to be matched later by a TitleResolver.
+    With the 'scoped_payload' column of the clean-up, the skills
+    and the languages are searched in its texts only, and the
+    spans of the sections are added.
+    """
+    # The flattened lists and the matchers are built once per taxonomy
+    salaries = compiled.terms['salaries']
+
+    clean_payloads: list[list[str]] = payload['clean_payload'].tolist()
+
+    # The titles are taken while cleaning the payloads
+    titles: list[str] = payload['title'].tolist() \
+        if 'title' in payload.columns else [
+            _extract_title(lines, compiled.title_pattern)
+            for lines in clean_payloads]
+    salary_min, salary_max, salary_unit = \
+        _extract_salary_column(clean_payloads, salaries)
+    scoped: list[list[str]] = payload['scoped_payload'].tolist() \
+        if 'scoped_payload' in payload.columns else clean_payloads
+    spans: dict[str, list[tuple[int, int] | None]] = {
+        col: payload[col].tolist() for col in span_columns(payload.columns)}
+
+    return {
+        'job_title': _extract_matching_column(
+            titles, compiled.matchers['job_titles'])
+        if match_titles else titles,
+        'location': _extract_items_column(
+            clean_payloads, compiled.matchers['locations']),
+        'skills': _extract_items_column(
+            scoped, compiled.matchers['skills']),
+        'salary_min': salary_min,
+        'salary_max': salary_max,
+        'salary_unit': salary_unit,
+        'language': _extract_items_column(
+            scoped, compiled.matchers['languages']),
+        **spans,
     }
 
-    for _, row in payload.iterrows():
-        title = _extract_title(row, tags)
-        results['job_title'].append(_extract_matching_item(title, job_names))
-        results['location'].append(_extract_all_items(row, cities))
-        results['skills'].append(_extract_all_items(row, all_skills))
-        results['language'].append(_extract_all_items(row, all_languages))
-        salary_min, salary_max, salary_unit = _extract_salary(row, salaries)
-        results['salary_min'].append(salary_min)
-        results['salary_max'].append(salary_max)
-        results['salary_unit'].append(salary_unit)
 
-    return results
+def _extract_matching_column(titles: list[str],
+                             matcher: KeywordMatcher
+                             ) -> list[str]:
+    """The matching item of each title"""
+    return [_extract_matching_item(title, matcher) for title in titles]
+
+
+def _extract_items_column(clean_payloads: list[list[str]],
+                          matcher: KeywordMatcher
+                          ) -> list[list[str]]:
+    """All the matching items of each payload"""
+    return [_extract_all_items(lines, matcher) for lines in clean_payloads]
 
 
-def _extract_title(row: pd.Series,
-                   tags: list[str]
+def _extract_salary_column(clean_payloads: list[list[str]],
+                           items: list[str]
+                           ) -> tuple[list[float | str],
+                                      list[float | str],
+                                      list[str]]:
+    """
+    The min, max and unit of the salary of each payload, from the
+    first salary in the lines of its paragraphs which mention one
+    of the items (e.g., "€/Jahr"), over all the payloads at once.
+    """
+    # As Arrow strings, the paragraphs are exploded and searched
+    # for a currency in C++; the regex of the items (with the
+    # Unicode word boundaries of `re`) checks only the few
+    # paragraphs with a currency
+    paragraphs: pd.Series = pd.Series(
+        clean_payloads, dtype=pd.ArrowDtype(pa.list_(pa.string()))) \
+        .explode()
+    paragraphs = paragraphs[
+        paragraphs.str.contains(_CURRENCY_HINT).fillna(False)] \
+        .astype(object)
+    paragraphs = paragraphs[paragraphs.str.contains(
+        _keyword_pattern(tuple(items)))]
+    return _salary_amounts(paragraphs, len(clean_payloads))
+
+
+@functools.lru_cache(maxsize=16)
+def _keyword_pattern(items: tuple[str, ...]) -> re.Pattern:
+    """One regex of all the items, each one as a separate word"""
+    if not items:
+        return re.compile(r"(?!)")
+    return re.compile(
+        r"\b(?:" + "|".join(re.escape(item) for item in items) + r")\b",
+        re.IGNORECASE)
+
+
+def _salary_amounts(paragraphs: pd.Series,
+                    nr_rows: int
+                    ) -> tuple[list[float | str],
+                               list[float | str],
+                               list[str]]:
+    """
+    The yearly min and max salary of the first line with a salary
+    of each row (the index of the paragraphs), "Nan" without one.
+    The single amounts are both the min and the max, the "k" is a
+    thousand, and the monthly and hourly amounts are per year; a
+    yearly amount under MIN_YEARLY_SALARY is not a salary.
+    """
+    lines: pd.Series = paragraphs.astype(pd.ArrowDtype(pa.string())) \
+        .str.split('\n').explode()
+    lines = lines[lines.str.contains(_CURRENCY_HINT).fillna(False)]
+    found: pd.DataFrame = lines.astype(object).str.extract(SALARY_PATTERN)
+    found = found[found['low'].notna()]
+
+    low: np.ndarray = _parse_amounts(found['low'])
+    high: np.ndarray = _parse_amounts(found['high'])
+    # "60 - 75k" is "60k - 75k"
+    low_k: np.ndarray = found['low_k'].notna().to_numpy() | (
+        found['high_k'].notna().to_numpy() & (low < 1000))
+    low = np.where(low_k, low * 1000, low)
+    high = np.where(found['high_k'].notna().to_numpy(), high * 1000, high)
+    high = np.where(np.isnan(high), low, high)
+    factors: np.ndarray = found['period'].str.lower().str[:3] \
+        .map(PERIOD_FACTORS).fillna(1).to_numpy()
+    low, high = low * factors, high * factors
+    # The first plausible salary of each row
+    keep: np.ndarray = low >= MIN_YEARLY_SALARY
+    rows: pd.Index = found.index[keep]
+    first: np.ndarray = ~rows.duplicated(keep='first')
+    rows = rows[first]
+
+    salary_min: np.ndarray = np.full(nr_rows, "Nan", dtype=object)
+    salary_max: np.ndarray = np.full(nr_rows, "Nan", dtype=object)
+    salary_unit: np.ndarray = np.full(nr_rows, "Nan", dtype=object)
+    positions: np.ndarray = rows.to_numpy(dtype=np.int64)
+    salary_min[positions] = low[keep][first].tolist()
+    salary_max[positions] = high[keep][first].tolist()
+    salary_unit[positions] = "€/Jahr"
+    return salary_min.tolist(), salary_max.tolist(), salary_unit.tolist()
+
+
+def _parse_amounts(amounts: pd.Series) -> np.ndarray:
+    """The numbers of the amounts, NaN for the missing ones"""
+    # A separator before one or two last digits is the decimal
+    # point, the other ones are of the thousands
+    parts: pd.DataFrame = amounts.astype(pd.ArrowDtype(pa.string())) \
+        .str.extract(r"^(?P<units>[\d.,]*?)(?:[.,](?P<cents>\d{1,2}))?$")
+    numbers: pd.Series = parts['units'].str.replace(
+        r"[.,]", "", regex=True) + "." + parts['cents'].fillna("0")
+    return numbers.astype(pd.ArrowDtype(pa.float64())).to_numpy(
+        dtype=float, na_value=np.nan)
+
+
+def _extract_title(lines: list[str],
+                   tags: list[str] | re.Pattern
                    ) -> str:
-    """Extract the title of the job."""
-    title: str = 'Nan'
-    for item in row['clean_payload']:
-        if any(tag in item for tag in tags):
-            title = next((
-                        line for line in item.split('\n')
-                        if any(tag in line for tag in tags)
-                        ), "")
-            break
-    return title
+    """Extract the title of the job: the first line with a tag."""
+    pattern: re.Pattern = tags if isinstance(tags, re.Pattern) \
+        else compile_tags(tags)
+    for item in lines:
+        if match := pattern.search(item):
+            return _line_at(item, match.start())
+    return 'Nan'
 
 
 def _extract_matching_item(title: str,
-                           items: list[str]
+                           items: list[str] | KeywordMatcher
                            ) -> str:
     """
     Checks if the name of the item is mentioned in the title
-    as a separate word.
+    as a separate word, case-insensitive. The first item, in
+    the order of the items, is returned.
     """
-    for item in items:
-        # Build a regex that looks for 'item' as a whole word,
-        # case-insensitive.
-        pattern = rf"\b{re.escape(item)}\b"
-        if re.search(pattern, title, re.IGNORECASE):
-            return item
-    return "nan"
-
-
-def _extract_all_items(row: pd.Series,
-                       items: list[str],
-                       column: str = "clean_payload"
+    matcher: KeywordMatcher = _as_matcher(items)
+    return matcher.first_match(title) or "nan"
+
+
+def _extract_all_items(lines: list[str],
+                       items: list[str] | KeywordMatcher
                        ) -> list[str]:
     """
-    Extract all matching items from the specified column of
-    a row.
+    Extract all matching items from the lines of a payload.
 
     Args:
-        row (pd.Series): A row of the DataFrame containing
-        the payload data.
-        items (list[str]): A list of items to search for in
-        the payload.
-        column (str): The column name in the row to search
-        within.
+        lines (list[str]): The cleaned payload of an email.
+        items (list[str] | KeywordMatcher): The items to search
+        for in the payload, or a matcher already built from them.
 
     Returns:
-        list[str]: A list of matched items.
-        Returns ["nan"] if no matches are found.
+        list[str]: A list of matched items, in the order of the
+        items. Returns ["nan"] if no matches are found.
     """
-    matched: set[str] = set()
-    for item in items:
-        # Compile a case-insensitive regex pattern for the item.
-        pattern = re.compile(rf"\b{re.escape(item)}\b", re.IGNORECASE)
-
-        # Check if the pattern matches any line in the specified column.
-        if any(pattern.search(line) for line in row[column]):
-            matched.add(item)
-
-    return list(matched) if matched else ["nan"]
-
-
-def _extract_salary(row: pd.Series,
-                    items: list[str],
-                    column: str = "clean_payload"
-                    ) -> tuple[float | str, float | str, str]:
-    """find the line which contains the item and return it"""
-    for item in items:
-        # Compile a case-insensitive regex pattern for the item.
-        pattern = re.compile(rf"\b{re.escape(item)}\b", re.IGNORECASE)
-
-        # Check if the pattern matches any line in the specified column.
-        for line in row[column]:
-            if pattern.search(line):
-                return _get_salary_amount(line)
-    return "Nan", "Nan", "Nan"
-
-
-def _get_salary_amount(line: str) -> tuple[float | str,
-                                           float | str,
-                                           str]:
-    """return salary amount with unit"""
-    min_salary: float = 0.0
-    max_salary: float = 0.0
-    unit: str = "Nan"
-    for l_i in line.split('\n'):
-        if "€" in l_i:
-            salary_pattern = r"(\d{1,3}\.\d{3})\s*-\s*(\d{1,3}\.\d{3})\s*€/*"
-            match = re.search(salary_pattern, l_i)
-            if match:
-                min_salary = float(match.group(1).replace(".", ""))
-                max_salary = float(match.group(2).replace(".", ""))
-            if "€/Monat" in l_i:
-                min_salary *= 12
-                max_salary *= 12
-            unit = "€/Jahr"
-            return min_salary, max_salary, unit
-
-    return "Nan", "Nan", "Nan"
+    matcher: KeywordMatcher = _as_matcher(items)
+    matched: list[str] = matcher.find_all(lines)
+    return matched if matched else ["nan"]
+
+
+def _as_matcher(items: list[str] | KeywordMatcher) -> KeywordMatcher:
+    """Build a matcher from the items if it is not one already"""
+    if isinstance(items, KeywordMatcher):
+        return items
+    return KeywordMatcher(items)
@@ -0,0 +1,229 @@
+"""
+Pipeline runner with a cache for the result of each stage.
+The main chain (emails -> analysis -> terms_unify -> clean ->
+statistics -> plots) is run stage by stage. The key of a stage
+is the hash of:
+  - the name of the stage,
+  - its own inputs: the config entries and YAML files it uses,
+  - the hash of the result of the stage before it.
+If the key is in the cache, the stored result is used and the
+stage is not run; a result is only read from the disk when a
+later stage needs it. Editing lexicon/skills.yaml changes the
+key of terms_unify, so the analysis of the emails is taken from
+the cache and only terms_unify and the stages after it run.
+The results are pickled in `cache_dir`, one file per stage; the
+hash of each result is kept in index.json.
+
+16 Oct. 2026
+S. Amiri
+"""
+
+import os
+import json
+import time
+import pickle
+import typing
+import hashlib
+from pathlib import Path
+
+import pandas as pd
+
+from . import logger
+from . import clean_dataframe
+
+
+__all__ = [
+    'Stage',
+    'Pipeline',
+    'files_digest',
+]
+
+# Parts of the key of a stage: config entries, file contents, ...
+KeyParts = typing.Iterable[str | bytes]
+
+
+class Stage:
+    """One step of the pipeline"""
+    # pylint: disable=too-few-public-methods
+
+    __slots__: list[str] = ['name', 'func', 'key_parts', 'cached']
+
+    name: str
+    func: typing.Callable[[typing.Any], typing.Any]
+    key_parts: typing.Callable[[], KeyParts]
+    cached: bool
+
+    def __init__(self,
+                 name: str,
+                 func: typing.Callable[[typing.Any], typing.Any],
+                 key_parts: typing.Callable[[], KeyParts] = tuple,
+                 cached: bool = True
+                 ) -> None:
+        self.name = name
+        self.func = func
+        self.key_parts = key_parts
+        self.cached = cached
+
+
+class Pipeline:
+    """Run the stages in order, with their results cached"""
+
+    __slots__: list[str] = [
+        'stages', 'cache_dir', 'log', 'report', '_index']
+
+    stages: list[Stage]
+    cache_dir: Path | None
+    log: logger.logging.Logger
+    report: list[tuple[str, str, float]]
+    _index: dict[str, dict[str, str]]
+
+    def __init__(self,
+                 stages: list[Stage],
+                 log: logger.logging.Logger,
+                 cache_dir: str | Path | None = None
+                 ) -> None:
+        self.stages = stages
+        self.log = log
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.report = []
+        self._index = self._read_index()
+
+    def run(self, data: typing.Any = None) -> typing.Any:
+        """
+        Run the stages, the result of each is the input of the
+        next one, and return the result of the last stage.
+        """
+        self.report = []
+        data_hash: str = _data_hash(data)
+        load: typing.Callable[[], typing.Any] = _loader_of(data)
+        for stage in self.stages:
+            start: float = time.perf_counter()
+            key: str = self._stage_key(stage, data_hash)
+            entry: dict[str, str] | None = self._index.get(stage.name)
+            if stage.cached and entry is not None and \
+               entry['key'] == key and self._cache_file(stage).exists():
+                data_hash = entry['output']
+                load = _loader(self._cache_file(stage))
+                status: str = 'hit'
+            else:
+                result: typing.Any = stage.func(load())
+                pickled: bytes | None = pickle.dumps(
+                    result, protocol=pickle.HIGHEST_PROTOCOL) \
+                    if stage.cached and self.cache_dir else None
+                data_hash = _data_hash(result, pickled)
+                if pickled is not None:
+                    self._write(stage, key, data_hash, pickled)
+                load = _loader_of(result)
+                status = 'miss' if stage.cached else 'run'
+            self.report.append(
+                (stage.name, status, time.perf_counter() - start))
+        self.log.info(self.report_table())
+        return load()
+
+    def forget(self, name: str) -> None:
+        """Run the stage again, even if its inputs are unchanged"""
+        self._index.pop(name, None)
+
+    def report_table(self) -> str:
+        """Hit or miss of the cache and the time of each stage"""
+        lines: list[str] = ['\nPipeline stages:']
+        lines.extend(f'\t{name:<16}{status:<6}{seconds:10.3f} s'
+                     for name, status, seconds in self.report)
+        total: float = sum(seconds for _, _, seconds in self.report)
+        lines.append(f'\t{"total":<22}{total:10.3f} s\n')
+        return '\n'.join(lines)
+
+    def _stage_key(self, stage: Stage, data_hash: str) -> str:
+        """Hash of the stage, its own inputs and its input data"""
+        digest = hashlib.sha256(stage.name.encode())
+        for part in stage.key_parts():
+            digest.update(part if isinstance(part, bytes) else part.encode())
+        digest.update(data_hash.encode())
+        return digest.hexdigest()
+
+    def _cache_file(self, stage: Stage) -> Path:
+        """The pickle of the result of the stage"""
+        return typing.cast(Path, self.cache_dir) / f'{stage.name}.pkl'
+
+    def _read_index(self) -> dict[str, dict[str, str]]:
+        """The key and the result hash of each cached stage"""
+        if self.cache_dir is None:
+            return {}
+        index_file: Path = self.cache_dir / 'index.json'
+        if not index_file.exists():
+            return {}
+        with index_file.open('r', encoding='utf-8') as f_r:
+            return json.load(f_r)
+
+    def _write(self,
+               stage: Stage,
+               key: str,
+               data_hash: str,
+               pickled: bytes
+               ) -> None:
+        """Save the result of the stage and update the index"""
+        cache_dir: Path = typing.cast(Path, self.cache_dir)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        _atomic_write(self._cache_file(stage), pickled)
+        self._index[stage.name] = {'key': key, 'output': data_hash}
+        _atomic_write(cache_dir / 'index.json',
+                      json.dumps(self._index).encode())
+
+
+def files_digest(paths: typing.Iterable[str | Path],
+                 content: bool = True
+                 ) -> str:
+    """
+    Hash of the files, by their content, or by their size and
+    mtime if `content` is False (for many large files, like the
+    emails).
+    """
+    digest = hashlib.sha256()
+    for path in sorted(Path(p) for p in paths):
+        digest.update(str(path).encode())
+        if content:
+            digest.update(path.read_bytes())
+        else:
+            stat = path.stat()
+            digest.update(f'{stat.st_size} {stat.st_mtime_ns}'.encode())
+    return digest.hexdigest()
+
+
+def _data_hash(data: typing.Any, pickled: bytes | None = None) -> str:
+    """
+    Hash of the result of a stage: the row fingerprints of a
+    DataFrame, with the order of the items of the lists (a
+    reordered list is another result), otherwise its pickle
+    """
+    if data is None:
+        return ''
+    if isinstance(data, pd.DataFrame):
+        digest = hashlib.sha256(str(data.columns.tolist()).encode())
+        digest.update(str(data.dtypes.tolist()).encode())
+        digest.update(
+            clean_dataframe.row_fingerprints(
+                data, ordered=True).to_numpy().tobytes())
+        return digest.hexdigest()
+    if pickled is None:
+        pickled = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+    return hashlib.sha256(pickled).hexdigest()
+
+
+def _loader(cache_file: Path) -> typing.Callable[[], typing.Any]:
+    """Read the cached result only when it is needed"""
+    def load() -> typing.Any:
+        with cache_file.open('rb') as f_r:
+            return pickle.load(f_r)
+    return load
+
+
+def _loader_of(result: typing.Any) -> typing.Callable[[], typing.Any]:
+    """The result which is already in memory"""
+    return lambda: result
+
+
+def _atomic_write(path: Path, content: bytes) -> None:
+    """Write the file through a temporary one"""
+    tmp_file: Path = path.with_suffix('.tmp')
+    tmp_file.write_bytes(content)
+    os.replace(tmp_file, path)
@@ -0,0 +1,222 @@
+"""
+Sections of the clean payloads of the ads.
+The ads of the alerts have sections under fixed header lines,
+in German or in English, set in conf/defaults/analysis.yaml:
+
+sections:
+  job_description: ["Das wird dein Job", "Your tasks"]
+  requirements: ["Das bringst du mit", "Your knowledge/experience"]
+  ...
+
+SectionSegmenter knows the header lines of every section. The
+paragraphs of a payload are labelled in the pass which cleans
+them (payload_analysis._filter_and_title): every kept paragraph
+is added to the PayloadSections of its payload, which finds the
+header lines in it and cuts it where a section starts, so a
+section ends where the next one starts. A header is found only
+as a whole line; a paragraph without any of the headers in it is
+not split into lines.
+The skills and the languages are searched only in the sections
+of the scope (the job description and the requirements), not in
+the blurbs about the company; a payload without any of them is
+searched whole.
+The span of a section is the (start, end) of its first occurrence
+in the paragraphs of the clean payload joined by blank lines.
+
+16 Oct. 2026
+S. Amiri
+"""
+
+import re
+import typing
+
+
+__all__ = [
+    'SectionSegmenter',
+    'PayloadSections',
+    'span_columns',
+]
+
+SPAN_SUFFIX: str = '_span'
+
+Span = tuple[int, int]
+
+
+class SectionSegmenter:
+    """The header lines of the sections, and the scope of the skills"""
+
+    __slots__: list[str] = ['names', 'scope', 'headers', 'pattern']
+
+    names: list[str]
+    scope: list[str]
+    headers: dict[str, str]
+    pattern: re.Pattern
+
+    def __init__(self,
+                 sections: typing.Mapping[str, typing.Iterable[str]],
+                 scope: typing.Iterable[str] = (
+                     'job_description', 'requirements')
+                 ) -> None:
+        self.names = list(sections)
+        self.scope = [name for name in scope if name in sections]
+        # The section of every header, in lower case
+        self.headers = {}
+        for name, headers in sections.items():
+            for header in headers:
+                self.headers.setdefault(str(header).lower(), name)
+        # The headers anywhere in the lower case text, the longest
+        # first; the matches which are not whole lines are dropped
+        self.pattern = re.compile('|'.join(map(re.escape, sorted(
+            self.headers, key=len, reverse=True)))) \
+            if self.headers else re.compile(r'(?!)')
+
+    def find_headers(self, text: str) -> list[tuple[str, int]]:
+        """The section and the offset of every header line of the text"""
+        lower: str = text.lower()
+        match: re.Match | None = self.pattern.search(lower)
+        if match is None:
+            return []
+        if len(lower) != len(text):
+            # The offsets of the lower case text are not the ones
+            # of the text, every line is looked up instead
+            return self._header_lines(text)
+        found: list[tuple[str, int]] = []
+        while match is not None:
+            start: int = lower.rfind('\n', 0, match.start()) + 1
+            end: int = lower.find('\n', match.end())
+            if not lower[start:match.start()].strip(' \t') and lower[
+                    match.end():end if end >= 0 else None
+            ].strip(' \t') in ('', ':'):
+                found.append((self.headers[match.group()], start))
+            match = self.pattern.search(lower, match.end())
+        return found
+
+    def _header_lines(self, text: str) -> list[tuple[str, int]]:
+        """The header lines of the text, looked up line by line"""
+        found: list[tuple[str, int]] = []
+        offset: int = 0
+        for line in text.split('\n'):
+            name: str | None = self.headers.get(
+                line.strip(' \t').removesuffix(':').rstrip(' \t').lower())
+            if name is not None:
+                found.append((name, offset))
+            offset += len(line) + 1
+        return found
+
+    def segment(self, text: str) -> dict[str, list[Span]]:
+        """The spans of every section of the text, in their order"""
+        starts: list[tuple[str, int]] = self.find_headers(text)
+        ends: list[int] = [start for _, start in starts[1:]] + [len(text)]
+        spans: dict[str, list[Span]] = {}
+        for (name, start), end in zip(starts, ends):
+            spans.setdefault(name, []).append((start, end))
+        return spans
+
+    def sections(self) -> "PayloadSections":
+        """An empty PayloadSections, to add the paragraphs of a payload"""
+        return PayloadSections(self)
+
+    def split(self,
+              paragraphs: list[str]
+              ) -> tuple[list[str], dict[str, Span]]:
+        """
+        The texts of the sections of the scope, or all the
+        paragraphs without them, and the span of each section
+        """
+        sections: PayloadSections = self.sections()
+        for paragraph in paragraphs:
+            sections.add(paragraph)
+        scoped, spans = sections.result()
+        return scoped or paragraphs, spans
+
+    def split_column(self,
+                     clean_payloads: list[list[str]]
+                     ) -> tuple[list[list[str]],
+                                dict[str, list[Span | None]]]:
+        """
+        The texts of the scope of each payload, and a column of
+        spans per section (None if the payload does not have it)
+        """
+        scoped: list[list[str]] = []
+        spans: list[dict[str, Span]] = []
+        for paragraphs in clean_payloads:
+            texts, found = self.split(paragraphs)
+            scoped.append(texts)
+            spans.append(found)
+        return scoped, self.span_columns(spans)
+
+    def span_columns(self,
+                     spans: list[dict[str, Span]]
+                     ) -> dict[str, list[Span | None]]:
+        """A column of spans per section, from the spans of each payload"""
+        return {name + SPAN_SUFFIX: [found.get(name) for found in spans]
+                for name in self.names}
+
+
+class PayloadSections:
+    """
+    The sections of one payload, labelled paragraph by paragraph:
+    the texts of the scope and the first span of every section
+    """
+
+    __slots__: list[str] = [
+        'segmenter', 'section', 'length', 'scoped', 'spans', 'open']
+
+    segmenter: SectionSegmenter
+    section: str | None
+    length: int
+    scoped: list[str]
+    spans: dict[str, Span]
+    open: str | None
+
+    def __init__(self, segmenter: SectionSegmenter) -> None:
+        self.segmenter = segmenter
+        # The section of the last header, None before the first one
+        self.section = None
+        # The length of the paragraphs joined by blank lines
+        self.length = 0
+        self.scoped = []
+        self.spans = {}
+        # The section whose first span does not end yet
+        self.open = None
+
+    def add(self, paragraph: str) -> None:
+        """Label the next paragraph, cut where a section starts"""
+        start: int = self.length + 2 if self.length else 0
+        self.length = start + len(paragraph)
+        headers: list[tuple[str, int]] = \
+            self.segmenter.find_headers(paragraph)
+        if not headers:
+            if self.section in self.segmenter.scope:
+                self.scoped.append(paragraph)
+            return
+        if headers[0][1] and self.section in self.segmenter.scope:
+            self.scoped.append(paragraph[:headers[0][1]])
+        ends: list[int] = [cut for _, cut in headers[1:]] + [len(paragraph)]
+        for (name, cut), end in zip(headers, ends):
+            # A header: its section starts, the one before ends
+            self._start(name, start + cut)
+            if name in self.segmenter.scope:
+                self.scoped.append(paragraph[cut:end])
+
+    def result(self) -> tuple[list[str], dict[str, Span]]:
+        """The texts of the scope, and the span of each section"""
+        spans: dict[str, Span] = dict(self.spans)
+        if self.open is not None:
+            spans[self.open] = (spans[self.open][0], self.length)
+        return self.scoped, spans
+
+    def _start(self, name: str, pos: int) -> None:
+        """A section starts at the position of the joined paragraphs"""
+        if self.open is not None:
+            self.spans[self.open] = (self.spans[self.open][0], pos)
+            self.open = None
+        if name not in self.spans:
+            self.spans[name] = (pos, pos)
+            self.open = name
+        self.section = name
+
+
+def span_columns(columns: typing.Iterable[str]) -> list[str]:
+    """The columns of the spans of the sections"""
+    return [col for col in columns if col.endswith(SPAN_SUFFIX)]
@@ -3,11 +3,20 @@
 S.Amiri
 """
 
+import typing
+from pathlib import Path
 
 import pandas as pd
+from scipy import sparse
 from omegaconf import DictConfig
 
 from . import logger
+from . import compact
+from . import accumulators
+from . import cooccurrence
+from . import storage
+from . import trends
+from . import taxonomy_cache as taxo
 from . import tools_statistics as tools
 
 
@@ -25,6 +34,12 @@ class StatisticsManager:
         'lang_count',
         'salary_min',
         'salary_max',
+        'salary_groups',
+        'list_codes',
+        'skills_matrix',
+        'skills_pairs',
+        'skills_cooccurrence',
+        'trends',
         'log'
     ]
 
@@ -34,32 +49,121 @@ class StatisticsManager:
     lang_count: pd.Series
     salary_min: pd.Series
     salary_max: pd.Series
+    salary_groups: dict[str, pd.DataFrame]
     skills_category: pd.Series
     skills_detail: pd.DataFrame
     skills_per_job: pd.Series
+    list_codes: dict[str, compact.ListCodes]
+    skills_matrix: sparse.csr_matrix
+    skills_pairs: pd.DataFrame
+    skills_cooccurrence: cooccurrence.CoOccurrence
+    trends: dict[str, dict[str, pd.DataFrame]]
     log: logger.logging.Logger
 
     def __init__(self,
                  df_info: pd.DataFrame,
-                 log: logger.logging.Logger
+                 log: logger.logging.Logger,
+                 list_codes: dict[str, compact.ListCodes] | None = None
                  ) -> None:
-        self.df_info = df_info
+        # The strings as categories and the lists as integer codes,
+        # unless the codes are given (e.g., read with the table)
+        self.df_info = compact.categorize(df_info)
+        self.list_codes = compact.encode_lists(self.df_info) \
+            if list_codes is None else list_codes
+        # The ads x skills matrix, all the counts of the skills are
+        # sums and products of it
+        self.skills_matrix = self.list_codes['skills'].incidence()
         self.log = log
 
+    @classmethod
+    def from_file(cls,
+                  path: str | Path,
+                  log: logger.logging.Logger
+                  ) -> "StatisticsManager":
+        """
+        Start from the table of the emails saved by `storage`, the
+        codes of the list columns are taken from its Arrow arrays
+        """
+        df_info, list_codes = storage.read_table(path)
+        log.info(f'\nThe table of {len(df_info)} emails is read from '
+                 f'`{path}`\n')
+        return cls(df_info=df_info, log=log, list_codes=list_codes)
+
     def statistics(self) -> None:
         """call the methods and set the objects"""
         self._analyze_job_titles()
         self._analyze_skills()
         self._analyze_languages()
         self._analyze_salaries()
+        self._analyze_salary_groups()
+
+    def statistics_incremental(self,
+                               cfg: DictConfig,
+                               key: str,
+                               new_files: typing.Collection[str] | None = None
+                               ) -> None:
+        """
+        The same objects as `statistics`, from the stored
+        accumulators updated with the rows which are new since the
+        last run; the `key` changes if the stored ones are not
+        valid anymore. With the `new_files` of the ingest manifest,
+        the counted rows are known by the paths of their files, and
+        only the rows of the other files are hashed and counted.
+        """
+        acc_cfg: DictConfig = cfg.defaults.statistics.accumulators
+        acc_file: str = cfg.defaults.paths.accumulators
+        acc = accumulators.StatisticsAccumulator.load(
+            acc_file, key=key, sketch_k=acc_cfg.sketch_k)
+        nr_new: int = acc.update(self.df_info, chunk_size=acc_cfg.chunk_size,
+                                 new_files=new_files)
+        acc.save(acc_file)
+        self.log.info(f'\nThe statistics are updated with {nr_new} new rows '
+                      f'of {len(self.df_info)}\n')
+
+        self.job_title_top = acc.counters['job_title'].top()
+        self.skills_count = acc.counters['skills'].top()
+        self.lang_count = acc.counters['language'].top()
+        self.log.info(f'Job title summary:\n'
+                      f'{acc.counters["job_title"].summary()}'
+                      f'{self.job_title_top}\n')
+        self.log.info(f'Skills summary:\n{acc.counters["skills"].summary()}'
+                      f'{self.skills_count.head(8)}\n')
+        self.log.info(f'Languages summary:\n'
+                      f'{acc.counters["language"].summary()}'
+                      f'{self.lang_count.head(8)}\n')
+        for col_name in ['salary_min', 'salary_max']:
+            setattr(self, col_name, acc.numbers[col_name].describe())
+            self.log.info(f'{col_name.capitalize()} Summary:\n'
+                          f'{acc.numbers[col_name].summary()}\n'
+                          f'Rank error of the percentiles: '
+                          f'{acc.numbers[col_name].sketch.rank_error():.2%}')
+        self._analyze_salary_groups(acc.groups)
 
     def statistics_by_category(self,
                                cfg: DictConfig
                                ) -> None:
         """Look at the data by the catogory each belong to"""
-        self._analyze_skills_category(cfg)
-        self._analyze_skills_details(cfg)
+        compiled: taxo.CompiledTaxonomy = taxo.load_compiled(cfg)
+        self._analyze_skills_category(cfg, compiled)
+        self._analyze_skills_details(cfg, compiled)
         self._analyze_job_need_skills()
+        self._analyze_skills_pairs(cfg)
+
+    def statistics_over_time(self,
+                             cfg: DictConfig,
+                             key: str
+                             ) -> None:
+        """
+        The trends of the ads by week and by month, the stored
+        tables of the trends are updated with the new periods; the
+        `key` (e.g., the hash of the taxonomy and lexicon files)
+        changes if the stored ones are not valid anymore.
+        """
+        store = trends.TrendStore(
+            store_dir=cfg.defaults.paths.trends, key=key, log=self.log)
+        self.trends = {
+            freq: store.update(self.df_info, freq=freq)
+            for freq in cfg.defaults.statistics.trends.frequencies}
 
     def _analyze_job_titles(self) -> None:
         """analyzing the job titles"""
@@ -73,7 +177,8 @@ class StatisticsManager:
     def _analyze_skills(self) -> None:
         """analysis the skills"""
         summary: pd.DataFrame
-        summary, self.skills_count = tools.anlz_list_cols(self.df_info.skills)
+        summary, self.skills_count = tools.anlz_list_cols(
+            self.list_codes['skills'])
 
         self.log.info(f'Skills summary:\n{summary}'
                       f'{self.skills_count.head(8)}\n')
@@ -81,7 +186,8 @@ class StatisticsManager:
     def _analyze_languages(self) -> None:
         """analysis the skills"""
         summary: pd.DataFrame
-        summary, self.lang_count = tools.anlz_list_cols(self.df_info.language)
+        summary, self.lang_count = tools.anlz_list_cols(
+            self.list_codes['language'])
 
         self.log.info(f'Languages summary:\n{summary}'
                       f'{self.lang_count.head(8)}\n')
@@ -94,24 +200,54 @@ class StatisticsManager:
             setattr(self, col_name, attr_value)
             self.log.info(f'{col_name.capitalize()} Summary:\n{summary}')
 
+    def _analyze_salary_groups(
+            self,
+            groups: dict[str, accumulators.GroupedNumbers] | None = None
+            ) -> None:
+        """analyze the salaries by job title and by region"""
+        if groups is None:
+            groups = {}
+            for by in accumulators.StatisticsAccumulator.GROUP_COLS:
+                groups[by] = accumulators.GroupedNumbers(by)
+                groups[by].update(self.df_info)
+        self.salary_groups = {
+            by: grouped.table() for by, grouped in groups.items()}
+        for by, table in self.salary_groups.items():
+            self.log.info(f'Salaries by {by}:\n{table.head(8)}\n')
+
     def _analyze_skills_category(self,
-                                 cfg: DictConfig
+                                 cfg: DictConfig,
+                                 compiled: taxo.CompiledTaxonomy
                                  ) -> None:
         """analyze the skills by their categories"""
-        summary, self.skills_category = \
-            tools.anlz_by_category(self.df_info['skills'], cfg, 'skills')
+        summary, self.skills_category = tools.anlz_by_category(
+            self.list_codes['skills'], cfg, 'skills', compiled)
         self.log.info(f'Skills category summary:\n{summary}'
                       f'{self.skills_category}\n')
 
     def _analyze_skills_details(self,
-                                cfg: DictConfig
+                                cfg: DictConfig,
+                                compiled: taxo.CompiledTaxonomy
                                 ) -> None:
         """analyze the details of the skills"""
-        self.skills_detail = \
-            tools.anlz_for_details(self.df_info['skills'], cfg, 'skills')
+        self.skills_detail = tools.anlz_for_details(
+            self.list_codes['skills'], cfg, 'skills', compiled)
         self.log.info('Analyzing each category of skills.\n')
 
     def _analyze_job_need_skills(self) -> None:
         """analyze the skills needed based on the job title"""
         self.skills_per_job = tools.anlz_for_job_skils(
-            df=self.df_info, group_col='job_title', combine_col='skills')
+            df=self.df_info, group_col='job_title', combine_col='skills',
+            codes=self.list_codes['skills'])
+
+    def _analyze_skills_pairs(self, cfg: DictConfig) -> None:
+        """analyze the skills asked together in the ads"""
+        pairs_cfg: DictConfig = cfg.defaults.statistics.cooccurrence
+        self.skills_cooccurrence = cooccurrence.CoOccurrence.from_incidence(
+            self.skills_matrix,
+            self.list_codes['skills'].vocab,
+            min_count=pairs_cfg.min_count)
+        self.skills_pairs = self.skills_cooccurrence.top_k(
+            k=pairs_cfg.top_k, measure=pairs_cfg.measure)
+        self.log.info(f'Skills asked together:\n'
+                      f'{self.skills_pairs.head(pairs_cfg.top_k)}\n')
@@ -0,0 +1,125 @@
+"""
+Columnar persistence of the table of the emails (df_info).
+The cleaned table is written as a Parquet file, so the
+statistics and the plots can be made again without reading and
+analyzing all the emails:
+  - the list columns (skills, location, language, ...) are
+    native list<string> columns,
+  - the salary columns, floats mixed with the "Nan" placeholders,
+    are float64 columns with nulls,
+  - the dates of the emails are UTC timestamps,
+  - the other columns are kept as strings.
+The file is read memory-mapped. The list columns are encoded
+straight from their Arrow arrays into ListCodes (the codes the
+statistics count with), and their rows are decoded from the codes,
+so every row shares the strings of the vocabulary instead of
+holding its own copies. The other columns are converted by
+to_pandas, which copies the strings.
+
+16 Oct. 2026
+S. Amiri
+"""
+
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .compact import ListCodes
+from .tools_statistics import PLACEHOLDERS
+
+
+__all__ = [
+    'write_info',
+    'read_info',
+    'read_table',
+]
+
+LIST_TYPE: pa.DataType = pa.list_(pa.string())
+
+
+def write_info(df_info: pd.DataFrame, path: str | Path) -> Path:
+    """
+    Write the table of the emails to a Parquet file.
+
+    Args:
+        df_info (pd.DataFrame): The cleaned table of the emails.
+        path (str | Path): The Parquet file.
+
+    Returns:
+        Path: The written file.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file: Path = path.with_suffix('.tmp')
+    pq.write_table(_to_table(df_info), tmp_file)
+    os.replace(tmp_file, path)
+    return path
+
+
+def read_info(path: str | Path) -> pd.DataFrame:
+    """
+    Read the table of the emails from a Parquet file.
+
+    Args:
+        path (str | Path): The Parquet file.
+
+    Returns:
+        pd.DataFrame: The table, with Python lists in the list
+        columns.
+    """
+    return read_table(path)[0]
+
+
+def read_table(path: str | Path
+               ) -> tuple[pd.DataFrame, dict[str, ListCodes]]:
+    """
+    Read the table of the emails and the codes of its list
+    columns from a Parquet file.
+
+    Args:
+        path (str | Path): The Parquet file.
+
+    Returns:
+        tuple[pd.DataFrame, dict[str, ListCodes]]: The table, with
+        Python lists in the list columns, and the ListCodes of
+        each list column.
+    """
+    table: pa.Table = pq.read_table(path, memory_map=True)
+    list_codes: dict[str, ListCodes] = {
+        field.name: ListCodes.from_arrow(table.column(field.name))
+        for field in table.schema if pa.types.is_list(field.type)}
+    df_info: pd.DataFrame = table.drop_columns(list(list_codes)).to_pandas()
+    for col, codes in list_codes.items():
+        df_info[col] = codes.to_series(index=df_info.index)
+    return df_info[table.column_names], list_codes
+
+
+def _to_table(df_info: pd.DataFrame) -> pa.Table:
+    """The Arrow table of the DataFrame, with the typed columns"""
+    arrays: dict[str, pa.Array] = {}
+    for col in df_info.columns:
+        arrays[col] = _to_array(df_info[col])
+    return pa.table(arrays)
+
+
+def _to_array(col: pd.Series) -> pa.Array:
+    """The Arrow array of a column, by the kind of its values"""
+    values: np.ndarray = col.to_numpy()
+    if col.dtype == object and any(isinstance(x, list) for x in values):
+        return pa.array([x if isinstance(x, list) else None
+                         for x in values], type=LIST_TYPE)
+    try:
+        return pa.array(col, from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        pass
+    # Numbers mixed with the placeholders, like the salaries
+    missing: pd.Series = col.isna() | col.isin(PLACEHOLDERS)
+    numeric: pd.Series = pd.to_numeric(col.mask(missing), errors='coerce')
+    if numeric.notna().sum() == (~missing).sum():
+        return pa.array(numeric.astype(float), from_pandas=True)
+    return pa.array([None if pd.isna(x) else str(x) for x in values],
+                    type=pa.string())
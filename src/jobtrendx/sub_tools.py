@@ -2,10 +2,10 @@
 Tools used in other tools!
 """
 
+import os
 import sys
 from pathlib import Path
 import yaml
-import sys
 
 
 def fetch_from_yaml(file_path: str,
@@ -39,3 +39,10 @@ def fetch_from_yaml(file_path: str,
         sys.exit(f"\nFile Format Error:\n`{file_path}` not a valid YAML file!")
     except Exception as err:
         sys.exit(f"Unknown Error in `{file_path}`: {err}")
+
+
+def resolve_workers(n_workers: int | None) -> int:
+    """Return the number of processes, 0 or None means all cores"""
+    if not n_workers or n_workers < 0:
+        return os.cpu_count() or 1
+    return int(n_workers)
@@ -0,0 +1,187 @@
+"""
+Compiled taxonomy and lexicon, shared by all the modules.
+The YAML files in taxonomy/ and lexicon/ are read, flattened,
+inverted and turned into matchers once, and the result is kept:
+  - in memory, for the other modules of the same run,
+  - on disk (defaults.paths.cache), for the next runs.
+Both are keyed by the hash of the content of the YAML files, so
+editing any of them builds a new CompiledTaxonomy; otherwise the
+files are only read to compute the hash.
+
+16 Oct. 2026
+S. Amiri
+"""
+
+import os
+import re
+import sys
+import pickle
+import hashlib
+from pathlib import Path
+
+from omegaconf import DictConfig, OmegaConf
+
+from . import sub_tools as sub
+from .matcher import KeywordMatcher, compile_tags
+
+
+__all__ = [
+    'CompiledTaxonomy',
+    'load_compiled',
+]
+
+# Bump it if the content of CompiledTaxonomy changes
+CACHE_VERSION: int = 2
+
+# The taxonomies which are searched in the payloads
+MATCHED_TAXONOMIES: tuple[str, ...] = (
+    'locations', 'job_titles', 'skills', 'languages')
+
+_COMPILED: dict[str, "CompiledTaxonomy"] = {}
+
+
+class CompiledTaxonomy:
+    """Flattened, inverted and compiled taxonomy and lexicon"""
+    # pylint: disable=too-few-public-methods
+
+    __slots__: list[str] = [
+        'key',
+        'taxonomy',
+        'lexicon',
+        'terms',
+        'category_of',
+        'lexicon_inverse',
+        'matchers',
+        'title_pattern',
+    ]
+
+    key: str
+    taxonomy: dict[str, dict[str, list[str]]]
+    lexicon: dict[str, dict[str, list[str]]]
+    terms: dict[str, list[str]]
+    category_of: dict[str, dict[str, str]]
+    lexicon_inverse: dict[str, dict[str, str]]
+    matchers: dict[str, KeywordMatcher]
+    title_pattern: re.Pattern
+
+    def __init__(self,
+                 key: str,
+                 taxonomy: dict[str, dict[str, list[str]]],
+                 lexicon: dict[str, dict[str, list[str]]]
+                 ) -> None:
+        self.key = key
+        self.taxonomy = taxonomy
+        self.lexicon = lexicon
+        # All the terms of each taxonomy, in the order of the files
+        self.terms = {
+            name: [term for terms in items.values() for term in terms]
+            for name, items in taxonomy.items()
+        }
+        # The category of each term, the last one if it is repeated
+        self.category_of = {
+            name: {term: cat for cat, terms in items.items()
+                   for term in terms}
+            for name, items in taxonomy.items()
+        }
+        # Every variant in the lexicon to its unified term
+        self.lexicon_inverse = {
+            name: {value: key for key, values in items.items()
+                   for value in values}
+            for name, items in lexicon.items()
+        }
+        self.matchers = {
+            name: KeywordMatcher(self.terms[name])
+            for name in MATCHED_TAXONOMIES if name in self.terms
+        }
+        # The gender tags of the title line of the ads
+        self.title_pattern = compile_tags(
+            taxonomy.get('title_tags', {}).get('tags', []))
+
+
+def load_compiled(cfg: DictConfig) -> CompiledTaxonomy:
+    """
+    Return the compiled taxonomy and lexicon of the cfg, from
+    the memory, the disk cache or by building it.
+    """
+    files: dict[str, Path] = _yaml_files(cfg)
+    key: str = _content_hash(files)
+    if key in _COMPILED:
+        return _COMPILED[key]
+
+    cache_dir: str | None = OmegaConf.select(
+        cfg, 'defaults.paths.cache', default=None)
+    compiled: CompiledTaxonomy | None = _read_cache(cache_dir, key)
+    if compiled is None:
+        compiled = CompiledTaxonomy(
+            key=key,
+            taxonomy={name: sub.fetch_from_yaml(
+                cfg.taxonomy_path, cfg.taxonomy_files[name])
+                for name in cfg.taxonomy_files},
+            lexicon={name: sub.fetch_from_yaml(
+                cfg.lexicon_path, cfg.lexicon_files[name])
+                for name in cfg.lexicon_files})
+        _write_cache(cache_dir, compiled)
+    _COMPILED[key] = compiled
+    return compiled
+
+
+def _yaml_files(cfg: DictConfig) -> dict[str, Path]:
+    """All the taxonomy and lexicon files of the cfg"""
+    files: dict[str, Path] = {
+        f'taxonomy/{name}': Path(cfg.taxonomy_path) / file_name
+        for name, file_name in cfg.taxonomy_files.items()
+    }
+    files.update({
+        f'lexicon/{name}': Path(cfg.lexicon_path) / file_name
+        for name, file_name in cfg.lexicon_files.items()
+    })
+    return files
+
+
+def _content_hash(files: dict[str, Path]) -> str:
+    """Hash of the names and contents of the files"""
+    digest = hashlib.sha256(f'version {CACHE_VERSION}'.encode())
+    for name, path in sorted(files.items()):
+        digest.update(name.encode())
+        try:
+            digest.update(path.read_bytes())
+        except FileNotFoundError:
+            sys.exit(f"\nFile Not Found:\n`{path}` does not exist!")
+    return digest.hexdigest()
+
+
+def _read_cache(cache_dir: str | None,
+                key: str
+                ) -> CompiledTaxonomy | None:
+    """Load the compiled taxonomy from the disk if it is there"""
+    # pylint: disable=broad-exception-caught
+    if cache_dir is None:
+        return None
+    cache_file: Path = Path(cache_dir) / f'taxonomy_{key[:16]}.pkl'
+    if not cache_file.exists():
+        return None
+    try:
+        with cache_file.open('rb') as f_r:
+            compiled = pickle.load(f_r)
+    except Exception:
+        return None
+    if not isinstance(compiled, CompiledTaxonomy) or compiled.key != key:
+        return None
+    return compiled
+
+
+def _write_cache(cache_dir: str | None,
+                 compiled: CompiledTaxonomy
+                 ) -> None:
+    """Save the compiled taxonomy, replacing the older ones"""
+    if cache_dir is None:
+        return
+    cache_path = Path(cache_dir)
+    cache_path.mkdir(parents=True, exist_ok=True)
+    for old_file in cache_path.glob('taxonomy_*.pkl'):
+        old_file.unlink()
+    cache_file: Path = cache_path / f'taxonomy_{compiled.key[:16]}.pkl'
+    tmp_file: Path = cache_file.with_suffix('.tmp')
+    with tmp_file.open('wb') as f_w:
+        pickle.dump(compiled, f_w, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_file, cache_file)
@@ -13,11 +13,14 @@ Machine Learning:
 S. Amiri
 """
 
+import numpy as np
 import pandas as pd
 
 from omegaconf import DictConfig
 
-from . import sub_tools as sub
+from . import fuzzy
+from . import compact
+from . import taxonomy_cache as taxo
 
 
 __all__ = [
@@ -28,63 +31,136 @@ __all__ = [
 def term_unifier(df_info: pd.DataFrame,
                  cfg: DictConfig
                  ) -> pd.DataFrame:
-    """unify the terms in the columns"""
-    job_lexcion: dict[str, list[str]] = sub.fetch_from_yaml(
-        cfg.lexicon_path, cfg.lexicon_files['job_titles'])
-    skill_lexicon: dict[str, list[str]] = sub.fetch_from_yaml(
-        cfg.lexicon_path, cfg.lexicon_files['skills'])
-    language_lexicon: dict[str, list[str]] = sub.fetch_from_yaml(
-        cfg.lexicon_path, cfg.lexicon_files['languages'])
-
-    df_info = _replace_str(job_lexcion, df_info, 'job_title')
-    df_info = _replace_list_str(skill_lexicon, df_info, 'skills')
-    df_info = _replace_list_str(language_lexicon, df_info, 'language')
+    """
+    unify the terms in the columns, the terms which are not in
+    the lexicon take the key of their closest variant if the fuzzy
+    unification is enabled
+    """
+    compiled: taxo.CompiledTaxonomy = taxo.load_compiled(cfg)
+    inverse: dict[str, dict[str, str]] = compiled.lexicon_inverse
+    fuzzy_cfg: DictConfig = cfg.defaults.analysis.fuzzy_unification
+    indexes: dict[str, fuzzy.FuzzyIndex | None] = {
+        name: fuzzy.FuzzyIndex(value_to_key,
+                               max_distance=fuzzy_cfg.max_distance,
+                               max_ratio=fuzzy_cfg.max_ratio)
+        if fuzzy_cfg.enabled else None
+        for name, value_to_key in inverse.items()}
+
+    df_info = _replace_str(compiled.lexicon['job_titles'], df_info,
+                           'job_title', inverse['job_titles'],
+                           indexes['job_titles'])
+    df_info = _replace_list_str(compiled.lexicon['skills'], df_info,
+                                'skills', inverse['skills'],
+                                indexes['skills'])
+    df_info = _replace_list_str(compiled.lexicon['languages'], df_info,
+                                'language', inverse['languages'],
+                                indexes['languages'])
     return df_info
 
 
 def _replace_str(lexicon: dict[str, list[str]],
                  df: pd.DataFrame,
-                 column: str
+                 column: str,
+                 value_to_key: dict[str, str] | None = None,
+                 fuzzy_index: fuzzy.FuzzyIndex | None = None
                  ) -> pd.DataFrame:
     """
     Replace the strings in the specified column with the corresponding
     keys from the lexicon dictionary.
+    The inverted lexicon is built if it is not given.
+    With a fuzzy index, the strings which are not in the lexicon
+    take the key of their closest variant.
     """
     # Create a reverse mapping of all values to their corresponding keys
-    value_to_key = _invert_lexicon(lexicon=lexicon)
-
-    # Replace values in the column using the mapping
-    df[column] = df[column].apply(
-        lambda item: value_to_key.get(item, item) if pd.notna(item) else item
-    )
+    if value_to_key is None:
+        value_to_key = _invert_lexicon(lexicon=lexicon)
+
+    # Replace values in the column using the mapping, the values
+    # which are not in the lexicon are kept
+    mapped: pd.Series = _fuzzy_fill(df[column].map(value_to_key),
+                                    df[column], fuzzy_index)
+    df[column] = mapped.where(mapped.notna(), df[column])
     return df
 
 
 def _replace_list_str(lexicon: dict[str, list[str]],
                       df: pd.DataFrame,
-                      column: str
+                      column: str,
+                      value_to_key: dict[str, str] | None = None,
+                      fuzzy_index: fuzzy.FuzzyIndex | None = None
                       ) -> pd.DataFrame:
     """
     Replace the strings in a list of strings in the specified
     column with the corresponding keys from the lexicon
-    dictionary. Deduplicates the resulting list.
+    dictionary. Deduplicates and sorts the resulting list.
+    The inverted lexicon is built if it is not given.
+    With a fuzzy index, the strings which are not in the lexicon
+    take the key of their closest variant.
     """
     # Create a reverse mapping of all values to their corresponding keys
-    value_to_key = _invert_lexicon(lexicon=lexicon)
-
-    # Replace and deduplicate values in the column
-    def process_list(item_list):
-        if isinstance(item_list, list):
-            # Replace items and deduplicate in one step
-            return list({value_to_key.get(item, item) for item in item_list})
-        return item_list
-
-    df[column] = df[column].apply(process_list)
-    df[column] = df[column].apply(lambda x: sorted(x) if
-                                  isinstance(x, list) else x)
+    if value_to_key is None:
+        value_to_key = _invert_lexicon(lexicon=lexicon)
+
+    # The items of all the lists at once, as codes into a vocabulary
+    col: pd.Series = df[column]
+    lists: compact.ListCodes = compact.ListCodes.from_series(col)
+
+    # The code table: each term of the vocabulary to the code of its
+    # unified term, the unified terms are sorted so the codes are too.
+    # A NaN item (code -1) stays -1
+    unified: pd.Series = pd.Series(lists.vocab, dtype=object)
+    unified = _fuzzy_fill(unified.map(value_to_key), unified,
+                          fuzzy_index).fillna(unified)
+    terms, table = np.unique(unified.to_numpy(dtype=object),
+                             return_inverse=True)
+    codes: np.ndarray = np.append(table, -1)[lists.codes]
+
+    # Only the lists with an item renamed, repeated or out of order
+    # are built again, the others are already unified
+    row_ids: np.ndarray = lists.row_ids()
+    renamed: np.ndarray = np.append(
+        terms[table] != lists.vocab, False)[lists.codes]
+    first: np.ndarray = np.zeros(len(codes), dtype=bool)
+    first[lists.offsets[:-1][lists.lengths > 0]] = True
+    in_order: np.ndarray = first | (np.diff(codes, prepend=-2) > 0)
+    changed: np.ndarray = np.zeros(len(lists), dtype=bool)
+    changed[row_ids[renamed | ~in_order]] = True
+
+    # Deduplicate and sort the codes of these rows with one sort of
+    # the (row, code) pairs
+    selected: np.ndarray = changed[row_ids]
+    width: int = len(terms) + 1
+    keys: np.ndarray = np.sort(
+        row_ids[selected] * width + codes[selected] + 1)
+    keys = keys[np.diff(keys, prepend=-1) != 0]
+    items: list[str] = np.append(terms, np.nan)[keys % width - 1].tolist()
+    rows: np.ndarray = np.flatnonzero(changed)
+    starts: np.ndarray = np.searchsorted(keys // width, rows)
+    ends: np.ndarray = np.append(starts[1:], len(keys))
+
+    # The cells which are not lists are kept
+    cells: list = col.tolist()
+    for row, start, end in zip(rows.tolist(), starts.tolist(),
+                               ends.tolist()):
+        cells[row] = items[start:end]
+    df[column] = pd.Series(cells, index=col.index, dtype=object)
     return df
 
 
+def _fuzzy_fill(mapped: pd.Series,
+                values: pd.Series,
+                fuzzy_index: fuzzy.FuzzyIndex | None
+                ) -> pd.Series:
+    """
+    Fill the values which are not mapped with the key of their
+    closest variant, each distinct value is resolved once
+    """
+    if fuzzy_index is None:
+        return mapped
+    rest: pd.Series = values[mapped.isna() & values.notna()]
+    return mapped.fillna(values.map(fuzzy_index.resolve_all(rest.unique())))
+
+
 def _invert_lexicon(lexicon: dict[str, list[str]]
                     ) -> dict[str, str]:
     """Invert the lexicon to simplify the search"""
@@ -0,0 +1,149 @@
+"""
+Job title of the title lines of the ads, memoized.
+The same few thousand titles come again and again, only with
+other gender tags, cases or spaces:
+    "Data Scientist (m/w/d)", "DATA SCIENTIST (w/m/d)", ...
+so TitleResolver matches each of them once:
+  - the distinct title lines of a batch are normalized: lower
+    case, without the tags of title_tags.yaml and with single
+    spaces,
+  - the normalized line is looked up in a memo of at most
+    `max_size` lines, the least recently used ones are dropped;
+    the memo is kept on the disk between the runs,
+  - only the lines which are not in the memo go to the matcher
+    of the job titles.
+The memo is valid for one taxonomy, it is stored with the key
+of the compiled taxonomy and dropped if the key changes.
+
+16 Oct. 2026
+S. Amiri
+"""
+
+import os
+import re
+import json
+import time
+import collections
+from pathlib import Path
+
+from .matcher import KeywordMatcher
+
+
+__all__ = [
+    'TitleResolver',
+]
+
+SPACES: re.Pattern[str] = re.compile(r'\s+')
+# The brackets left empty by a removed tag
+EMPTY_BRACKETS: re.Pattern[str] = re.compile(r'[(\[]\s*[)\]]')
+
+
+class TitleResolver:
+    """Memoized job titles of the title lines"""
+
+    __slots__: list[str] = [
+        'matcher',
+        'tag_pattern',
+        'key',
+        'cache_file',
+        'max_size',
+        'memo',
+        'stats',
+        'match_seconds',
+    ]
+
+    matcher: KeywordMatcher
+    tag_pattern: re.Pattern
+    key: str
+    cache_file: Path | None
+    max_size: int
+    memo: collections.OrderedDict[str, str]
+    stats: dict[str, int]
+    match_seconds: float
+
+    def __init__(self,
+                 matcher: KeywordMatcher,
+                 tag_pattern: re.Pattern,
+                 key: str = '',
+                 cache_file: str | Path | None = None,
+                 max_size: int = 100_000
+                 ) -> None:
+        # pylint: disable=too-many-arguments
+        # pylint: disable=too-many-positional-arguments
+        self.matcher = matcher
+        self.tag_pattern = tag_pattern
+        self.key = key
+        self.cache_file = Path(cache_file) if cache_file else None
+        self.max_size = max(1, max_size)
+        self.memo = collections.OrderedDict()
+        self.stats = {'titles': 0, 'lines': 0, 'hits': 0, 'misses': 0}
+        self.match_seconds = 0.0
+        self._load()
+
+    def resolve(self, titles: list[str]) -> list[str]:
+        """The job title of each title line, "nan" without one"""
+        self.stats['titles'] += len(titles)
+        found: dict[str, str] = {
+            line: self._resolve_line(line) for line in dict.fromkeys(titles)}
+        self.stats['lines'] += len(found)
+        return [found[line] for line in titles]
+
+    def normalize(self, line: str) -> str:
+        """The title line in lower case, without tags and extra spaces"""
+        line = EMPTY_BRACKETS.sub(' ', self.tag_pattern.sub(' ', line))
+        return SPACES.sub(' ', line).strip().lower()
+
+    def save(self) -> None:
+        """Write the memo to the disk, the least recently used first"""
+        if self.cache_file is None:
+            return
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file: Path = self.cache_file.with_suffix('.tmp')
+        with tmp_file.open('w', encoding='utf-8') as f_w:
+            json.dump({'key': self.key, 'memo': list(self.memo.items())},
+                      f_w)
+        os.replace(tmp_file, self.cache_file)
+
+    def report(self) -> str:
+        """
+        Summary of the memo; the time saved is estimated with the
+        mean time of the lines matched in this run
+        """
+        titles: int = self.stats['titles']
+        misses: int = self.stats['misses']
+        hit_rate: float = (titles - misses) / titles if titles else 0.0
+        saved: str = ''
+        if misses:
+            seconds: float = (titles - misses) * self.match_seconds / misses
+            saved = f', about {seconds:.3f} s saved'
+        return (f'Title resolution: {titles} titles, '
+                f'{self.stats["lines"]} distinct lines, '
+                f'{self.stats["hits"]} from the memo, {misses} matched; '
+                f'hit rate {hit_rate:.1%}{saved}.')
+
+    def _resolve_line(self, line: str) -> str:
+        """The job title of one distinct line, from the memo if known"""
+        normalized: str = self.normalize(line)
+        job_title: str | None = self.memo.get(normalized)
+        if job_title is not None:
+            self.memo.move_to_end(normalized)
+            self.stats['hits'] += 1
+            return job_title
+        start: float = time.perf_counter()
+        job_title = self.matcher.first_match(normalized) or "nan"
+        self.match_seconds += time.perf_counter() - start
+        self.stats['misses'] += 1
+        self.memo[normalized] = job_title
+        if len(self.memo) > self.max_size:
+            self.memo.popitem(last=False)
+        return job_title
+
+    def _load(self) -> None:
+        """Read the memo from the disk, if it is of the same key"""
+        if self.cache_file is None or not self.cache_file.exists():
+            return
+        with self.cache_file.open('r', encoding='utf-8') as f_r:
+            data: dict = json.load(f_r)
+        if data.get('key') == self.key:
+            self.memo = collections.OrderedDict(
+                data.get('memo', [])[-self.max_size:])
@@ -6,26 +6,41 @@ import re
 import typing
 from pathlib import Path
 import email
+import email.utils
 from email.message import EmailMessage
 from langdetect import detect
 
 import pandas as pd
 
+if typing.TYPE_CHECKING:
+    from .language_detector import LanguageDetector
 
 __all__ = [
     "extract_email_detail",
     "eml_to_dataframe",
     "detect_language",
+    "parse_dates",
 ]
 
+# The RFC 2822 date of the emails, without the weekday and the
+# comment, e.g., "Fri, 05 Jan 2024 08:00:00 +0100 (CET)"
+DATE_FORMAT: str = "%d %b %Y %H:%M:%S %z"
+
 # Function used inside analysis.py:
 
-def extract_email_detail(eml_dict: dict[Path, EmailMessage]
+def extract_email_detail(eml_dict: dict[Path, EmailMessage |
+                                        dict[str, typing.Any]]
                          ) -> dict[Path, dict[str, typing.Any]]:
-    """extract and return the metadata"""
+    """
+    extract and return the metadata, the emails read with the
+    fast reading are already their details
+    """
     extracted_data: dict[Path, dict[str, typing.Any]] = {}
 
     for file_path, email_obj in eml_dict.items():
+        if isinstance(email_obj, dict):
+            extracted_data[file_path] = email_obj
+            continue
         details = {
             "subject": email_obj["subject"],
             "from": email_obj["from"],
@@ -113,8 +128,15 @@ def _clean_eml_payload(text: str) -> str:
     return text
 
 
-def detect_language(bodies: pd.Series) -> pd.Series:
-    """Get emails languages"""
+def detect_language(bodies: pd.Series,
+                    detector: "LanguageDetector | None" = None
+                    ) -> pd.Series:
+    """
+    Get emails languages, with the memoized detector if it is
+    given, otherwise by langdetect for every body
+    """
+    if detector is not None:
+        return detector.detect(bodies)
     return bodies.apply(_detect_single_language)
 
 
@@ -139,3 +161,30 @@ def _check_language(lang: str) -> str:
     """
     allowed_languages: set[str] = {"en", "de"}
     return lang if lang in allowed_languages else "unknown"
+
+
+def parse_dates(dates: pd.Series) -> pd.Series:
+    """
+    Parse the `date` headers of the emails to UTC timestamps,
+    NaT if it is missing or not a date. The common form is
+    parsed at once, only the other ones one by one.
+    """
+    text: pd.Series = dates.astype("string")
+    text = text.str.replace(r"^\s*[A-Za-z]{3},\s*", "", regex=True)
+    text = text.str.replace(r"\s*\([^)]*\)\s*$", "", regex=True)
+    text = text.str.replace(r"\s(?:GMT|UTC?|Z)$", " +0000", regex=True)
+    parsed: pd.Series = pd.to_datetime(
+        text, format=DATE_FORMAT, errors="coerce", utc=True)
+    others: pd.Series = text.notna() & parsed.isna()
+    if others.any():
+        parsed[others] = pd.to_datetime(
+            dates[others].map(_parse_single_date), errors="coerce", utc=True)
+    return parsed.rename("date")
+
+
+def _parse_single_date(date: typing.Any) -> typing.Any:
+    """The date of a header which is not in the common form"""
+    try:
+        return email.utils.parsedate_to_datetime(str(date))
+    except (TypeError, ValueError):
+        return None
@@ -3,11 +3,16 @@ tools for processor
 """
 
 import sys
+import typing
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 import email
 from email import policy
 
 from . import colors_text as ct
+from . import fast_ingest
+from . import tools_analysis
+from .sub_tools import resolve_workers
 
 
 __all__ = [
@@ -17,8 +22,14 @@ __all__ = [
     "returns_eml_files",
     "returns_eml_path",
     "returns_email_contant",
+    "returns_email_contant_parallel",
+    "resolve_workers",
+    "iter_chunks",
 ]
 
+# A parsed email, or only its details with the fast reading
+EmailContent = email.message.EmailMessage | dict[str, typing.Any]
+
 
 # Functions in used inside email_processor.py:
 
@@ -71,13 +82,79 @@ def returns_eml_path(parent_path: str,
     return [Path(parent_path) / file for file in eml_list]
 
 
-def returns_email_contant(eml_paths: list[Path]
-                          ) -> dict[Path, "email.message.EmailMessage"]:
-    """Read the emails and return the contents in a DataFrame"""
-    eml_dict: dict[Path, "email.message.EmailMessage"] = {}
+def returns_email_contant(eml_paths: list[Path],
+                          fast: bool = False
+                          ) -> dict[Path, "EmailContent"]:
+    """
+    Read the emails and return the contents in a DataFrame,
+    with `fast` only their details, without the EmailMessage
+    """
+    reader = fast_ingest.read_eml if fast else _read_eml_file
+    eml_dict: dict[Path, "EmailContent"] = {}
     for file_path in eml_paths:
-        with open(file_path, "r", encoding="utf-8") as eml:
-            msg = email.message_from_file(eml, policy=policy.default)
-        eml_dict[file_path] = msg
-        del msg
+        eml_dict[file_path] = reader(file_path)
     return eml_dict
+
+
+def returns_email_contant_parallel(
+        eml_paths: list[Path],
+        n_workers: int,
+        chunk_size: int = 64,
+        fast: bool = False
+        ) -> dict[Path, dict[str, typing.Any]]:
+    """
+    Read the emails in a pool of processes.
+    The paths are sent to the workers in shards of `chunk_size`
+    files, and the results are collected in the order of
+    `eml_paths`. The workers send back only the details of the
+    emails (the headers as plain strings, the payload and the
+    names of the attachments), not the EmailMessage objects,
+    which are many times larger to pickle; the details are the
+    ones `tools_analysis.extract_email_detail` takes from the
+    emails of `returns_email_contant`.
+
+    Args:
+        eml_paths (list[Path]): Paths of the .eml files.
+        n_workers (int): Number of processes, 0 for all cores.
+        chunk_size (int): Number of files per shard.
+        fast (bool): Read only the details of the emails.
+
+    Returns:
+        dict[Path, dict[str, Any]]: The details of the emails
+        keyed by path.
+    """
+    reader = fast_ingest.read_eml if fast else _read_eml_details
+    n_workers = resolve_workers(n_workers)
+    if n_workers == 1 or len(eml_paths) <= chunk_size:
+        return {file_path: reader(file_path) for file_path in eml_paths}
+
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        details = executor.map(reader,
+                               eml_paths,
+                               chunksize=max(1, chunk_size))
+        return dict(zip(eml_paths, details))
+
+
+def iter_chunks(items: list[typing.Any],
+                chunk_size: int
+                ) -> typing.Iterator[list[typing.Any]]:
+    """Yield consecutive slices of `items` with `chunk_size` entries"""
+    chunk_size = max(1, chunk_size)
+    for start in range(0, len(items), chunk_size):
+        yield items[start:start + chunk_size]
+
+
+def _read_eml_file(file_path: Path) -> "email.message.EmailMessage":
+    """Read and parse a single .eml file"""
+    with open(file_path, "r", encoding="utf-8") as eml:
+        return email.message_from_file(eml, policy=policy.default)
+
+
+def _read_eml_details(file_path: Path) -> dict[str, typing.Any]:
+    """The details of a .eml file, with the headers as plain strings"""
+    details: dict[str, typing.Any] = tools_analysis.extract_email_detail(
+        {file_path: _read_eml_file(file_path)})[file_path]
+    for key in fast_ingest.HEADERS:
+        if details[key] is not None:
+            details[key] = str(details[key])
+    return details
@@ -1,16 +1,28 @@
 """Do the statistics for analyzing the ads"""
 
 from collections import defaultdict
-from itertools import chain
+import numpy as np
 import pandas as pd
+from scipy import sparse
 
 from omegaconf import DictConfig
 
 from . import sub_tools as sub
+from . import taxonomy_cache as taxo
+from .compact import ListCodes, column_sums
+
+# The strings which stand for a missing value
+PLACEHOLDERS: list[str | None] = ['nan', 'Nan', 'None', '', None]
+
+# The percentiles of the numerical columns: p10, p25, the median,
+# p75 and p90
+PERCENTILES: list[float] = [0.1, 0.25, 0.5, 0.75, 0.9]
+
 __all__ = [
     'anlz_string_cols',
     'anlz_list_cols',
     'anlz_numerical_cols',
+    'clean_numbers',
     'anlz_by_category',
     'anlz_for_details',
     'anlz_for_job_skils'
@@ -24,21 +36,25 @@ def anlz_string_cols(col: pd.Series) -> tuple[pd.DataFrame, pd.Series]:
 
     Args:
         col (pd.Series): A pandas Series containing job
-        col.
+        col, strings or categorical.
 
     Returns:
         tuple[pd.DataFrame, pd.Series]: A summary DataFrame
         with statistics and a Series with the top counts.
     """
-    col = col.astype(str).str.strip()
-    col = col.replace(['nan', 'Nan', 'None', '', None], pd.NA)
+    if isinstance(col.dtype, pd.CategoricalDtype):
+        col = _clean_categorical(col)
+        counts = _count_categorical(col)
+    else:
+        col = col.astype(str).str.strip()
+        col = col.replace(PLACEHOLDERS, pd.NA)
+        counts = col.value_counts(dropna=True)
 
     total: int = len(col)
     missing: int = col.isna().sum()
     valids: int = total - missing
 
     unique: int = col.nunique(dropna=True)
-    counts = col.value_counts(dropna=True)
 
     summary = pd.DataFrame({
         'Total': [total],
@@ -49,33 +65,30 @@ def anlz_string_cols(col: pd.Series) -> tuple[pd.DataFrame, pd.Series]:
     return summary, counts
 
 
-def anlz_list_cols(col: pd.Series) -> tuple[pd.DataFrame, pd.Series]:
+def anlz_list_cols(col: pd.Series | ListCodes
+                   ) -> tuple[pd.DataFrame, pd.Series]:
     """
     Analyze columns containing lists, count their elements,
     and return statistics.
 
     Args:
-        col (pd.Series): A pandas Series where each entry is
-        expected to be a list or NaN.
+        col (pd.Series | ListCodes): A pandas Series where each
+        entry is expected to be a list or NaN, or its codes.
 
     Returns:
         tuple[pd.DataFrame, pd.Series]: A summary DataFrame
         with statistics and a Series with the top counts of
         flattened list elements.
     """
-    # Ensure all non-list entries are replaced with empty lists
-    clean_col: pd.Series = col.dropna().apply(
-        lambda x: x if isinstance(x, list) else []
-    )
+    codes: ListCodes = _as_codes(col)
 
     # Calculate basic statistics
-    total: int = len(col)
-    missing: int = col.isna().sum()
+    total: int = len(codes)
+    missing: int = int(codes.missing.sum())
     valids: int = total - missing
 
-    # Flatten the list elements and count occurrences
-    flat_items = list(chain.from_iterable(clean_col))
-    counts = pd.Series(flat_items).value_counts()
+    # Count the elements over their integer codes
+    counts: pd.Series = codes.counts()
 
     # Create a summary DataFrame
     summary = pd.DataFrame({
@@ -104,17 +117,15 @@ def anlz_numerical_cols(col: pd.Series) -> tuple[pd.DataFrame, pd.Series]:
         with statistics and a Series with descriptive
         statistics.
     """
-    col = col.replace(['nan', 'Nan', 'None', '', None], pd.NA)
-    clean_col: pd.Series = col.dropna().astype(float)
-    # Drop rows with zero values
-    clean_col = clean_col[clean_col != 0]
+    col = col.replace(PLACEHOLDERS, pd.NA)
+    clean_col: pd.Series = clean_numbers(col)
 
     total: int = len(col)
     missing: int = col.isna().sum()
     valids: int = total - missing
 
     # Calculate descriptive statistics
-    descriptive_stats = clean_col.describe()
+    descriptive_stats = clean_col.describe(percentiles=PERCENTILES)
 
     # Create a summary DataFrame
     summary = pd.DataFrame({
@@ -130,9 +141,18 @@ def anlz_numerical_cols(col: pd.Series) -> tuple[pd.DataFrame, pd.Series]:
     return summary, descriptive_stats
 
 
-def anlz_by_category(col: pd.Series,
+def clean_numbers(col: pd.Series) -> pd.Series:
+    """The numbers of the column, without the missing and the zeros"""
+    clean_col: pd.Series = col.replace(PLACEHOLDERS, pd.NA).dropna() \
+        .astype(float)
+    # Drop rows with zero values
+    return clean_col[clean_col != 0]
+
+
+def anlz_by_category(col: pd.Series | ListCodes,
                      cfg: DictConfig,
-                     subject: str
+                     subject: str,
+                     compiled: taxo.CompiledTaxonomy | None = None
                      ) -> tuple[pd.DataFrame, pd.Series]:
     """
     Analyze each sub-category by checking the skills in the
@@ -141,38 +161,31 @@ def anlz_by_category(col: pd.Series,
     each key.
 
     Args:
-        col (pd.Series): A pandas Series where each entry is
-        expected to be a list of skills or NaN.
+        col (pd.Series | ListCodes): A pandas Series where each
+        entry is expected to be a list of skills or NaN, or its
+        codes.
         cfg (DictConfig): Configuration object containing
         paths to taxonomy files.
         subject (str): The subject to analyze (e.g., 'skills').
+        compiled (CompiledTaxonomy | None): The shared compiled
+        taxonomy, the YAML file is read if it is not given.
 
     Returns:
         tuple[pd.DataFrame, pd.Series]: A summary DataFrame
         with statistics and a Series with counts for each
         category.
     """
-    taxonomy: dict[str, list[str]] = sub.fetch_from_yaml(
-        cfg.taxonomy_path, cfg.taxonomy_files[subject])
+    taxonomy: dict[str, list[str]] = _get_taxonomy(cfg, subject, compiled)
+    codes: ListCodes = _as_codes(col)
 
-    # Ensure all non-list entries are replaced with empty lists
-    clean_col: pd.Series = col.dropna().apply(
-        lambda x: x if isinstance(x, list) else []
-    )
-
-    # Flatten the list elements
-    flat_items = list(chain.from_iterable(clean_col))
-
-    # Initialize a dictionary to store counts for each key
-    category_counts = {key: 0 for key in taxonomy.keys()}
-
-    # Count occurrences of each item in the taxonomy keys
-    for key, items in taxonomy.items():
-        category_counts[key] = sum(item in items for item in flat_items)
+    # The items of the ads rolled up to the keys in one product
+    to_category: sparse.csr_matrix = _category_matrix(codes.vocab, taxonomy)
+    category_counts = dict(zip(
+        taxonomy, column_sums(codes.incidence() @ to_category).tolist()))
 
     # Calculate basic statistics
-    total: int = len(col)
-    missing: int = col.isna().sum()
+    total: int = len(codes)
+    missing: int = int(codes.missing.sum())
     valids: int = total - missing
     unique_categories: int = \
         sum(1 for count in category_counts.values() if count > 0)
@@ -193,37 +206,35 @@ def anlz_by_category(col: pd.Series,
     return summary, counts
 
 
-def anlz_for_details(col: pd.Series,
+def anlz_for_details(col: pd.Series | ListCodes,
                      cfg: DictConfig,
-                     subjest: str
+                     subjest: str,
+                     compiled: taxo.CompiledTaxonomy | None = None
                      ) -> defaultdict[str, pd.Series]:
     """
     Get the data for separate the details of skills
     """
-    # Load taxonomy
-    taxonomy = sub.fetch_from_yaml(cfg.taxonomy_path,
-                                   cfg.taxonomy_files[subjest])
-
-    # Flatten skills column
-    clean_col = col.dropna().apply(lambda x: x if isinstance(x, list) else [])
-    flat_skills = list(chain.from_iterable(clean_col))
+    # Count the skills over their codes
+    skill_counts: pd.Series = _as_codes(col).counts()
     # Map skills to categories
-    skill_to_category = {}
-    for cat, skills in taxonomy.items():
-        for skill in skills:
-            skill_to_category[skill] = cat
+    skill_to_category: dict[str, str]
+    if compiled is not None:
+        skill_to_category = compiled.category_of[subjest]
+    else:
+        skill_to_category = {}
+        taxonomy = _get_taxonomy(cfg, subjest, compiled)
+        for cat, skills in taxonomy.items():
+            for skill in skills:
+                skill_to_category[skill] = cat
 
     # Count each skill, grouped under category
     nested_dict: defaultdict[str, defaultdict[str, int]] = \
         defaultdict(lambda: defaultdict(int))
-    for skill in flat_skills:
+    # The counts are already sorted in descending order
+    for skill, count in skill_counts.items():
         category: str | None = skill_to_category.get(skill)
         if category:
-            nested_dict[category][skill] += 1
-    # Sort each category's skills by count in descending order
-    for category, skills in nested_dict.items():
-        nested_dict[category] = \
-            dict(sorted(skills.items(), key=lambda x: x[1], reverse=True))
+            nested_dict[category][skill] = int(count)
     # Convert to defaultdict of Series
     dict_series: defaultdict[str, pd.Series] = defaultdict(
         pd.Series, {k: pd.Series(v) for k, v in nested_dict.items()}
@@ -231,9 +242,80 @@ def anlz_for_details(col: pd.Series,
     return dict_series
 
 
+def _get_taxonomy(cfg: DictConfig,
+                  subject: str,
+                  compiled: taxo.CompiledTaxonomy | None
+                  ) -> dict[str, list[str]]:
+    """The taxonomy of the subject, from the compiled one if given"""
+    if compiled is not None:
+        return compiled.taxonomy[subject]
+    return sub.fetch_from_yaml(cfg.taxonomy_path, cfg.taxonomy_files[subject])
+
+
+def _category_matrix(vocab: np.ndarray,
+                     taxonomy: dict[str, list[str]]
+                     ) -> sparse.csr_matrix:
+    """
+    The vocabulary x keys matrix, 1 if the item is in the list of
+    the key; an item may be in more than one key.
+    """
+    positions: pd.Index = pd.Index(vocab)
+    rows: list[np.ndarray] = [np.empty(0, dtype=np.int64)]
+    cols: list[np.ndarray] = [np.empty(0, dtype=np.int64)]
+    for col, items in enumerate(taxonomy.values()):
+        found: np.ndarray = positions.get_indexer(pd.unique(
+            np.asarray(items, dtype=object)))
+        found = found[found >= 0]
+        rows.append(found)
+        cols.append(np.full(len(found), col, dtype=np.int64))
+    row_idx: np.ndarray = np.concatenate(rows)
+    return sparse.csr_matrix(
+        (np.ones(len(row_idx), dtype=np.int64),
+         (row_idx, np.concatenate(cols))),
+        shape=(len(vocab), len(taxonomy)))
+
+
+def _as_codes(col: pd.Series | ListCodes) -> ListCodes:
+    """The codes of a column of lists"""
+    return col if isinstance(col, ListCodes) else ListCodes.from_series(col)
+
+
+def _clean_categorical(col: pd.Series) -> pd.Series:
+    """
+    Strip the categories and set the placeholders to NaN, over
+    the categories only and not over every row.
+    """
+    cats = pd.Index(col.cat.categories.astype(str).str.strip())
+    cats = cats.where(~cats.isin(PLACEHOLDERS))
+    new_codes, uniques = pd.factorize(cats)
+    # The code -1 of the NaN rows stays -1
+    codes: np.ndarray = np.append(new_codes, -1)[col.cat.codes.to_numpy()]
+    return pd.Series(pd.Categorical.from_codes(codes, uniques),
+                     index=col.index, name=col.name)
+
+
+def _count_categorical(col: pd.Series) -> pd.Series:
+    """
+    Count the categories over their codes, the same as the
+    value_counts of the strings: in the order they are first
+    seen, sorted by the count.
+    """
+    codes: np.ndarray = col.cat.codes.to_numpy()
+    codes = codes[codes >= 0]
+    present, first = np.unique(codes, return_index=True)
+    order: np.ndarray = present[np.argsort(first)]
+    counts: np.ndarray = np.bincount(
+        codes, minlength=len(col.cat.categories))[order]
+    return pd.Series(
+        counts,
+        index=pd.Index(col.cat.categories.to_numpy()[order], name=col.name),
+        name='count').sort_values(ascending=False)
+
+
 def anlz_for_job_skils(df: pd.DataFrame,
                        group_col: str,
-                       combine_col: str
+                       combine_col: str,
+                       codes: ListCodes | None = None
                        ) -> defaultdict[str, pd.Series]:
     """
     Group the DataFrame by the group_col and combine the
@@ -248,46 +330,48 @@ def anlz_for_job_skils(df: pd.DataFrame,
         group_col (str): The column to group by.
         combine_col (str): The column whose values will be
         combined and analyzed.
+        codes (ListCodes | None): The codes of the combine_col,
+        they are encoded if not given.
 
     Returns:
         pd.DataFrame: A DataFrame with grouped and analyzed
         skill statistics for each job.
     """
-    grouped: pd.DataFrame = _group_with_combine(df, group_col, combine_col)
-
-    # Analyze the combined skills for each job
+    if codes is None:
+        codes = ListCodes.from_series(df[combine_col])
+    title_codes, titles = _group_codes(df[group_col])
+
+    # The jobs x ads matrix times the ads x skills matrix
+    rows: np.ndarray = np.flatnonzero(title_codes >= 0)
+    by_job = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.int64), (title_codes[rows], rows)),
+        shape=(len(titles), len(title_codes)))
+    job_skills: sparse.csr_matrix = (by_job @ codes.incidence()).tocsr()
+    job_skills.sort_indices()
+
+    # Analyze the combined skills for each job, in the order of the jobs
     skill_analysis: defaultdict[str, pd.Series] = defaultdict(pd.Series)
-    for _, row in grouped.iterrows():
-        job_title = row[group_col]
+    present: np.ndarray = np.unique(title_codes[rows])
+    for title_code in sorted(present, key=lambda code: titles[code]):
+        job_title = titles[title_code]
         if job_title == 'nan':
             continue
-        skill_counts = pd.Series(row[combine_col]).value_counts()
-        skill_analysis[job_title] = skill_counts
+        row = slice(job_skills.indptr[title_code],
+                    job_skills.indptr[title_code + 1])
+        # The skills first seen in the table first for the same count
+        skill_analysis[job_title] = pd.Series(
+            job_skills.data[row],
+            index=pd.Index(codes.vocab[job_skills.indices[row]]),
+            name='count', dtype='int64').sort_values(
+                ascending=False, kind='stable')
 
     return skill_analysis
 
 
-def _group_with_combine(df: pd.DataFrame,
-                        group_col: str,
-                        combine_col: str
-                        ) -> pd.DataFrame:
-    """Group the DataFrame by the group_col and combine the
-    values in the combine_col into a list.
-
-    Args:
-        df (pd.DataFrame): The input DataFrame.
-        group_col (str): The column to group by.
-        combine_col (str): The column whose values will be
-        combined.
-
-    Returns:
-        pd.DataFrame: A DataFrame with grouped and combined
-        values.
-    """
-    grouped = df.groupby(group_col)[combine_col].apply(
-        lambda x: list(x.dropna())
-    ).reset_index()
-    grouped[combine_col] = grouped[combine_col].apply(
-        lambda x: list(chain.from_iterable(x))
-    )
-    return grouped
+def _group_codes(col: pd.Series) -> tuple[np.ndarray, np.ndarray]:
+    """The integer code of each row and the distinct values"""
+    if isinstance(col.dtype, pd.CategoricalDtype):
+        return col.cat.codes.to_numpy().astype(np.int64), \
+            col.cat.categories.to_numpy()
+    codes, uniques = pd.factorize(col)
+    return codes.astype(np.int64), np.asarray(uniques, dtype=object)
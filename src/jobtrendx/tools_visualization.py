@@ -369,3 +369,39 @@ class GridPlot:
 
         major_data['Other'] = other_series.groupby(other_series.index).sum()
         return major_data
+
+
+def plot_heatmap(table: pd.DataFrame,
+                 data_name: str,
+                 fout: str
+                 ) -> None:
+    """
+    Plot a square table, e.g., the lift of the pairs of the most
+    asked skills, as a heatmap; the diagonal is left empty.
+    """
+    mask = np.eye(len(table), dtype=bool)
+    size: float = max(6.0, 0.5 * len(table))
+    fig, ax = plt.subplots(figsize=(size + 2, size))
+    sns.heatmap(table, mask=mask, cmap='rocket_r', square=True,
+                linewidths=0.5, annot=len(table) <= 20, fmt='.1f',
+                cbar_kws={'shrink': 0.7}, ax=ax)
+    ax.set_title(data_name.capitalize(), loc='left', fontsize=16,
+                 weight='bold')
+    save_fig(fig, fout)
+
+
+def plot_trends(table: pd.DataFrame,
+                data_name: str,
+                fout: str
+                ) -> None:
+    """Plot each column of the table (by period) as a line"""
+    fig, ax = plt.subplots(figsize=(12, 6))
+    colors = sns.color_palette("tab10", n_colors=max(len(table.columns), 1))
+    for color, col in zip(colors, table.columns):
+        ax.plot(table.index, table[col], marker='o', label=col, color=color)
+    ax.yaxis.set_major_formatter(mpl.ticker.PercentFormatter(1.0))
+    ax.set_title(data_name.capitalize(), loc='left', fontsize=16,
+                 weight='bold')
+    ax.legend(loc="center left", bbox_to_anchor=(1, 0.5), frameon=False)
+    fig.autofmt_xdate()
+    save_fig(fig, fout)
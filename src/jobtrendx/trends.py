@@ -0,0 +1,242 @@
+"""
+Trends of the job ads over the dates of the emails.
+The ads are put in periods (weeks 'W' or months 'M') by their
+`date`, and for each period:
+  - ads:      the number of ads,
+  - skills:   the number of ads of each skill,
+  - titles:   the number of ads of each job title,
+  - salaries: the count, mean and median of the salaries.
+The tables are long (one row per period and item) and are kept
+as Parquet files in `store_dir`, one folder per frequency. On
+the next run only the periods from the last stored one are
+computed again (the last period may have got new emails); the
+older periods are kept, unless their number of ads changed or
+the key (the taxonomy and lexicon files) is not the same.
+
+16 Oct. 2026
+S. Amiri
+"""
+
+import os
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from . import logger
+from .compact import ListCodes
+from .tools_statistics import PLACEHOLDERS
+
+
+__all__ = [
+    'TrendStore',
+    'aggregate',
+]
+
+TABLES: tuple[str, ...] = ('ads', 'skills', 'titles', 'salaries')
+
+
+class TrendStore:
+    """The stored trend tables, updated with the new periods"""
+
+    __slots__: list[str] = ['store_dir', 'key', 'log']
+
+    store_dir: Path
+    key: str
+    log: logger.logging.Logger
+
+    def __init__(self,
+                 store_dir: str | Path,
+                 key: str,
+                 log: logger.logging.Logger
+                 ) -> None:
+        self.store_dir = Path(store_dir)
+        self.key = key
+        self.log = log
+
+    def update(self,
+               df_info: pd.DataFrame,
+               freq: str = 'M'
+               ) -> dict[str, pd.DataFrame]:
+        """
+        Compute the tables of the new periods and append them to
+        the stored ones.
+
+        Args:
+            df_info (pd.DataFrame): The cleaned table of the
+            emails, with the 'date' column.
+            freq (str): The length of the periods, 'W' or 'M'.
+
+        Returns:
+            dict[str, pd.DataFrame]: The tables of all the periods.
+        """
+        stored: dict[str, pd.DataFrame] | None = self._read(freq)
+        since: pd.Timestamp | None = None
+        if stored is not None:
+            since = _first_changed(stored['ads'], _periods(df_info, freq))
+        fresh: dict[str, pd.DataFrame] = aggregate(df_info, freq, since)
+        if stored is None or since is None:
+            tables = fresh
+        else:
+            tables = {
+                name: pd.concat([stored[name][stored[name]['period'] < since],
+                                 fresh[name]], ignore_index=True)
+                for name in TABLES}
+        self._write(freq, tables)
+        self.log.info(
+            f'\nTrends ({freq}): {len(tables["ads"])} periods, computed '
+            f'{"all" if since is None else "from " + str(since.date())}\n')
+        return tables
+
+    def _folder(self, freq: str) -> Path:
+        """The folder of the tables of the frequency"""
+        return self.store_dir / freq
+
+    def _read(self, freq: str) -> dict[str, pd.DataFrame] | None:
+        """The stored tables, None if missing or of another key"""
+        folder: Path = self._folder(freq)
+        key_file: Path = folder / 'key.json'
+        if not key_file.exists():
+            return None
+        with key_file.open('r', encoding='utf-8') as f_r:
+            if json.load(f_r).get('key') != self.key:
+                return None
+        if not all((folder / f'{name}.parquet').exists() for name in TABLES):
+            return None
+        return {name: pq.read_table(folder / f'{name}.parquet').to_pandas()
+                for name in TABLES}
+
+    def _write(self, freq: str, tables: dict[str, pd.DataFrame]) -> None:
+        """Save the tables and their key"""
+        folder: Path = self._folder(freq)
+        folder.mkdir(parents=True, exist_ok=True)
+        for name, table in tables.items():
+            tmp_file: Path = folder / f'{name}.tmp'
+            pq.write_table(pa.Table.from_pandas(table, preserve_index=False),
+                           tmp_file)
+            os.replace(tmp_file, folder / f'{name}.parquet')
+        (folder / 'key.json').write_text(json.dumps({'key': self.key}),
+                                         encoding='utf-8')
+
+
+def aggregate(df_info: pd.DataFrame,
+              freq: str = 'M',
+              since: pd.Timestamp | None = None
+              ) -> dict[str, pd.DataFrame]:
+    """
+    The trend tables of the ads with a date, grouped by period.
+
+    Args:
+        df_info (pd.DataFrame): The cleaned table of the emails.
+        freq (str): The length of the periods, 'W' or 'M'.
+        since (pd.Timestamp | None): Only the periods from this
+        one on.
+
+    Returns:
+        dict[str, pd.DataFrame]: The 'ads', 'skills', 'titles' and
+        'salaries' tables, with a 'period' column (its start).
+    """
+    periods: pd.Series = _periods(df_info, freq)
+    rows: np.ndarray = periods.notna().to_numpy()
+    if since is not None:
+        rows &= (periods >= since).to_numpy()
+    dated: pd.DataFrame = df_info[rows].set_index(
+        pd.DatetimeIndex(periods[rows], name='period'))
+
+    ads: pd.DataFrame = dated.groupby(level='period').size() \
+        .rename('ads').reset_index()
+    return {
+        'ads': ads,
+        'skills': _count_items(dated, 'skills', 'skill'),
+        'titles': _count_titles(dated),
+        'salaries': _salaries(dated),
+    }
+
+
+def _periods(df_info: pd.DataFrame, freq: str) -> pd.Series:
+    """The start of the period of each row, NaT without a date"""
+    if 'date' not in df_info.columns:
+        return pd.Series(pd.NaT, index=df_info.index,
+                         dtype='datetime64[ns]')
+    dates: pd.Series = pd.to_datetime(df_info['date'], utc=True)
+    return dates.dt.tz_convert(None).dt.to_period(freq).dt.start_time
+
+
+def _first_changed(stored_ads: pd.DataFrame,
+                   periods: pd.Series
+                   ) -> pd.Timestamp | None:
+    """
+    The first period to compute again: the last stored one, or an
+    older one if its number of ads is not the stored one. None if
+    nothing is stored.
+    """
+    if stored_ads.empty:
+        return None
+    counts: pd.Series = periods.dropna().value_counts()
+    stored: pd.Series = stored_ads.set_index('period')['ads']
+    last: pd.Timestamp = stored.index.max()
+    old: pd.Index = counts.index[counts.index < last].union(
+        stored.index[stored.index < last])
+    changed: pd.Index = old[
+        counts.reindex(old, fill_value=0).to_numpy() !=
+        stored.reindex(old, fill_value=0).to_numpy()]
+    return min(changed.min(), last) if len(changed) else last
+
+
+def _count_items(dated: pd.DataFrame,
+                 col: str,
+                 name: str
+                 ) -> pd.DataFrame:
+    """The number of ads of each item of a list column by period"""
+    columns: list[str] = ['period', name, 'count']
+    if col not in dated.columns:
+        return pd.DataFrame(columns=columns)
+    codes: ListCodes = ListCodes.from_series(dated[col])
+    real: np.ndarray = ~pd.Index(codes.vocab).isin(PLACEHOLDERS)
+    valid: np.ndarray = codes.codes >= 0
+    valid[valid] = real[codes.codes[valid]]
+    rows: np.ndarray = codes.row_ids()[valid]
+    # An ad repeating an item is counted once
+    items = pd.DataFrame({'row': rows, 'code': codes.codes[valid]}) \
+        .drop_duplicates()
+    counts: pd.Series = items.groupby(
+        [dated.index.to_numpy()[items['row'].to_numpy()],
+         items['code'].to_numpy()]).size()
+    table = pd.DataFrame({
+        'period': counts.index.get_level_values(0),
+        name: codes.vocab[counts.index.get_level_values(1).to_numpy()],
+        'count': counts.to_numpy(),
+    })
+    return table.sort_values(['period', name], ignore_index=True)
+
+
+def _count_titles(dated: pd.DataFrame) -> pd.DataFrame:
+    """The number of ads of each job title by period"""
+    columns: list[str] = ['period', 'job_title', 'count']
+    if 'job_title' not in dated.columns:
+        return pd.DataFrame(columns=columns)
+    titles: pd.Series = dated['job_title'].astype(str).str.strip()
+    titles = titles[~titles.isin(PLACEHOLDERS)]
+    return titles.groupby([titles.index, titles]).size().rename('count') \
+        .rename_axis(['period', 'job_title']).reset_index()
+
+
+def _salaries(dated: pd.DataFrame) -> pd.DataFrame:
+    """The count, mean and median of the salaries by period"""
+    tables: list[pd.DataFrame] = []
+    for col in ('salary_min', 'salary_max'):
+        if col not in dated.columns:
+            continue
+        # The "Nan" placeholders are not numbers
+        values: pd.Series = pd.to_numeric(dated[col], errors='coerce')
+        # The zeros are not salaries, as in the statistics
+        values = values[values.notna() & (values != 0)]
+        stats: pd.DataFrame = values.groupby(level='period').agg(
+            ['count', 'mean', 'median'])
+        tables.append(stats.add_prefix(f'{col}_'))
+    if not tables:
+        return pd.DataFrame(columns=['period'])
+    return pd.concat(tables, axis=1).rename_axis('period').reset_index()
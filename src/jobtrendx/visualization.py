@@ -19,14 +19,20 @@ class Visualizer:
     # pylint: disable=broad-exception-caught
     # pylint: disable=too-few-public-methods
 
-    __slots__ = ['stats']
+    __slots__ = ['stats', 'heatmap_size', 'trend_size']
 
     stats: statistics.StatisticsManager
+    heatmap_size: int
+    trend_size: int
 
     def __init__(self,
-                 stats: statistics.StatisticsManager
+                 stats: statistics.StatisticsManager,
+                 heatmap_size: int = 20,
+                 trend_size: int = 8
                  ) -> None:
         self.stats = stats
+        self.heatmap_size = heatmap_size
+        self.trend_size = trend_size
 
     def primary_plots(self,
                       log: logger.logging.Logger
@@ -37,6 +43,8 @@ class Visualizer:
         self._skills_category(log)
         self._skills_detail(log)
         self._skills_job_needed(log)
+        self._skills_pairs(log)
+        self._skills_trend(log)
 
     def _job_titles(self,
                     log: logger.logging.Logger
@@ -114,4 +122,37 @@ class Visualizer:
                                 angle_threshold=15,
                                 fout='skill_per_job')
         except Exception as err:
-                log.info(f'\nNot posssible to plot `Skills per job`!\n{err}')
\ No newline at end of file
+                log.info(f'\nNot posssible to plot `Skills per job`!\n{err}')
+
+    def _skills_pairs(self,
+                      log: logger.logging.Logger
+                      ) -> None:
+        """plot the lift of the pairs of the most asked skills"""
+        try:
+            top: list[str] = \
+                self.stats.skills_count.index[:self.heatmap_size].tolist()
+            tools.plot_heatmap(
+                self.stats.skills_cooccurrence.frame(top, measure='lift'),
+                data_name='skills asked together (lift)',
+                fout='skills_pairs')
+        except Exception as err:
+            log.info(f'\nNot posssible to plot `Skills pairs`!\n{err}')
+
+    def _skills_trend(self,
+                      log: logger.logging.Logger
+                      ) -> None:
+        """plot the share of the ads of the top skills by month"""
+        try:
+            tables: dict[str, pd.DataFrame] = self.stats.trends['M']
+            top: list[str] = \
+                self.stats.skills_count.index[:self.trend_size].tolist()
+            counts: pd.DataFrame = tables['skills'].pivot(
+                index='period', columns='skill', values='count')
+            ads: pd.Series = tables['ads'].set_index('period')['ads']
+            share: pd.DataFrame = counts.reindex(
+                index=ads.index, columns=top).fillna(0).div(ads, axis=0)
+            tools.plot_trends(share,
+                              data_name='share of the ads by month',
+                              fout='skills_trend')
+        except Exception as err:
+            log.info(f'\nNot posssible to plot `Skills trend`!\n{err}')
@@ -0,0 +1,197 @@
+"""
+Testing the mergeable accumulators of the statistics
+"""
+
+import numpy as np
+import pandas as pd
+
+from jobtrendx import accumulators
+from jobtrendx import tools_statistics
+
+# The sketches of the tables below are not compacted, so their
+# quantiles are exact
+SKETCH_K: int = 1_000
+
+
+def _df_info(nr_rows: int = 400, seed: int = 0) -> pd.DataFrame:
+    """Random ads, with missing titles, skills and salaries"""
+    rng = np.random.default_rng(seed)
+    skills = np.array(["Python", "SQL", "Docker", "Java", "nan"])
+    salaries = rng.integers(3, 12, size=nr_rows).astype(float) * 10_000
+    return pd.DataFrame({
+        "file_path": [f"{i}.eml" for i in range(nr_rows)],
+        "job_title": rng.choice(
+            ["Data Scientist", "Data Engineer", "nan"], size=nr_rows),
+        "skills": [list(rng.choice(skills, size=rng.integers(0, 4)))
+                   if i % 7 else np.nan for i in range(nr_rows)],
+        "language": [["English"] if i % 3 else ["English", "German"]
+                     for i in range(nr_rows)],
+        "location": [["Berlin", "Munich"] if i % 2 else ["Berlin"]
+                     for i in range(nr_rows)],
+        "salary_min": [x if i % 5 else "Nan"
+                       for i, x in enumerate(salaries)],
+        "salary_max": [x + 5_000 if i % 4 else 0.0
+                       for i, x in enumerate(salaries)],
+    })
+
+
+def _assert_full(acc: accumulators.StatisticsAccumulator,
+                 df_info: pd.DataFrame
+                 ) -> None:
+    """The accumulators have the statistics of the whole table"""
+    _, skills = tools_statistics.anlz_list_cols(df_info["skills"])
+    _, titles = tools_statistics.anlz_string_cols(df_info["job_title"])
+    assert acc.counters["skills"].top().to_dict() == skills.to_dict()
+    assert acc.counters["job_title"].top().to_dict() == titles.to_dict()
+    for col in ("salary_min", "salary_max"):
+        _, stats = tools_statistics.anlz_numerical_cols(df_info[col])
+        described = acc.numbers[col].describe()
+        np.testing.assert_allclose(described.to_numpy(), stats.to_numpy())
+
+
+def test_update_counts_new_rows() -> None:
+    """Counting the new rows only is the same as counting all"""
+    df_info = _df_info()
+    acc = accumulators.StatisticsAccumulator(sketch_k=SKETCH_K)
+    assert acc.update(df_info.iloc[:300], chunk_size=64) == 300
+    assert acc.update(df_info, chunk_size=64) == 100
+    assert acc.update(df_info) == 0
+    _assert_full(acc, df_info)
+
+
+def test_removed_rows_count_again() -> None:
+    """Without some of the counted rows, everything is counted again"""
+    df_info = _df_info()
+    acc = accumulators.StatisticsAccumulator(sketch_k=SKETCH_K)
+    acc.update(df_info)
+    assert acc.update(df_info.iloc[50:]) == 350
+    _assert_full(acc, df_info.iloc[50:])
+
+
+def test_update_new_files() -> None:
+    """
+    With the new files, only their rows are counted; if counted
+    rows are gone, everything is counted again
+    """
+    df_info = _df_info()
+    acc = accumulators.StatisticsAccumulator(sketch_k=SKETCH_K)
+    assert acc.update(df_info.iloc[:300], new_files=[]) == 300
+    new_files = df_info["file_path"].iloc[300:].tolist()
+    assert acc.update(df_info, chunk_size=64, new_files=new_files) == 100
+    _assert_full(acc, df_info)
+    assert acc.update(df_info, new_files=[]) == 0
+    assert acc.update(df_info) == 0
+    assert acc.update(df_info.iloc[50:], new_files=[]) == 350
+    _assert_full(acc, df_info.iloc[50:])
+
+
+def test_update_new_files_resurfaced() -> None:
+    """
+    The rows are told apart by the counted files, not by their
+    number: a counted file removed while a dropped one comes back
+    counts everything again, a file which comes back is counted
+    """
+    df_info = _df_info()
+    acc = accumulators.StatisticsAccumulator(sketch_k=SKETCH_K)
+    # The 300th row was dropped as a near duplicate
+    assert acc.update(df_info.iloc[:299], new_files=[]) == 299
+    # The first file is removed, the 300th comes back, one is new
+    table = df_info.iloc[1:301]
+    assert acc.update(table, new_files=[df_info.loc[300, "file_path"]]) \
+        == 300
+    _assert_full(acc, table)
+
+    acc = accumulators.StatisticsAccumulator(sketch_k=SKETCH_K)
+    acc.update(df_info.drop(index=150).iloc[:299], new_files=[])
+    assert acc.update(df_info.iloc[:301],
+                      new_files=[df_info.loc[300, "file_path"]]) == 2
+    _assert_full(acc, df_info.iloc[:301])
+    # A counted file which changed is counted again with the others
+    assert acc.update(df_info.iloc[:301],
+                      new_files=[df_info.loc[0, "file_path"]]) == 301
+
+
+def test_merge_shards() -> None:
+    """The merge of the accumulators of two shards is the whole"""
+    df_info = _df_info()
+    first = accumulators.StatisticsAccumulator(sketch_k=SKETCH_K)
+    first.update(df_info.iloc[:150])
+    second = accumulators.StatisticsAccumulator(sketch_k=SKETCH_K)
+    second.update(df_info.iloc[150:])
+    first.merge(second)
+    _assert_full(first, df_info)
+    assert first.update(df_info) == 0
+
+
+def test_save_load(tmp_path) -> None:
+    """The stored accumulators are loaded only with the same key"""
+    path = tmp_path / "statistics.pkl"
+    acc = accumulators.StatisticsAccumulator(key="k", sketch_k=SKETCH_K)
+    acc.update(_df_info())
+    acc.save(path)
+    loaded = accumulators.StatisticsAccumulator.load(
+        path, key="k", sketch_k=SKETCH_K)
+    assert loaded.counters["skills"].counts == acc.counters["skills"].counts
+    assert loaded.update(_df_info()) == 0
+    other = accumulators.StatisticsAccumulator.load(
+        path, key="other", sketch_k=SKETCH_K)
+    assert other.numbers["salary_min"].count == 0
+
+
+def test_grouped_numbers() -> None:
+    """The salaries of each job title and region, in one pass"""
+    df_info = _df_info()
+    acc = accumulators.StatisticsAccumulator(sketch_k=SKETCH_K)
+    acc.update(df_info.iloc[:250])
+    acc.update(df_info)
+    by_title = acc.groups["job_title"].table()["salary_max"]
+    assert set(by_title.index) == {"Data Engineer", "Data Scientist"}
+    for title, rows in df_info.groupby("job_title"):
+        if title == "nan":
+            continue
+        _, stats = tools_statistics.anlz_numerical_cols(rows["salary_max"])
+        np.testing.assert_allclose(by_title.loc[title].to_numpy(),
+                                   stats.to_numpy())
+    by_region = acc.groups["location"].table()["salary_min"]
+    assert by_region.loc["Berlin", "count"] == \
+        acc.numbers["salary_min"].count
+    _, stats = tools_statistics.anlz_numerical_cols(
+        df_info["salary_min"].iloc[1::2])
+    np.testing.assert_allclose(by_region.loc["Munich"].to_numpy(),
+                               stats.to_numpy())
+
+
+def test_sketch_quantiles() -> None:
+    """The sketch is exact for a few numbers, close for many"""
+    rng = np.random.default_rng(3)
+    values = rng.normal(size=100)
+    sketch = accumulators.QuantileSketch(k=200)
+    sketch.update(values)
+    np.testing.assert_allclose(sketch.quantiles([0.25, 0.5]),
+                               np.quantile(values, [0.25, 0.5]))
+
+    values = rng.uniform(size=200_000)
+    sketch = accumulators.QuantileSketch(k=200)
+    for chunk in np.array_split(values, 20):
+        sketch.update(chunk)
+    assert sum(len(level) for level in sketch.levels) < 1_000
+    # A uniform number is its rank
+    assert 0 < sketch.rank_error() < 0.02
+    np.testing.assert_allclose(sketch.quantiles([0.1, 0.5, 0.9]),
+                               [0.1, 0.5, 0.9], atol=sketch.rank_error())
+
+
+def test_sketch_compaction_boundary() -> None:
+    """The quantiles do not jump when the first level is compacted"""
+    for seed in range(4):
+        for nr_values in (199, 200, 201):
+            values = np.arange(nr_values, dtype=float)
+            sketch = accumulators.QuantileSketch(k=200, seed=seed)
+            sketch.update(values)
+            assert (len(sketch.levels) > 1) == (nr_values >= 200)
+            # Within one of the exact ones: a compacted number stands
+            # for two ranks
+            np.testing.assert_allclose(
+                sketch.quantiles(tools_statistics.PERCENTILES),
+                np.quantile(values, tools_statistics.PERCENTILES),
+                atol=1.0)
@@ -0,0 +1,73 @@
+"""
+Testing the analysis of the emails, in one batch and streamed
+"""
+
+from pathlib import Path
+from email.message import EmailMessage
+
+import pandas as pd
+from omegaconf import DictConfig, OmegaConf
+
+from jobtrendx import logger
+from jobtrendx.analysis import AnalysisEmails
+from jobtrendx.email_processor import EmailProcessor
+
+
+PACKAGE: Path = Path(__file__).resolve().parents[1] / "src" / "jobtrendx"
+
+
+def _cfg(tmp_path: Path) -> DictConfig:
+    """The config of the package, with its files in tmp_path"""
+    cfg = OmegaConf.load(PACKAGE / "conf" / "config.yaml")
+    cfg.defaults = {
+        name: OmegaConf.load(PACKAGE / "conf" / "defaults" / f"{name}.yaml")
+        for name in ["email_processing", "paths", "analysis"]}
+    cfg.taxonomy_path = str(PACKAGE / "taxonomy")
+    cfg.lexicon_path = str(PACKAGE / "lexicon")
+    for name in ["cache", "lang_cache", "title_cache", "stream_spool"]:
+        cfg.defaults.paths[name] = str(tmp_path / "store" / name)
+    return cfg
+
+
+def _write_emails(directory: Path, count: int) -> None:
+    """Job alerts with a title, sections and a salary"""
+    directory.mkdir()
+    titles = ["Data Scientist", "Data Engineer", "Python Developer"]
+    for i in range(count):
+        msg = EmailMessage()
+        msg["Subject"] = f"Neue Jobs {i}"
+        msg["Date"] = f"Tue, {i + 1:02d} Jan 2024 08:00:00 +0100"
+        msg.set_content(
+            f"{titles[i % 3]} (m/w/d)\nFirma {i}\nBerlin\n\n"
+            "Das wird dein Job\nPython, SQL und Docker\n\n"
+            "Das bringst du mit\nSehr gute Deutschkenntnisse\n"
+            f"{50 + i}.000 € - {60 + i}.000 €/Jahr\n"
+            "geschätzt für Vollzeit\n\n"
+            "Diesen Job melden\n[URL]\n")
+        (directory / f"alert{i}.eml").write_bytes(msg.as_bytes())
+
+
+def test_stream_same_as_batch(tmp_path) -> None:
+    """Streaming in chunks gives the df_info of one batch"""
+    _write_emails(tmp_path / "emails", 5)
+    cfg = _cfg(tmp_path)
+    log = logger.setup_logger(str(tmp_path / "test.log"))
+
+    processor = EmailProcessor(eml_dir=str(tmp_path / "emails"), log=log,
+                               fast=True)
+    processor.execute()
+    batch = AnalysisEmails(eml_dict=processor.eml_dict, cfg=cfg)
+    batch.analyzing(log=log)
+
+    processor = EmailProcessor(eml_dir=str(tmp_path / "emails"), log=log,
+                               fast=True)
+    stream = AnalysisEmails(eml_dict={}, cfg=cfg)
+    stream.analyzing_stream(processor.iter_eml(stream_size=2), log=log)
+
+    assert processor.nr_processed == 5
+    assert len(batch.df_info) == 5
+    pd.testing.assert_frame_equal(stream.df_info, batch.df_info)
+    # The part files of the chunks are removed
+    assert not any((tmp_path / "store" / "stream_spool").iterdir())
+    assert sorted(batch.df_info["salary_min"]) == [
+        50000.0, 51000.0, 52000.0, 53000.0, 54000.0]
@@ -6,10 +6,8 @@ import unittest
 import pandas as pd
 from jobtrendx.clean_dataframe import (
     remove_duplicate,
+    row_fingerprints,
     _get_list_columns,
-    _convert_list_to_string,
-    _drop_duplicates,
-    _convert_strings_to_lists,
     set_languages
 )
 
@@ -33,29 +31,22 @@ class TestRemoveDuplicate(unittest.TestCase):
         list_cols = _get_list_columns(self.df)
         self.assertListEqual(list_cols, ["skills"])
 
-    def test_convert_list_to_string(self):
-        """Test if _convert_list_to_string correctly converts
-        lists to strings."""
-        list_cols = ["skills"]
-        df_converted = _convert_list_to_string(self.df.copy(), list_cols)
-        expected = ["Python-SQL", "Python-SQL", "Java", "Python"]
-        self.assertListEqual(df_converted["skills"].tolist(), expected)
-
-    def test_drop_duplicates(self):
-        """Test if _drop_duplicates correctly removes duplicate
-        rows."""
-        df_converted = _convert_list_to_string(self.df.copy(), ["skills"])
-        df_deduplicated = _drop_duplicates(df_converted)
-        self.assertEqual(len(df_deduplicated), 3)
-
-    def test_convert_strings_to_lists(self):
-        """Test if _convert_strings_to_lists correctly
-        converts strings back to lists."""
-        list_cols = ["skills"]
-        df_converted = _convert_list_to_string(self.df.copy(), list_cols)
-        df_reverted = _convert_strings_to_lists(df_converted, list_cols)
-        expected = [["Python", "SQL"], ["Python", "SQL"], ["Java"], ["Python"]]
-        self.assertListEqual(df_reverted["skills"].tolist(), expected)
+    def test_row_fingerprints(self):
+        """Test if the same rows, with any file_path, hash the same."""
+        fingerprints = row_fingerprints(self.df, exclude=["file_path"])
+        self.assertEqual(str(fingerprints.dtype), "uint64")
+        self.assertEqual(fingerprints[0], fingerprints[1])
+        self.assertEqual(fingerprints.nunique(), 3)
+        self.assertTrue(fingerprints.equals(
+            row_fingerprints(self.df.copy(), exclude=["file_path"])))
+
+    def test_fingerprints_ignore_list_order(self):
+        """Test if the order of the list items is not relevant."""
+        df = pd.DataFrame({"skills": [["SQL", "Python"], ["Python", "SQL"],
+                                      ["Python", "SQL", "R"]]})
+        fingerprints = row_fingerprints(df)
+        self.assertEqual(fingerprints[0], fingerprints[1])
+        self.assertNotEqual(fingerprints[0], fingerprints[2])
 
     def test_remove_duplicate(self):
         """Test the full remove_duplicate function."""
@@ -67,6 +58,37 @@ class TestRemoveDuplicate(unittest.TestCase):
         self.assertListEqual(df_cleaned["job_title"].tolist(),
                              expected_job_titles)
 
+    def test_remove_duplicate_keeps_dashes(self):
+        """Test if the terms with a dash are kept as they are."""
+        df = pd.DataFrame({
+            "file_path": ["file1", "file2", "file3"],
+            "skills": [["scikit-learn"], ["scikit-learn"],
+                       ["scikit", "learn"]],
+            "city": [["Baden-Baden"], ["Baden-Baden"], ["Baden-Baden"]],
+        })
+        df_cleaned = remove_duplicate(df)
+        self.assertListEqual(df_cleaned["skills"].tolist(),
+                             [["scikit-learn"], ["scikit", "learn"]])
+        self.assertListEqual(df_cleaned["city"].tolist(),
+                             [["Baden-Baden"], ["Baden-Baden"]])
+
+    def test_remove_duplicate_other_date(self):
+        """Test if the same ad sent on another date is a duplicate."""
+        df = self.df.copy()
+        df["date"] = pd.to_datetime(["2024-01-05", "2024-02-09",
+                                     "2024-01-05", "2024-01-05"], utc=True)
+        df_cleaned = remove_duplicate(df)
+        self.assertEqual(len(df_cleaned), 3)
+        self.assertEqual(df_cleaned["date"][0],
+                         pd.Timestamp("2024-01-05", tz="UTC"))
+
+    def test_remove_duplicate_other_spans(self):
+        """Test if the same ad in another layout is a duplicate."""
+        df = self.df.copy()
+        df["requirements_span"] = [(0, 10), (4, 20), None, (0, 10)]
+        df_cleaned = remove_duplicate(df)
+        self.assertEqual(len(df_cleaned), 3)
+
 
 class TestSetLanguages(unittest.TestCase):
     """test for seting the language"""
@@ -0,0 +1,71 @@
+"""
+Testing the categorical and the coded list columns
+"""
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from jobtrendx import compact
+
+
+def _skills() -> pd.Series:
+    """A column of lists with an empty list and a missing cell"""
+    return pd.Series([["Python", "SQL"], [], np.nan, ["SQL", "Docker"],
+                      ["Python"]])
+
+
+def test_round_trip() -> None:
+    """The lists are decoded as they were encoded"""
+    codes = compact.ListCodes.from_series(_skills())
+    assert len(codes) == 5
+    assert codes.lengths.tolist() == [2, 0, 0, 2, 1]
+    assert codes.missing.tolist() == [False, False, True, False, False]
+    decoded = codes.to_series()
+    assert decoded[0] == ["Python", "SQL"]
+    assert decoded[1] == []
+    assert np.isnan(decoded[2])
+
+
+def test_counts_as_value_counts() -> None:
+    """The bincount of the codes gives the value_counts"""
+    codes = compact.ListCodes.from_series(_skills())
+    flat = pd.Series(["Python", "SQL", "SQL", "Docker", "Python"])
+    pd.testing.assert_series_equal(codes.counts(), flat.value_counts(),
+                                   check_index_type=False)
+    assert codes.row_ids().tolist() == [0, 0, 3, 3, 4]
+
+
+def test_incidence() -> None:
+    """The rows x vocabulary matrix, without the NaN items"""
+    codes = compact.ListCodes.from_series(
+        pd.Series([["Python", np.nan, "Python"], ["SQL"], np.nan]))
+    matrix = codes.incidence()
+    assert matrix.shape == (3, 2)
+    assert matrix.toarray().tolist() == [[2, 0], [0, 1], [0, 0]]
+    assert codes.incidence() is matrix
+    assert compact.column_sums(matrix).tolist() == [2, 1]
+
+
+def test_from_arrow() -> None:
+    """The Arrow list column gives the same rows"""
+    array = pa.array([["Python", "SQL"], [], None, ["SQL", "Docker"],
+                      ["Python"]], type=pa.list_(pa.string()))
+    codes = compact.ListCodes.from_arrow(array.slice(1))
+    assert codes.missing.tolist() == [False, True, False, False]
+    assert codes.to_series().tolist()[3] == ["Python"]
+    assert codes.counts().to_dict() == {"SQL": 1, "Docker": 1, "Python": 1}
+
+
+def test_categorize() -> None:
+    """Only the repeated strings become categories"""
+    df_info = pd.DataFrame({
+        "file_path": ["a.eml", "b.eml", "c.eml", "d.eml"],
+        "eml_lang": ["de", "en", "de", "de"],
+        "skills": [["Python"], [], ["SQL"], ["Python"]],
+    })
+    df_cat = compact.categorize(df_info)
+    assert isinstance(df_cat["eml_lang"].dtype, pd.CategoricalDtype)
+    assert df_cat["file_path"].dtype == object
+    assert df_info["eml_lang"].dtype == object
+    assert list(compact.encode_lists(df_cat)) == ["skills"]
@@ -0,0 +1,52 @@
+"""
+Testing the pairs of the skills asked together
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from jobtrendx import compact
+from jobtrendx.cooccurrence import CoOccurrence
+
+
+def _pairs(min_count: int = 1, block_size: int = 100_000) -> CoOccurrence:
+    """The pairs of a few ads, one repeats a skill and one is NaN"""
+    skills = pd.Series([
+        ["Python", "SQL"], ["Python", "SQL", "Docker", "SQL"],
+        ["Docker", "Kubernetes"], ["Docker", "Kubernetes", "Python"],
+        ["SQL"], np.nan])
+    codes = compact.ListCodes.from_series(skills)
+    return CoOccurrence.from_incidence(codes.incidence(), codes.vocab,
+                                       min_count=min_count,
+                                       block_size=block_size)
+
+
+def test_pair_counts() -> None:
+    """The number of ads of each skill and of each pair"""
+    pairs = _pairs()
+    assert pairs.ads.tolist() == [3, 3, 3, 2]
+    assert pairs.pairs.toarray().tolist() == [
+        [0, 2, 2, 1], [2, 0, 1, 0], [2, 1, 0, 2], [1, 0, 2, 0]]
+    blocks = _pairs(block_size=2)
+    assert (blocks.pairs != pairs.pairs).nnz == 0
+
+
+def test_lift_and_pmi() -> None:
+    """Docker and Kubernetes are asked together twice the chance"""
+    pairs = _pairs()
+    table = pairs.frame(["Docker", "Kubernetes", "Missing"])
+    assert table.loc["Docker", "Kubernetes"] == pytest.approx(2.0)
+    assert list(table.index) == ["Docker", "Kubernetes"]
+    assert pairs.pmi()[2, 3] == pytest.approx(1.0)
+
+
+def test_top_k() -> None:
+    """The best pairs of each skill, the rare pairs dropped"""
+    top = _pairs(min_count=2).top_k(k=1, measure="lift")
+    assert top[["skill", "other"]].values.tolist() == [
+        ["Python", "SQL"], ["SQL", "Python"], ["Docker", "Kubernetes"],
+        ["Kubernetes", "Docker"]]
+    assert top["count"].tolist() == [2, 2, 2, 2]
+    with pytest.raises(ValueError):
+        _pairs().top_k(measure="jaccard")
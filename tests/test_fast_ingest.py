@@ -0,0 +1,82 @@
+"""
+Testing the fast reading of the .eml files
+"""
+
+from pathlib import Path
+from email.message import EmailMessage
+
+from jobtrendx.fast_ingest import read_eml
+from jobtrendx.tools_analysis import extract_email_detail
+from jobtrendx.tools_processor import returns_email_contant, \
+    returns_email_contant_parallel
+
+
+def _alert(directory: Path) -> Path:
+    """An alert with encoded headers, base64 text, html and attachments"""
+    msg = EmailMessage()
+    msg["Subject"] = "Neue Jobs für dich in München"
+    msg["From"] = "Jörg Müller <jobs@example.de>"
+    msg["To"] = "me@example.com, \"Doe, J\" <j@example.com>"
+    msg["Date"] = "Tue, 02 Jan 2024 08:00:00 +0100"
+    msg["Message-ID"] = "<1@example.de>"
+    msg.set_content("Data Scientist (m/w/d)\n50.000 - 60.000 €/Jahr\n",
+                    cte="base64")
+    msg.add_alternative("<p>Data Scientist</p>", subtype="html")
+    msg.add_attachment(b"%PDF", maintype="application", subtype="pdf",
+                       filename="cv.pdf")
+    msg.add_attachment("Grüße", filename="nötes.txt")
+    path = directory / "alert.eml"
+    path.write_bytes(msg.as_bytes())
+    return path
+
+
+def test_same_details(tmp_path) -> None:
+    """The fast details are the ones of the parsed EmailMessage"""
+    path = _alert(tmp_path)
+    expected = extract_email_detail(returns_email_contant([path]))[path]
+    details = read_eml(path)
+    assert details == expected
+    assert details["attachments"] == ["cv.pdf", "nötes.txt"]
+    assert extract_email_detail({path: details})[path] is details
+
+
+def test_first_plain_text(tmp_path) -> None:
+    """The text part is taken even after the html part, CRLF or not"""
+    msg = EmailMessage()
+    msg["Subject"] = "html first"
+    msg.set_content("<p>Grüße</p>", subtype="html")
+    msg.add_alternative("Grüße\naus Berlin\n", cte="quoted-printable")
+    path = tmp_path / "html.eml"
+    path.write_bytes(msg.as_bytes(policy=msg.policy.clone(linesep="\r\n")))
+    details = read_eml(path)
+    assert details["payload"] == "Grüße\naus Berlin\n"
+    assert details["attachments"] == []
+    assert details["date"] is None
+
+
+def test_html_first_differs(tmp_path) -> None:
+    """
+    On purpose, the payload of an html-first email is its text
+    part; the parsed EmailMessage gives its first part, the html
+    """
+    msg = EmailMessage()
+    msg["Subject"] = "html first"
+    msg.set_content("<p>Hallo</p>", subtype="html")
+    msg.add_alternative("Hallo\naus Berlin\n")
+    path = tmp_path / "html.eml"
+    path.write_bytes(msg.as_bytes())
+    parsed = extract_email_detail(returns_email_contant([path]))[path]
+    assert parsed["payload"] == "<p>Hallo</p>\n"
+    assert read_eml(path)["payload"] == "Hallo\naus Berlin\n"
+
+
+def test_fast_parallel(tmp_path) -> None:
+    """The fast reading in a pool keeps the order of the paths"""
+    paths = [_alert(tmp_path)]
+    for i in range(4):
+        paths.append(tmp_path / f"copy{i}.eml")
+        paths[-1].write_bytes(paths[0].read_bytes())
+    parallel = returns_email_contant_parallel(paths, n_workers=2,
+                                              chunk_size=2, fast=True)
+    assert list(parallel) == paths
+    assert list(parallel.values()) == [read_eml(path) for path in paths]
@@ -0,0 +1,44 @@
+"""
+Testing the fuzzy unification of the terms
+"""
+
+from jobtrendx.fuzzy import FuzzyIndex, edit_distance, normalize
+
+LEXICON: dict[str, str] = {
+    "Data Scientist": "Data Scientist",
+    "Datenwissenschaftler": "Data Scientist",
+    "Data Engineer": "Data Engineer",
+    "Data Analyst": "Data Analyst",
+    "Datenanalyst": "Data Analyst",
+}
+
+
+def test_edit_distance() -> None:
+    """The distance is exact up to the bound, bound + 1 above it"""
+    assert edit_distance("kitten", "sitting", 3) == 3
+    assert edit_distance("kitten", "sitting", 2) == 3
+    assert edit_distance("", "abc", 5) == 3
+    assert edit_distance("data", "data", 0) == 0
+    assert normalize(" Data-Scientist_(m/w/d) ") == "data scientist m w d"
+
+
+def test_resolve_variants() -> None:
+    """The variants, the typos and the other forms take their key"""
+    index = FuzzyIndex(LEXICON, max_distance=2, max_ratio=0.15)
+    assert index.resolve("Datenwissenschaftlerin") == "Data Scientist"
+    assert index.resolve("Data-Scientist") == "Data Scientist"
+    assert index.resolve("data scinetist") == "Data Scientist"
+    assert index.resolve("Data Enginer") == "Data Engineer"
+    # Too far, or too short for an edit
+    assert index.resolve("Senior Data Scientist") is None
+    assert index.resolve("Data") is None
+    assert index.resolve_all(["Datenanalystin", "Java", float("nan")]) == \
+        {"Datenanalystin": "Data Analyst"}
+
+
+def test_ambiguous_variants() -> None:
+    """A term as close to the variants of two keys takes none"""
+    index = FuzzyIndex({"Data Analyst": "Analyst",
+                        "Data Analyse": "Analysis"})
+    assert index.resolve("Data Analyss") is None
+    assert index.resolve("Data Analystt") == "Analyst"
@@ -0,0 +1,64 @@
+"""
+Testing the memoized language detection
+"""
+
+from unittest import mock
+
+import pytest
+import pandas as pd
+
+from jobtrendx import language_detector
+from jobtrendx.language_detector import LanguageDetector, stopword_language
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("We are looking for you and your skills in the team of our "
+     "company, with the best tools.", "en"),
+    ("Wir suchen dich für unser Team und du bist mit der Erfahrung "
+     "in der Entwicklung auf dem Weg.", "de"),
+    ("Python SQL Docker", None),
+    ("the und the und", None),
+])
+def test_stopword_language(text: str, expected: str | None) -> None:
+    """Only a clear majority of stopwords decides the language"""
+    assert stopword_language(text) == expected
+
+
+def test_ambiguous_bodies_use_langdetect() -> None:
+    """The full detector only runs for the ambiguous prefixes"""
+    bodies = pd.Series(["Python SQL Docker", "Python SQL Docker",
+                        "we are the team and you are with us"])
+    detector = LanguageDetector()
+    with mock.patch.object(language_detector, "_full_language",
+                           return_value="de") as full:
+        langs = detector.detect(bodies)
+    assert langs.tolist() == ["de", "de", "en"]
+    full.assert_called_once_with("Python SQL Docker")
+
+
+def test_memo_is_kept_between_runs(tmp_path) -> None:
+    """A saved memo answers the known bodies without detecting"""
+    cache_file = tmp_path / "cache" / "languages.json"
+    bodies = pd.Series(["Python SQL Docker", "Java Rust Go"])
+    detector = LanguageDetector(cache_file=cache_file)
+    with mock.patch.object(language_detector, "_full_language",
+                           return_value="en"):
+        first = detector.detect(bodies)
+    detector.save()
+
+    detector = LanguageDetector(cache_file=cache_file)
+    with mock.patch.object(language_detector, "_full_language") as full:
+        second = detector.detect(bodies)
+    full.assert_not_called()
+    assert second.tolist() == first.tolist()
+    assert detector.stats["cached"] == 2
+
+
+def test_only_prefix_is_used() -> None:
+    """Bodies with the same prefix share the same language"""
+    prefix = "Wir suchen dich für unser Team und du bist mit der Zeit"
+    bodies = pd.Series([prefix + " and the rest is in English",
+                        prefix + " und der Rest ist auf Deutsch"])
+    detector = LanguageDetector(prefix_chars=len(prefix))
+    assert detector.detect(bodies).tolist() == ["de", "de"]
+    assert detector.stats["cached"] == 1
@@ -0,0 +1,117 @@
+"""
+Testing the manifest of the incremental ingest
+"""
+# pylint: disable=redefined-outer-name
+
+import os
+from pathlib import Path
+
+import pytest
+import pandas as pd
+from omegaconf import OmegaConf
+
+from jobtrendx.manifest import IngestManifest, analysis_key
+
+
+@pytest.fixture
+def eml_paths(tmp_path) -> list[Path]:
+    """Three small files standing in for the emails"""
+    paths: list[Path] = []
+    for i in range(3):
+        path = tmp_path / f"email{i}.eml"
+        path.write_text(f"Subject: {i}\n\nbody {i}\n", encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def _rows(paths: list[Path]) -> pd.DataFrame:
+    """The rows of the analysis for the given paths"""
+    return pd.DataFrame({
+        "file_path": [str(path) for path in paths],
+        "skills": [[path.stem] for path in paths],
+    })
+
+
+def _manifest(tmp_path: Path, key: str = "key") -> IngestManifest:
+    """A manifest stored in the tmp directory"""
+    return IngestManifest(tmp_path / "store" / "manifest.json",
+                          tmp_path / "store" / "rows.pkl",
+                          key=key)
+
+
+def test_first_run_reads_everything(tmp_path, eml_paths) -> None:
+    """Without a manifest all the files are new"""
+    mfst = _manifest(tmp_path)
+    assert mfst.filter_new(eml_paths) == eml_paths
+    df_info = mfst.merge_rows(_rows(eml_paths), eml_paths)
+    assert df_info["file_path"].tolist() == [str(p) for p in eml_paths]
+
+
+def test_second_run_skips_known_files(tmp_path, eml_paths) -> None:
+    """The known files are skipped and their rows are merged"""
+    mfst = _manifest(tmp_path)
+    mfst.filter_new(eml_paths[:2])
+    mfst.merge_rows(_rows(eml_paths[:2]), eml_paths[:2])
+
+    mfst = _manifest(tmp_path)
+    new_paths = mfst.filter_new(eml_paths)
+    assert new_paths == [eml_paths[2]]
+    df_info = mfst.merge_rows(_rows(new_paths), eml_paths)
+    pd.testing.assert_frame_equal(df_info, _rows(eml_paths))
+
+
+def test_changed_content_is_read_again(tmp_path, eml_paths) -> None:
+    """A file with a new content is new, a touched one is not"""
+    mfst = _manifest(tmp_path)
+    mfst.filter_new(eml_paths)
+    mfst.merge_rows(_rows(eml_paths), eml_paths)
+
+    eml_paths[0].write_text("Subject: 0\n\nchanged\n", encoding="utf-8")
+    os.utime(eml_paths[1], ns=(1, 1))
+
+    mfst = _manifest(tmp_path)
+    assert mfst.filter_new(eml_paths) == [eml_paths[0]]
+    assert mfst.known == [str(eml_paths[1]), str(eml_paths[2])]
+    assert mfst.rehashed == [str(eml_paths[1])]
+    assert list(mfst.pending) == [str(eml_paths[0])] and not mfst.removed
+
+
+def test_removed_files_are_dropped(tmp_path, eml_paths) -> None:
+    """The rows of the deleted files are not merged"""
+    mfst = _manifest(tmp_path)
+    mfst.filter_new(eml_paths)
+    mfst.merge_rows(_rows(eml_paths), eml_paths)
+
+    mfst = _manifest(tmp_path)
+    assert not mfst.filter_new(eml_paths[1:])
+    assert mfst.removed == [str(eml_paths[0])]
+    df_info = mfst.merge_rows(_rows([]), eml_paths[1:])
+    assert df_info["file_path"].tolist() == [str(p) for p in eml_paths[1:]]
+
+
+def test_new_analysis_key_resets(tmp_path, eml_paths) -> None:
+    """Changing the taxonomy makes all the files new again"""
+    mfst = _manifest(tmp_path)
+    mfst.filter_new(eml_paths)
+    mfst.merge_rows(_rows(eml_paths), eml_paths)
+
+    mfst = _manifest(tmp_path, key="other")
+    assert mfst.filter_new(eml_paths) == eml_paths
+
+
+def test_analysis_key_settings() -> None:
+    """The settings which change the rows change the key"""
+    package = Path(__file__).resolve().parents[1] / "src" / "jobtrendx"
+    cfg = OmegaConf.load(package / "conf" / "config.yaml")
+    cfg.taxonomy_path = str(package / "taxonomy")
+    cfg.defaults = {
+        name: OmegaConf.load(package / "conf" / "defaults" / f"{name}.yaml")
+        for name in ["email_processing", "analysis"]}
+    keys = {analysis_key(cfg)}
+    cfg.defaults.analysis.lang_detection.memo = False
+    keys.add(analysis_key(cfg))
+    cfg.defaults.email_processing.fast_ingest = True
+    keys.add(analysis_key(cfg))
+    cfg.defaults.analysis.n_workers = 4
+    keys.add(analysis_key(cfg))
+    assert len(keys) == 3
@@ -0,0 +1,74 @@
+"""
+Testing the Aho-Corasick keyword matcher
+"""
+
+import re
+
+import pytest
+
+from jobtrendx.matcher import KeywordMatcher, compile_tags
+
+
+TERMS: list[str] = [
+    "R", "C", "C++", "C#", ".NET", "SQL", "Python", "Machine Learning",
+    "Machine Learning Engineer", "ML", "Baden-Baden", "Baden",
+    "München", "(m/w/d)", "m/w/d", "Deutsch", "Sehr gute Deutsch",
+    "Java", "JavaScript", "Java",
+]
+
+
+def _regex_find_all(terms: list[str], lines: list[str]) -> list[str]:
+    """The matching with one regex per term"""
+    return [
+        term for term in dict.fromkeys(terms)
+        if any(re.search(rf"\b{re.escape(term)}\b", line, re.IGNORECASE)
+               for line in lines)
+    ]
+
+
+@pytest.mark.parametrize("line", [
+    "We use Python, SQL and R for Machine Learning.",
+    "Machine Learning Engineer (m/w/d) in München",
+    "Standort: MÜNCHEN oder Baden-Baden",
+    "Kenntnisse in C++ und C# sowie .NET",
+    "Sehr gute Deutschkenntnisse und Deutsch ist ein Plus",
+    "React, Database, JavaScripting and Rust",
+    "JavaScript und Java",
+    "ML/KI Erfahrung; r und sql",
+    "",
+])
+def test_same_matches_as_regex(line: str) -> None:
+    """The automaton finds the same terms as the regexes"""
+    matcher = KeywordMatcher(TERMS)
+    assert matcher.find_all([line]) == _regex_find_all(TERMS, [line])
+
+
+def test_find_all_over_lines() -> None:
+    """The terms of all the lines are found, once, in term order"""
+    matcher = KeywordMatcher(TERMS)
+    lines = ["SQL and Python", "python again", "no skill"]
+    assert matcher.find_all(lines) == ["SQL", "Python"]
+
+
+def test_whole_words_only() -> None:
+    """Part of a word is not a match"""
+    matcher = KeywordMatcher(["Data", "Java"])
+    assert not matcher.find_all(["Database with JavaScript"])
+
+
+def test_first_match_in_term_order() -> None:
+    """The first term of the list wins, not the first in the text"""
+    matcher = KeywordMatcher(["Data Scientist", "Data Engineer"])
+    assert matcher.first_match("Data Engineer or Data Scientist") == \
+        "Data Scientist"
+    assert matcher.first_match("Software Developer") is None
+
+
+def test_compile_tags() -> None:
+    """The tags with parentheses are found, not inside a word"""
+    pattern = compile_tags(["m/w/d", "(all genders)", "m/w", ""])
+    assert pattern.search("Data Engineer (All Genders)").group() == \
+        "(All Genders)"
+    assert pattern.search("Analyst M/W/D").group() == "M/W/D"
+    assert pattern.search("Datum/Wert") is None
+    assert compile_tags([]).search("m/w/d") is None
@@ -0,0 +1,69 @@
+"""
+Testing the near-duplicate detection with MinHash/LSH
+"""
+
+import numpy as np
+import pandas as pd
+
+from jobtrendx.clean_dataframe import remove_near_duplicate
+from jobtrendx.near_duplicates import MinHasher, first_of_groups, shingle
+
+
+AD: list[str] = [
+    "Data Scientist (m/w/d)\nMusterfirma GmbH\nBerlin\n[URL]",
+    "Das wird dein Job\nDu arbeitest mit den Daten und entwickelst "
+    "die Lösungen für unsere Kunden in einem kleinen Team.",
+    "Das bringst du mit\n- Python\n- SQL\n- Docker\n"
+    "Sehr gute Deutschkenntnisse",
+    "Gehalt\n50.000 - 60.000 €/Jahr\ngeschätzt für Vollzeit",
+]
+OTHER_AD: list[str] = [
+    "Data Engineer (f/m/x)\nBeispiel AG\nHamburg\n[URL]",
+    "Your tasks\nYou build the pipelines of the data platform and "
+    "run them in the cloud with the other engineers.",
+    "Your knowledge/experience\n- Spark\n- Airflow\n- AWS\nEnglish",
+]
+
+
+def test_shingle_ignores_urls_and_order() -> None:
+    """The URLs and the order of the paragraphs do not count"""
+    assert shingle(["a b [URL] c", "d e"], 2) == {"a b", "b c", "d e"}
+    assert shingle(AD, 5) == shingle(AD[::-1], 5)
+    assert not shingle(["[URL]", ""], 5)
+
+
+def test_signature_estimates_similarity() -> None:
+    """The same ad with small changes has a close signature"""
+    hasher = MinHasher(num_perm=128, shingle_size=3)
+    copy: list[str] = [AD[0], AD[2], AD[1], AD[3], "Top Treffer\n[URL]"]
+    sig_ad, sig_copy, sig_other = (
+        np.frombuffer(sig, dtype=np.uint32)
+        for sig in hasher.signatures([AD, copy, OTHER_AD]))
+    assert (sig_ad == sig_copy).mean() > 0.8
+    assert (sig_ad == sig_other).mean() < 0.2
+    assert hasher.signatures([["[URL]"]]) == [b""]
+    assert MinHasher(num_perm=128, shingle_size=3).signature(AD) == \
+        hasher.signature(AD)
+
+
+def test_first_of_groups() -> None:
+    """Only the first of the near duplicates is kept"""
+    hasher = MinHasher(num_perm=64, shingle_size=3)
+    signatures: list[bytes] = hasher.signatures(
+        [AD, OTHER_AD, ["[URL]"], AD[::-1], ["[URL]"], OTHER_AD])
+    keep = first_of_groups(signatures, threshold=0.8)
+    assert keep.tolist() == [True, True, True, False, True, False]
+
+
+def test_remove_near_duplicate() -> None:
+    """The near duplicates and the signatures are dropped"""
+    hasher = MinHasher(num_perm=64, shingle_size=3)
+    df_info = pd.DataFrame({
+        "file_path": ["a", "b", "c"],
+        "skills": [["Python"], ["Spark"], ["Python"]],
+        "minhash": hasher.signatures([AD, OTHER_AD, AD + ["Neu"]]),
+    })
+    df_cleaned = remove_near_duplicate(df_info, threshold=0.8)
+    assert df_cleaned.columns.tolist() == ["file_path", "skills"]
+    assert df_cleaned["file_path"].tolist() == ["a", "b"]
+    assert remove_near_duplicate(df_cleaned).equals(df_cleaned)
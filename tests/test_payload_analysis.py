@@ -4,6 +4,7 @@ Testing the payload_analysis module
 # pylint: disable=redefined-outer-name
 
 import unittest
+from pathlib import Path
 from unittest.mock import patch, mock_open
 
 import yaml
@@ -11,10 +12,12 @@ import pandas as pd
 from omegaconf import DictConfig
 
 from jobtrendx.payload_analysis import \
-    _split_double_newline, _filter_item, _extract_title, \
-    _extract_matching_item, _extract_all_items, _extract_salary, \
-    _get_salary_amount
+    _split_double_newline, _filter_and_title, _extract_title, \
+    _extract_matching_item, _extract_all_items, _extract_salary_column, \
+    _salary_amounts, _get_info, split_payload
 from jobtrendx.sub_tools import fetch_from_yaml
+from jobtrendx.taxonomy_cache import CompiledTaxonomy, load_compiled
+from jobtrendx.title_resolver import TitleResolver
 
 def test_split_double_newline() -> None:
     """Test the _split_double_newline function."""
@@ -51,10 +54,10 @@ def test_split_double_newline() -> None:
     assert result.iloc[4] == ["Line1", "Line2", "Line3"]
 
 
-def test_filter_item():
+def test_filter_and_title_filtering():
     """
-    Test the _filter_item function with different newline,
-    [URL], and dash counts.
+    Test the filtering of _filter_and_title with different
+    newline, [URL], and dash counts.
     """
     items = [
         "No newlines, no URL",
@@ -66,7 +69,12 @@ def test_filter_item():
         "Extra newline\nHas [URL]",
     ]
 
-    result = _filter_item(items, max_newlines=2, min_dashes=3)
+    pattern = CompiledTaxonomy(
+        key="test", taxonomy={"title_tags": {"tags": ["(m/w/d)"]}},
+        lexicon={}).title_pattern
+    result, title = _filter_and_title(
+        items, pattern, max_newlines=2, min_dashes=3)
+    assert title == "Nan"
 
     expected = [
         "One newline\nNo URL",
@@ -76,6 +84,26 @@ def test_filter_item():
     assert result == expected, f"Expected {expected}, got {result}"
 
 
+def test_filter_and_title():
+    """
+    Test that the title paragraph is kept and its line with the
+    tag is the title, in the same pass.
+    """
+    items = [
+        "Neue Jobs für dich\nTop Treffer\n[URL]",
+        "Firma GmbH\nData Engineer (all genders)\nBerlin\n[URL]",
+        "Your tasks\nPython\nSQL",
+        "Diesen Job melden\n[URL]",
+    ]
+    pattern = CompiledTaxonomy(
+        key="test", taxonomy={"title_tags": {"tags": ["(all genders)"]}},
+        lexicon={}).title_pattern
+    filtered, title = _filter_and_title(items, pattern)
+    assert filtered == items[:3]
+    assert title == "Data Engineer (all genders)"
+    assert _filter_and_title(items[2:], pattern) == ([items[2]], "Nan")
+
+
 def test_extract_title_none_found():
     """
     Test that _extract_title returns 'Nan' if neither '(m/w/d)' nor '(f/m/x)'
@@ -88,7 +116,7 @@ def test_extract_title_none_found():
         ]
     })
     tags: list[str] = ['m/w/d', 'f/m/x']
-    assert _extract_title(row, tags) == "Nan"
+    assert _extract_title(row["clean_payload"], tags) == "Nan"
 
 
 def test_extract_title_mwd_found():
@@ -103,7 +131,7 @@ def test_extract_title_mwd_found():
     })
     tags: list[str] = ['m/w/d', 'f/m/x']
     expected = "Job Title (m/w/d)"
-    result = _extract_title(row, tags)
+    result = _extract_title(row["clean_payload"], tags)
     assert result == expected, f"Expected '{expected}', but got '{result}'"
 
 
@@ -119,7 +147,7 @@ def test_extract_title_fmx_found():
     })
     expected = "Job Family Title (f/m/x)"
     tags: list[str] = ['m/w/d', 'f/m/x']
-    result = _extract_title(row, tags)
+    result = _extract_title(row["clean_payload"], tags)
     assert result == expected, f"Expected '{expected}', but got '{result}'"
 
 
@@ -137,10 +165,82 @@ def test_extract_title_multiple_matches():
     # Should return the line from the first block it encounters
     expected = "Something else (m/w/d)"
     tags: list[str] = ['m/w/d', 'f/m/x']
-    result = _extract_title(row, tags)
+    result = _extract_title(row["clean_payload"], tags)
     assert result == expected, f"Expected '{expected}', but got '{result}'"
 
 
+def test_get_info_columns():
+    """
+    Test that _get_info extracts every column for every payload,
+    in the order of the rows.
+    """
+    compiled = CompiledTaxonomy(
+        key="test",
+        taxonomy={
+            "locations": {"Berlin": ["Berlin"], "Bayern": ["München"]},
+            "job_titles": {"Data": ["Data Scientist", "Data Engineer"]},
+            "title_tags": {"tags": ["m/w/d"]},
+            "skills": {"Languages": ["Python", "SQL"]},
+            "languages": {"German": ["Deutsch"]},
+            "salaries": {"Salary": ["geschätzt für Vollzeit"]},
+        },
+        lexicon={})
+    payload = pd.DataFrame({"clean_payload": [
+        ["Data Engineer (m/w/d)\nBerlin", "SQL und Deutsch\nPython",
+         "50.000 - 60.000 €/Jahr\ngeschätzt für Vollzeit"],
+        ["Nothing here\nat all"],
+    ]})
+    result = _get_info(payload, compiled)
+    assert result == {
+        "job_title": ["Data Engineer", "nan"],
+        "location": [["Berlin"], ["nan"]],
+        "skills": [["Python", "SQL"], ["nan"]],
+        "salary_min": [50000.0, "Nan"],
+        "salary_max": [60000.0, "Nan"],
+        "salary_unit": ["€/Jahr", "Nan"],
+        "language": [["Deutsch"], ["nan"]],
+    }
+
+
+def test_split_payload_sharded_same_as_single():
+    """
+    Test that analyzing the payloads in a pool of processes gives
+    the same DataFrame as a single process.
+    """
+    package = Path(__file__).resolve().parents[1] / "src" / "jobtrendx"
+    cfg = DictConfig({
+        "taxonomy_path": str(package / "taxonomy"),
+        "taxonomy_files": {"locations": "locations.yaml",
+                           "job_titles": "job_titles.yaml",
+                           "title_tags": "title_tags.yaml",
+                           "skills": "skills.yaml",
+                           "languages": "language.yaml",
+                           "salaries": "salary.yaml"},
+        "lexicon_path": str(package / "lexicon"),
+        "lexicon_files": {"skills": "skills.yaml"},
+    })
+    payloads = pd.DataFrame({
+        "file_path": [f"email{i}.eml" for i in range(5)],
+        "eml_lang": ["de", "en", "de", "de", "en"],
+        "payload": [
+            f"Data Engineer (m/w/d)\nFirma\nBerlin\n\nPython und SQL {i}"
+            "\nSehr gute Deutschkenntnisse\n\nDiesen Job melden"
+            for i in range(5)
+        ],
+    }, index=[10, 11, 12, 13, 14])
+    single = split_payload(payloads, cfg, n_workers=1)
+    sharded = split_payload(payloads, cfg, n_workers=2, chunk_size=2)
+    pd.testing.assert_frame_equal(single, sharded)
+    assert single["job_title"].tolist() == ["Data Engineer"] * 5
+    compiled = load_compiled(cfg)
+    resolver = TitleResolver(compiled.matchers["job_titles"],
+                             compiled.title_pattern)
+    memoized = split_payload(payloads, cfg, n_workers=2, chunk_size=2,
+                             resolver=resolver)
+    pd.testing.assert_frame_equal(single, memoized)
+    assert resolver.stats["misses"] == 1
+
+
 class TestFetchFromYaml(unittest.TestCase):
     """Test the YAML reader function `fetch_from_yaml`."""
 
@@ -275,7 +375,7 @@ class TestExtractAllItems(unittest.TestCase):
             ]
         })
         items = ["Python", "R"]
-        found = _extract_all_items(row, items)
+        found = _extract_all_items(row["clean_payload"], items)
         self.assertEqual(found, ["Python"])
 
     def test_extract_all_items_multiple_matches(self):
@@ -288,7 +388,7 @@ class TestExtractAllItems(unittest.TestCase):
             ]
         })
         items = ["TensorFlow", "Spark", "PyTorch"]
-        found = _extract_all_items(row, items)
+        found = _extract_all_items(row["clean_payload"], items)
         self.assertCountEqual(found, ["TensorFlow", "Spark"])
 
     def test_extract_all_items_no_match(self):
@@ -301,83 +401,113 @@ class TestExtractAllItems(unittest.TestCase):
             ]
         })
         items = ["Python", "TensorFlow"]
-        found = _extract_all_items(row, items)
+        found = _extract_all_items(row["clean_payload"], items)
         self.assertEqual(found, ["nan"])
 
 
 class TestExtractSalaryFunctions(unittest.TestCase):
     """Test extracing salaries"""
 
+    @staticmethod
+    def _salary(line: str) -> tuple:
+        """The salary of one line"""
+        salary_min, salary_max, salary_unit = \
+            _salary_amounts(pd.Series([line]), 1)
+        return salary_min[0], salary_max[0], salary_unit[0]
+
     def test_extract_salary_monat(self):
         """
         Checks if a line mentioning salary per month is converted
         to annual values.
         """
-        row = pd.Series({
-            "clean_payload": [
-                "This is some text.",
-                "The estimated salary range is 5.500 - 7.500 €/Monat"
-            ]
-        })
+        clean_payloads = [[
+            "This is some text.",
+            "The estimated salary range is 5.500 - 7.500 €/Monat"
+        ]]
         items = ["salary", "€"]  # "€" will trigger the check.
-        min_salary, max_salary, unit = _extract_salary(row, items)
-        self.assertEqual(min_salary, 66000.0,
+        salary_min, salary_max, salary_unit = \
+            _extract_salary_column(clean_payloads, items)
+        self.assertEqual(salary_min, [66000.0],
                          "Should convert min monthly salary to annual.")
-        self.assertEqual(max_salary, 90000.0,
+        self.assertEqual(salary_max, [90000.0],
                          "Should convert max monthly salary to annual.")
-        self.assertEqual(unit, "€/Jahr",
+        self.assertEqual(salary_unit, ["€/Jahr"],
                          "Uses '€/Jahr' when monthly data is found.")
 
     def test_extract_salary_jahr(self):
         """
         Checks if a line with an annual salary remains unchanged.
         """
-        row = pd.Series({
-            "clean_payload": [
-                "This is some text.",
-                "The estimated salary range is 66.000 - 90.000 €/Jahr"
-            ]
-        })
+        clean_payloads = [[
+            "This is some text.",
+            "The estimated salary range is 66.000 - 90.000 €/Jahr"
+        ]]
         items = ["salary", "€"]
-        min_salary, max_salary, unit = _extract_salary(row, items)
-        self.assertEqual(min_salary, 66000.0)
-        self.assertEqual(max_salary, 90000.0)
-        self.assertEqual(unit, "€/Jahr")
+        self.assertEqual(_extract_salary_column(clean_payloads, items),
+                         ([66000.0], [90000.0], ["€/Jahr"]))
 
     def test_extract_salary_no_match(self):
         """
         Ensures "Nan", "Nan", "Nan" are returned when no salary keywords match.
         """
-        row = pd.Series({
-            "clean_payload": [
-                "No salary provided here."
-            ]
-        })
+        clean_payloads = [["No salary provided here."]]
         items = ["€", "salary"]
-        min_salary, max_salary, unit = _extract_salary(row, items)
-        self.assertEqual(min_salary, "Nan")
-        self.assertEqual(max_salary, "Nan")
-        self.assertEqual(unit, "Nan")
+        self.assertEqual(_extract_salary_column(clean_payloads, items),
+                         (["Nan"], ["Nan"], ["Nan"]))
 
-    def test_get_salary_amount_monat_direct(self):
+    def test_extract_salary_column_rows(self):
         """
-        Tests _get_salary_amount directly for a monthly range line.
+        Each payload gets the first plausible salary of its lines,
+        in the order of the payloads.
         """
-        line = "5.500 - 7.500 €/Monat"
-        min_sal, max_sal, unit = _get_salary_amount(line)
-        self.assertEqual(min_sal, 66000.0)
-        self.assertEqual(max_sal, 90000.0)
-        self.assertEqual(unit, "€/Jahr")
+        clean_payloads = [
+            ["Gehalt: 300 € Zuschuss\nGehalt: 50.000 € - 60.000 €"],
+            ["Kein Gehalt hier."],
+            ["Intro", "Salary: 70k € p.a."],
+        ]
+        self.assertEqual(
+            _extract_salary_column(clean_payloads, ["Gehalt", "Salary"]),
+            ([50000.0, "Nan", 70000.0],
+             [60000.0, "Nan", 70000.0],
+             ["€/Jahr", "Nan", "€/Jahr"]))
 
-    def test_get_salary_amount_no_euro(self):
+    def test_salary_amounts_monat_direct(self):
+        """
+        Tests _salary_amounts directly for a monthly range line.
+        """
+        self.assertEqual(self._salary("5.500 - 7.500 €/Monat"),
+                         (66000.0, 90000.0, "€/Jahr"))
+
+    def test_salary_amounts_formats(self):
+        """
+        Tests the single amounts, the "k", the hourly rates, both
+        thousand separators and the currency after both amounts
+        of a range.
+        """
+        lines = {
+            "€ 65.000": (65000.0, 65000.0),
+            "60-75k € p.a.": (60000.0, 75000.0),
+            "65,000 - 80,000 EUR per year": (65000.0, 80000.0),
+            "3.000 € brutto im Monat": (36000.0, 36000.0),
+            "25,50 € pro Stunde": (25.5 * 2080, 25.5 * 2080),
+            "5 Mitarbeiter, 60.000 €/Jahr": (60000.0, 60000.0),
+            "50.000 € - 60.000 €": (50000.0, 60000.0),
+            "50.000 € – 60.000 €/Jahr": (50000.0, 60000.0),
+            "4.000 € bis 5.000 € im Monat": (48000.0, 60000.0),
+        }
+        for line, (min_expected, max_expected) in lines.items():
+            self.assertEqual(self._salary(line),
+                             (min_expected, max_expected, "€/Jahr"), line)
+
+    def test_salary_amounts_no_salary(self):
         """
-        Tests _get_salary_amount returns Nan if '€' is missing.
+        Tests _salary_amounts returns Nan if '€' is missing, or if
+        the amount is too small for a yearly salary.
         """
-        line = "66.000 - 90.000 per year"
-        min_sal, max_sal, unit = _get_salary_amount(line)
-        self.assertEqual(min_sal, "Nan")
-        self.assertEqual(max_sal, "Nan")
-        self.assertEqual(unit, "Nan")
+        for line in ["66.000 - 90.000 per year",
+                     "5 Tage Urlaub, 300 € Zuschuss"]:
+            self.assertEqual(self._salary(line), ("Nan", "Nan", "Nan"),
+                             line)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,111 @@
+"""
+Testing the pipeline runner and its stage cache
+"""
+
+import logging
+
+import pandas as pd
+
+from jobtrendx.pipeline import Pipeline, Stage, files_digest
+
+
+LOG = logging.getLogger("test_pipeline")
+
+
+def _stages(calls: list[str], lexicon: dict[str, str]) -> list[Stage]:
+    """Three stages which record when they run"""
+    def read(_) -> pd.DataFrame:
+        calls.append("read")
+        return pd.DataFrame({"skills": [["ML"], ["Python", "ML"]]})
+
+    def unify(df: pd.DataFrame) -> pd.DataFrame:
+        calls.append("unify")
+        df["skills"] = df["skills"].map(
+            lambda items: [lexicon.get(item, item) for item in items])
+        return df
+
+    def count(df: pd.DataFrame) -> dict[str, int]:
+        calls.append("count")
+        return df["skills"].explode().value_counts().to_dict()
+
+    return [
+        Stage("read", read),
+        Stage("unify", unify,
+              key_parts=lambda: [str(sorted(lexicon.items()))]),
+        Stage("count", count),
+    ]
+
+
+def test_second_run_hits_the_cache(tmp_path) -> None:
+    """Nothing runs again if nothing changed"""
+    calls: list[str] = []
+    lexicon = {"ML": "Machine Learning"}
+    first = Pipeline(_stages(calls, lexicon), LOG, tmp_path).run()
+    pipe = Pipeline(_stages(calls, lexicon), LOG, tmp_path)
+    assert pipe.run() == first == {"Machine Learning": 2, "Python": 1}
+    assert calls == ["read", "unify", "count"]
+    assert [status for _, status, _ in pipe.report] == ["hit"] * 3
+
+
+def test_changed_input_runs_the_later_stages(tmp_path) -> None:
+    """A new lexicon runs only unify and the stages after it"""
+    calls: list[str] = []
+    Pipeline(_stages(calls, {"ML": "Machine Learning"}), LOG, tmp_path).run()
+    calls.clear()
+    pipe = Pipeline(_stages(calls, {"ML": "ML"}), LOG, tmp_path)
+    assert pipe.run() == {"ML": 2, "Python": 1}
+    assert calls == ["unify", "count"]
+    assert [status for _, status, _ in pipe.report] == ["hit", "miss", "miss"]
+
+
+def test_same_result_hits_the_later_stages(tmp_path) -> None:
+    """The key of a stage is the content of its input"""
+    calls: list[str] = []
+    Pipeline(_stages(calls, {"ML": "Machine Learning"}), LOG, tmp_path).run()
+    calls.clear()
+    lexicon = {"ML": "Machine Learning", "KI": "Machine Learning"}
+    pipe = Pipeline(_stages(calls, lexicon), LOG, tmp_path)
+    pipe.run()
+    assert calls == ["unify"]
+    assert [status for _, status, _ in pipe.report] == ["hit", "miss", "hit"]
+
+
+def test_reordered_lists_run_the_later_stages(tmp_path) -> None:
+    """A result with only the items of a list reordered is new"""
+    calls: list[str] = []
+
+    def stages(skills: list[str]) -> list[Stage]:
+        def top(df: pd.DataFrame) -> str:
+            calls.append("top")
+            return df["skills"].iloc[0][0]
+        return [Stage("read", lambda _: pd.DataFrame({"skills": [skills]}),
+                      key_parts=lambda: [str(skills)]),
+                Stage("top", top)]
+
+    Pipeline(stages(["Python", "SQL"]), LOG, tmp_path).run()
+    assert Pipeline(stages(["SQL", "Python"]), LOG, tmp_path).run() == "SQL"
+    assert calls == ["top", "top"]
+
+
+def test_without_cache_and_forget(tmp_path) -> None:
+    """Without a cache dir, or a forgotten stage, the stages run"""
+    calls: list[str] = []
+    Pipeline(_stages(calls, {}), LOG).run()
+    Pipeline(_stages(calls, {}), LOG).run()
+    assert calls.count("read") == 2
+
+    Pipeline(_stages(calls, {}), LOG, tmp_path).run()
+    calls.clear()
+    pipe = Pipeline(_stages(calls, {}), LOG, tmp_path)
+    pipe.forget("unify")
+    pipe.run()
+    assert calls == ["unify"]
+
+
+def test_files_digest(tmp_path) -> None:
+    """The digest changes with the content of the files"""
+    path = tmp_path / "skills.yaml"
+    path.write_text("ML:\n  - ML\n", encoding="utf-8")
+    before = files_digest([path])
+    path.write_text("ML:\n  - KI\n", encoding="utf-8")
+    assert files_digest([path]) != before
@@ -0,0 +1,70 @@
+"""
+Testing the sections of the payloads
+"""
+
+import pandas as pd
+
+from jobtrendx.matcher import KeywordMatcher, compile_tags
+from jobtrendx.payload_analysis import _extract_items_column, \
+    _payload_clean_up
+from jobtrendx.sections import SectionSegmenter, span_columns
+
+SECTIONS: dict[str, list[str]] = {
+    "company_info": ["Wer wir sind."],
+    "job_description": ["Das wird dein Job", "Your tasks"],
+    "requirements": ["Das bringst du mit", "Your knowledge/experience"],
+    "offer": ["Das bieten wir dir"],
+}
+PARAGRAPHS: list[str] = [
+    "Data Engineer (m/w/d)\nBerlin",
+    "Wer wir sind.\nWir arbeiten mit Java und SQL",
+    "Das bringst du mit:\n- Python\n- SQL",
+    "Das bieten wir dir\nDocker Kurse",
+]
+
+
+def test_segment_headers() -> None:
+    """A header starts a section only as a whole line"""
+    segmenter = SectionSegmenter(SECTIONS)
+    text = "\n\n".join(PARAGRAPHS)
+    spans = segmenter.segment(text)
+    assert list(spans) == ["company_info", "requirements", "offer"]
+    start, end = spans["requirements"][0]
+    assert text[start:end] == "Das bringst du mit:\n- Python\n- SQL\n\n"
+    assert not segmenter.segment("Was das bringst du mit? Nichts.")
+
+
+def test_split_scope() -> None:
+    """The skills are searched in the scope, or in all without it"""
+    segmenter = SectionSegmenter(SECTIONS)
+    matcher = KeywordMatcher(["Python", "SQL", "Java", "Docker"])
+    scoped, spans = segmenter.split_column(
+        [PARAGRAPHS, ["Nur Java\nund Docker"]])
+    assert _extract_items_column(scoped, matcher) == \
+        [["Python", "SQL"], ["Java", "Docker"]]
+    assert span_columns(spans) == [
+        "company_info_span", "job_description_span", "requirements_span",
+        "offer_span"]
+    assert spans["job_description_span"] == [None, None]
+    assert spans["company_info_span"][0] == (
+        len(PARAGRAPHS[0]) + 2,
+        len(PARAGRAPHS[0]) + len(PARAGRAPHS[1]) + 4)
+
+
+def test_clean_up_labels() -> None:
+    """The clean-up labels the kept paragraphs, a header cuts one"""
+    segmenter = SectionSegmenter(SECTIONS)
+    paragraphs = [*PARAGRAPHS[:2],
+                  "- Java\n- Docker\nYour tasks\n- Python\n- SQL",
+                  *PARAGRAPHS[2:], "Diesen Job melden\n- Rust\n- Go"]
+    payloads = pd.DataFrame({"payload": ["\n\n".join(paragraphs)]})
+    cleaned = _payload_clean_up(payloads, compile_tags(["(m/w/d)"]),
+                                segmenter)
+    scoped, spans = segmenter.split_column(cleaned["clean_payload"])
+    assert cleaned["scoped_payload"].tolist() == scoped
+    assert scoped[0][0] == "Your tasks\n- Python\n- SQL"
+    for col, column in spans.items():
+        assert cleaned[col].tolist() == column
+    text = "\n\n".join(cleaned.loc[0, "clean_payload"])
+    start, end = spans["job_description_span"][0]
+    assert text[start:end] == "Your tasks\n- Python\n- SQL\n\n"
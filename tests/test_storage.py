@@ -0,0 +1,80 @@
+"""
+Testing the Parquet persistence of the table of the emails
+"""
+
+import logging
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from jobtrendx import compact
+from jobtrendx import storage
+from jobtrendx.statistics import StatisticsManager
+
+
+def _df_info() -> pd.DataFrame:
+    """A small cleaned table of the emails"""
+    return pd.DataFrame({
+        "file_path": ["a.eml", "b.eml", "c.eml"],
+        "eml_lang": ["de", "en", "de"],
+        "job_title": ["Data Scientist", "Nan", "Data Engineer"],
+        "location": [["Baden-Baden"], ["nan"], ["Berlin", "Köln"]],
+        "skills": [["scikit-learn", "SQL"], [], ["Python"]],
+        "salary_min": [50000.0, "Nan", 61000.0],
+        "salary_max": [60000.0, "Nan", 72000.0],
+        "salary_unit": ["€/Jahr", "Nan", "€/Jahr"],
+        "language": [["German"], ["English"], ["German", "English"]],
+    })
+
+
+def test_write_native_types(tmp_path) -> None:
+    """The lists are list<string> and the salaries are floats"""
+    path = storage.write_info(_df_info(), tmp_path / "store" / "info.pq")
+    schema = pq.read_schema(path)
+    for col in ["location", "skills", "language"]:
+        assert schema.field(col).type == pa.list_(pa.string())
+    assert schema.field("salary_min").type == pa.float64()
+    assert schema.field("job_title").type == pa.string()
+
+
+def test_round_trip(tmp_path) -> None:
+    """The lists come back as they were, the placeholders as NaN"""
+    df_info = _df_info()
+    df_read = storage.read_info(
+        storage.write_info(df_info, tmp_path / "info.parquet"))
+    assert df_read.columns.tolist() == df_info.columns.tolist()
+    for col in ["location", "skills", "language", "job_title"]:
+        assert df_read[col].tolist() == df_info[col].tolist()
+    assert np.isnan(df_read.loc[1, "salary_min"])
+    assert df_read.loc[2, "salary_max"] == 72000.0
+
+
+def test_statistics_from_file(tmp_path) -> None:
+    """The statistics from the file are the ones from memory"""
+    log = logging.getLogger("test_storage")
+    path = storage.write_info(_df_info(), tmp_path / "info.parquet")
+    in_memory = StatisticsManager(df_info=_df_info(), log=log)
+    from_file = StatisticsManager.from_file(path, log=log)
+    for stats in (in_memory, from_file):
+        stats.statistics()
+    pd.testing.assert_series_equal(from_file.skills_count,
+                                   in_memory.skills_count)
+    pd.testing.assert_series_equal(from_file.job_title_top,
+                                   in_memory.job_title_top)
+    pd.testing.assert_series_equal(from_file.salary_min,
+                                   in_memory.salary_min)
+
+
+def test_read_table_codes(tmp_path) -> None:
+    """The codes from the Arrow arrays are the ones of the lists"""
+    path = storage.write_info(_df_info(), tmp_path / "info.parquet")
+    df_read, list_codes = storage.read_table(path)
+    assert sorted(list_codes) == ["language", "location", "skills"]
+    for col, codes in list_codes.items():
+        expected = compact.ListCodes.from_series(_df_info()[col])
+        assert codes.vocab.tolist() == expected.vocab.tolist()
+        np.testing.assert_array_equal(codes.codes, expected.codes)
+        np.testing.assert_array_equal(codes.offsets, expected.offsets)
+        assert df_read[col].tolist() == _df_info()[col].tolist()
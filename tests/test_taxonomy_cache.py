@@ -0,0 +1,75 @@
+"""
+Testing the compiled taxonomy cache
+"""
+# pylint: disable=redefined-outer-name
+# pylint: disable=protected-access
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from omegaconf import DictConfig
+
+from jobtrendx import taxonomy_cache as taxo
+
+
+@pytest.fixture
+def cfg(tmp_path) -> DictConfig:
+    """A small taxonomy and lexicon in the tmp directory"""
+    taxonomy: Path = tmp_path / "taxonomy"
+    lexicon: Path = tmp_path / "lexicon"
+    taxonomy.mkdir()
+    lexicon.mkdir()
+    (taxonomy / "skills.yaml").write_text(
+        "Languages:\n  - Python\n  - SQL\nDatabases:\n  - SQL\n",
+        encoding="utf-8")
+    (taxonomy / "locations.yaml").write_text(
+        "Berlin:\n  - Berlin\n", encoding="utf-8")
+    (lexicon / "skills.yaml").write_text(
+        "Python:\n  - Python\n  - Python3\n", encoding="utf-8")
+    taxo._COMPILED.clear()
+    return DictConfig({
+        "taxonomy_path": str(taxonomy),
+        "taxonomy_files": {"skills": "skills.yaml",
+                           "locations": "locations.yaml"},
+        "lexicon_path": str(lexicon),
+        "lexicon_files": {"skills": "skills.yaml"},
+        "defaults": {"paths": {"cache": str(tmp_path / "cache")}},
+    })
+
+
+def test_compiled_content(cfg) -> None:
+    """The lists, the inverse maps and the matchers are built"""
+    compiled = taxo.load_compiled(cfg)
+    assert compiled.terms["skills"] == ["Python", "SQL", "SQL"]
+    assert compiled.category_of["skills"]["SQL"] == "Databases"
+    assert compiled.lexicon_inverse["skills"]["Python3"] == "Python"
+    assert compiled.matchers["skills"].find_all(["sql and python"]) == \
+        ["Python", "SQL"]
+
+
+def test_shared_in_memory(cfg) -> None:
+    """The modules get the same object in one run"""
+    assert taxo.load_compiled(cfg) is taxo.load_compiled(cfg)
+
+
+def test_loaded_from_disk(cfg) -> None:
+    """A new run reads the cache instead of the YAML files"""
+    compiled = taxo.load_compiled(cfg)
+    taxo._COMPILED.clear()
+    with patch("jobtrendx.sub_tools.fetch_from_yaml") as mock_fetch:
+        cached = taxo.load_compiled(cfg)
+    mock_fetch.assert_not_called()
+    assert cached.key == compiled.key
+    assert cached.terms == compiled.terms
+
+
+def test_rebuilt_when_yaml_changes(cfg) -> None:
+    """Editing a YAML file gives a new compiled taxonomy"""
+    compiled = taxo.load_compiled(cfg)
+    skills = Path(cfg.taxonomy_path) / "skills.yaml"
+    skills.write_text("Languages:\n  - Java\n", encoding="utf-8")
+    updated = taxo.load_compiled(cfg)
+    assert updated.key != compiled.key
+    assert updated.terms["skills"] == ["Java"]
+    assert len(list(Path(cfg.defaults.paths.cache).glob("*.pkl"))) == 1
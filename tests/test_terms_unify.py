@@ -7,6 +7,7 @@ import unittest
 
 import pandas as pd
 
+from jobtrendx.fuzzy import FuzzyIndex
 from jobtrendx.terms_unify import _replace_str, _invert_lexicon, \
     _replace_list_str
 
@@ -39,6 +40,17 @@ class TestReplaceStr(unittest.TestCase):
         ]
         self.assertListEqual(self.df["job_title"].tolist(), expected)
 
+    def test_replace_str_fuzzy(self):
+        """The strings which are not in the lexicon are matched fuzzy"""
+        self.df.loc[6] = "Datenwissenschaftlerin"
+        index = FuzzyIndex(_invert_lexicon(self.lexicon))
+        _replace_str(self.lexicon, self.df, "job_title", fuzzy_index=index)
+        expected = [
+            "Data Analyst", "Data Scientist", "Data Engineer",
+            "Data Scientist", None, "Data Analyst", "Data Scientist"
+        ]
+        self.assertListEqual(self.df["job_title"].tolist(), expected)
+
     def test_invert_lexicon(self):
         """Test if _invert_lexicon correctly inverts the lexicon."""
         inverted = _invert_lexicon(self.lexicon)
@@ -87,6 +99,30 @@ class TestReplaceListStr(unittest.TestCase):
         results = [item.sort() for item in self.df["skills"].tolist() if item]
         self.assertListEqual(results, expected)
 
+    def test_sorted_unique_lists(self):
+        """
+        The unified lists are sorted without duplicates, the empty
+        lists and the cells which are not lists are kept.
+        """
+        df = pd.DataFrame({
+            "skills": [["R", "SQL", "KI", "Python", "ML"], [], "Nan",
+                       None, ["AI", "Data Science"]]
+        })
+        _replace_list_str(self.lexicon, df, "skills")
+        expected = [
+            ["Machine Learning", "Programming Language", "SQL"], [],
+            "Nan", None, ["Data Science"]
+        ]
+        self.assertListEqual(df["skills"].tolist(), expected)
+
+    def test_replace_list_str_fuzzy(self):
+        """The items which are not in the lexicon are matched fuzzy"""
+        df = pd.DataFrame({"skills": [["Data-Science", "SQL"], ["KI"]]})
+        index = FuzzyIndex(_invert_lexicon(self.lexicon))
+        _replace_list_str(self.lexicon, df, "skills", fuzzy_index=index)
+        expected = [["Data Science", "SQL"], ["Machine Learning"]]
+        self.assertListEqual(df["skills"].tolist(), expected)
+
 
 if __name__ == "__main__":
     unittest.main()
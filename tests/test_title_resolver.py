@@ -0,0 +1,57 @@
+"""
+Testing the memoized job titles
+"""
+
+import re
+
+from jobtrendx.matcher import KeywordMatcher, compile_tags
+from jobtrendx.title_resolver import TitleResolver
+
+TERMS: list[str] = ["Data Scientist", "Data Engineer", "Data"]
+TAGS: re.Pattern = compile_tags(["m/w/d", "w/m/d", "all genders"])
+
+
+def _resolver(**kwargs) -> TitleResolver:
+    """A resolver of the test terms"""
+    return TitleResolver(KeywordMatcher(TERMS), TAGS, **kwargs)
+
+
+def test_resolve_same_as_matcher() -> None:
+    """The memo gives the job titles of the normalized lines"""
+    lines = ["Data Scientist (m/w/d)", "DATA  SCIENTIST (w/m/d)",
+             "Senior Data Engineer (all genders)", "Nan",
+             "Data Scientist (m/w/d)", "Datascientist"]
+    resolver = _resolver()
+    matcher = KeywordMatcher(TERMS)
+    expected = [matcher.first_match(resolver.normalize(line)) or "nan"
+                for line in lines]
+    assert resolver.resolve(lines) == expected
+    # The extra space is not in the way of the longer term anymore
+    assert resolver.normalize(lines[1]) == "data scientist"
+    assert expected[:3] == ["Data Scientist", "Data Scientist",
+                            "Data Engineer"]
+    # 6 titles, 5 distinct lines, 4 distinct normalized lines
+    assert resolver.stats == {
+        "titles": 6, "lines": 5, "hits": 1, "misses": 4}
+    assert "hit rate 33.3%" in resolver.report()
+
+
+def test_memo_bounded() -> None:
+    """The least recently used lines are dropped"""
+    resolver = _resolver(max_size=2)
+    resolver.resolve(["Data Scientist", "Data Engineer"])
+    resolver.resolve(["data scientist", "Data Analyst"])
+    assert list(resolver.memo) == ["data scientist", "data analyst"]
+
+
+def test_save_load(tmp_path) -> None:
+    """The memo on the disk is used only with the same key"""
+    cache_file = tmp_path / "titles.json"
+    resolver = _resolver(key="k", cache_file=cache_file)
+    resolver.resolve(["Data Scientist (m/w/d)", "Data Engineer"])
+    resolver.save()
+    loaded = _resolver(key="k", cache_file=cache_file)
+    assert loaded.memo == resolver.memo
+    assert loaded.resolve(["data engineer (w/m/d)"]) == ["Data Engineer"]
+    assert loaded.stats["misses"] == 0
+    assert not _resolver(key="other", cache_file=cache_file).memo
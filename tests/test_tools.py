@@ -13,10 +13,13 @@ import pytest
 import pandas as pd
 
 from jobtrendx.tools_processor import check_directory, check_dir_not_empty, \
-    returns_all_files_in_dir, returns_eml_files, returns_eml_path
+    returns_all_files_in_dir, returns_eml_files, returns_eml_path, \
+    returns_email_contant, returns_email_contant_parallel, resolve_workers, \
+    iter_chunks
     
 from jobtrendx.tools_analysis import detect_language, _check_language, \
-    _extract_attachments, _clean_eml_payload, eml_to_dataframe
+    _extract_attachments, _clean_eml_payload, eml_to_dataframe, \
+    parse_dates, extract_email_detail
 
 
 def test_check_directory_exists() -> None:
@@ -92,6 +95,49 @@ def test_returns_eml_path_output_type():
         "Not all elements are Path objects"
 
 
+def _write_emails(directory: Path, nr_emails: int) -> list[Path]:
+    """Write a few simple .eml files and return their paths"""
+    paths: list[Path] = []
+    for i in range(nr_emails):
+        msg = EmailMessage()
+        msg["Subject"] = f"Job {i}"
+        msg.set_content(f"Data Scientist (m/w/d) number {i}")
+        path = directory / f"email{i}.eml"
+        path.write_text(msg.as_string(), encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def test_returns_email_contant_parallel_same_as_serial(tmp_path) -> None:
+    """
+    The parallel reader keeps the order of the serial one, and
+    its details are the ones of the serial emails, as strings
+    """
+    paths = _write_emails(tmp_path, 7)
+    serial = extract_email_detail(returns_email_contant(paths))
+    parallel = returns_email_contant_parallel(paths,
+                                              n_workers=2,
+                                              chunk_size=2)
+
+    assert list(parallel) == paths
+    assert list(parallel.values()) == list(serial.values())
+    assert {type(details["subject"]) for details in parallel.values()} == \
+        {str}
+
+
+def test_resolve_workers() -> None:
+    """0 and None fall back to all the cores"""
+    assert resolve_workers(3) == 3
+    assert resolve_workers(0) >= 1
+    assert resolve_workers(None) >= 1
+
+
+def test_iter_chunks() -> None:
+    """The chunks keep the order and the last one holds the rest"""
+    assert list(iter_chunks([1, 2, 3, 4, 5], 2)) == [[1, 2], [3, 4], [5]]
+    assert not list(iter_chunks([], 3))
+
+
 def test_extract_attachments_no_attachments() -> None:
     """Test _extract_attachments with no attachments in the email."""
     email_obj = EmailMessage()
@@ -226,3 +272,18 @@ def test_check_language() -> None:
     assert _check_language("de") == "de"
     assert _check_language("fr") == "unknown"
     assert _check_language("es") == "unknown"
+
+
+def test_parse_dates() -> None:
+    """The date headers are UTC timestamps, NaT if not a date"""
+    dates = pd.Series(["Fri, 05 Jan 2024 08:00:00 +0100",
+                       "Tue, 1 Apr 2025 08:00:00 +0000 (UTC)",
+                       "5 Jan 2024 08:00 -0700",
+                       None, "not a date"], dtype=object)
+    parsed = parse_dates(dates)
+    assert str(parsed.dtype) == "datetime64[ns, UTC]"
+    assert parsed[:3].tolist() == [
+        pd.Timestamp("2024-01-05 07:00", tz="UTC"),
+        pd.Timestamp("2025-04-01 08:00", tz="UTC"),
+        pd.Timestamp("2024-01-05 15:00", tz="UTC")]
+    assert parsed[3:].isna().all()
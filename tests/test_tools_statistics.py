@@ -8,7 +8,7 @@ import pandas as pd
 
 from omegaconf import DictConfig
 from jobtrendx.tools_statistics import anlz_string_cols, anlz_list_cols, \
-    anlz_numerical_cols, anlz_by_category
+    anlz_numerical_cols, anlz_by_category, anlz_for_job_skils
 from jobtrendx.sub_tools import fetch_from_yaml
 
 class TestAnlzTitles(unittest.TestCase):
@@ -128,9 +128,11 @@ class TestAnlzNumericalCols(unittest.TestCase):
             "mean": 30.0,
             "std": 15.811388300841896,
             "min": 10.0,
+            "10%": 14.0,
             "25%": 20.0,
             "50%": 30.0,
             "75%": 40.0,
+            "90%": 46.0,
             "max": 50.0
         })
         pd.testing.assert_series_equal(descriptive_stats,
@@ -190,5 +192,29 @@ class TestAnlzByCategory(unittest.TestCase):
         pd.testing.assert_series_equal(counts, expected_counts)
 
 
+class TestAnlzForJobSkills(unittest.TestCase):
+    """Test the skills of each job title"""
+
+    def test_anlz_for_job_skils(self):
+        """The skills of the ads of each title are counted"""
+        df = pd.DataFrame({
+            "job_title": ["Data Scientist", "Data Engineer",
+                          "Data Scientist", "nan", "Data Analyst"],
+            "skills": [["Python", "SQL"], ["SQL", "Spark"],
+                       ["Python", "Docker"], ["Python"], None],
+        })
+        per_job = anlz_for_job_skils(df, "job_title", "skills")
+
+        self.assertEqual(list(per_job),
+                         ["Data Analyst", "Data Engineer", "Data Scientist"])
+        self.assertTrue(per_job["Data Analyst"].empty)
+        self.assertEqual(per_job["Data Scientist"].to_dict(),
+                         {"Python": 2, "SQL": 1, "Docker": 1})
+        self.assertEqual(list(per_job["Data Scientist"].index),
+                         ["Python", "SQL", "Docker"])
+        self.assertEqual(per_job["Data Engineer"].to_dict(),
+                         {"SQL": 1, "Spark": 1})
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,67 @@
+"""
+Testing the trends of the ads by period
+"""
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+from jobtrendx import trends
+
+
+def _df_info() -> pd.DataFrame:
+    """A few ads over three months, one without a date"""
+    return pd.DataFrame({
+        "file_path": list("abcdef"),
+        "date": pd.to_datetime(["2024-01-03", "2024-01-20", "2024-02-05",
+                                "2024-02-06", None, "2024-03-01"], utc=True),
+        "job_title": ["Data Scientist", "nan", "Data Engineer",
+                      "Data Scientist", "Data Scientist", "Data Analyst"],
+        "skills": [["Python", "SQL", "Python"], ["SQL"], [], np.nan,
+                   ["Python"], ["Docker", "nan"]],
+        "salary_min": [50000.0, "Nan", 60000.0, 0.0, 70000.0, "Nan"],
+        "salary_max": [60000.0, "Nan", 70000.0, 0.0, 80000.0, "Nan"],
+    })
+
+
+def test_aggregate_by_month() -> None:
+    """The ads, skills, titles and salaries of each month"""
+    tables = trends.aggregate(_df_info(), freq="M")
+    assert tables["ads"]["ads"].tolist() == [2, 2, 1]
+    assert tables["skills"].values.tolist() == [
+        [pd.Timestamp("2024-01-01"), "Python", 1],
+        [pd.Timestamp("2024-01-01"), "SQL", 2],
+        [pd.Timestamp("2024-03-01"), "Docker", 1]]
+    assert tables["titles"]["job_title"].tolist() == [
+        "Data Scientist", "Data Engineer", "Data Scientist", "Data Analyst"]
+    salaries = tables["salaries"].set_index("period")
+    assert salaries["salary_min_count"].tolist() == [1, 1]
+    assert salaries["salary_max_mean"].tolist() == [60000.0, 70000.0]
+
+
+def test_update_appends_new_periods(tmp_path) -> None:
+    """The stored weeks and the new ones are the full tables"""
+    log = logging.getLogger("test_trends")
+    df_info = _df_info()
+    store = trends.TrendStore(tmp_path, key="k", log=log)
+    store.update(df_info.iloc[:3], freq="W")
+    tables = store.update(df_info, freq="W")
+    full = trends.aggregate(df_info, freq="W")
+    for name, table in full.items():
+        pd.testing.assert_frame_equal(tables[name], table,
+                                      check_dtype=False)
+
+
+def test_update_old_period_changed(tmp_path) -> None:
+    """An older period with other ads, or another key, is computed again"""
+    log = logging.getLogger("test_trends")
+    df_info = _df_info()
+    trends.TrendStore(tmp_path, key="k", log=log).update(
+        df_info.iloc[1:], freq="M")
+    tables = trends.TrendStore(tmp_path, key="k", log=log).update(
+        df_info, freq="M")
+    assert tables["ads"]["ads"].tolist() == [2, 2, 1]
+    tables = trends.TrendStore(tmp_path, key="other", log=log).update(
+        df_info.iloc[:2], freq="M")
+    assert tables["ads"]["ads"].tolist() == [2]